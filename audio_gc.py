@@ -0,0 +1,123 @@
+import os
+import time
+import logging
+import threading
+
+from database import get_db_manager
+
+
+class AudioGarbageCollector:
+    """
+    오디오 파일 삭제 작업자 스레드
+    멘트/그룹 삭제와 오디오 교체 시 삭제 대기열에 들어간 파일을 유예 시간이 지난 뒤 배치 단위로 삭제하고,
+    참조하는 멘트가 없어진 오디오 저장소 파일을 회수
+    """
+
+    def __init__(self, db_manager, interval=30.0, batch_size=200):
+        """
+        오디오 파일 삭제 작업자 초기화
+
+        Args:
+            db_manager (DatabaseManager): 데이터베이스 관리자
+            interval (float): 삭제 대기열 확인 주기(초)
+            batch_size (int): 한 트랜잭션에서 꺼내 삭제할 최대 파일 수
+        """
+        self.db_manager = db_manager
+        self.interval = interval
+        self.batch_size = batch_size
+
+        # 누적 처리 통계
+        self.removed_count = 0
+        self.failed_count = 0
+        self.reclaimed_count = 0
+        self.last_run_at = None
+        self.last_result = None
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """삭제 작업자 스레드 시작"""
+        if self.is_running:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="audio-gc", daemon=True)
+        self._thread.start()
+        logging.info(
+            f"오디오 삭제 작업자 시작 (유예 {self.db_manager.gc_grace_seconds:.0f}초, 주기 {self.interval:.0f}초)"
+        )
+
+    def stop(self, timeout=5.0):
+        """삭제 작업자 스레드 종료"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def run_once(self):
+        """
+        유예 시간이 지난 파일을 모두 처리 (배치가 가득 차면 다음 배치를 이어서 처리)
+
+        Returns:
+            dict: 이번 실행의 processed, removed, skipped, failed, batches, reclaimed(회수한 저장소 파일) 합계
+        """
+        totals = {"processed": 0, "removed": 0, "skipped": 0, "failed": 0, "batches": 0, "reclaimed": 0}
+        while not self._stop_event.is_set():
+            result = self.db_manager.purge_audio_gc_queue(limit=self.batch_size)
+            for key in result:
+                totals[key] += result[key]
+            if result["processed"] < self.batch_size:
+                break
+
+        # 대기열 정리로 참조가 없어진 저장소 파일 회수
+        while not self._stop_event.is_set():
+            result = self.db_manager.reclaim_audio_blobs(limit=self.batch_size)
+            totals["reclaimed"] += result["reclaimed"]
+            totals["failed"] += result["failed"]
+            if result["reclaimed"] + result["failed"] < self.batch_size:
+                break
+
+        self.removed_count += totals["removed"]
+        self.failed_count += totals["failed"]
+        self.reclaimed_count += totals["reclaimed"]
+        self.last_run_at = time.time()
+        self.last_result = totals
+        return totals
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logging.error(f"오디오 파일 삭제 중 오류 발생: {e}")
+            self._stop_event.wait(self.interval)
+
+
+# 싱글톤 인스턴스 생성을 위한 전역 함수
+_gc_instance = None
+_gc_lock = threading.Lock()
+
+
+def get_audio_gc():
+    """
+    오디오 파일 삭제 작업자의 싱글톤 인스턴스를 가져옴 (최초 호출 시 작업자 시작)
+
+    AUDIO_GC_ENABLED=0 환경 변수로 비활성화, AUDIO_GC_INTERVAL로 확인 주기(초) 지정 가능
+
+    Returns:
+        AudioGarbageCollector: 오디오 파일 삭제 작업자 인스턴스
+    """
+    global _gc_instance
+    with _gc_lock:
+        if _gc_instance is None:
+            _gc_instance = AudioGarbageCollector(
+                get_db_manager(), interval=float(os.getenv("AUDIO_GC_INTERVAL", "30"))
+            )
+            if os.getenv("AUDIO_GC_ENABLED", "1") != "0":
+                _gc_instance.start()
+    return _gc_instance
@@ -0,0 +1,133 @@
+import os
+import hashlib
+import logging
+import tempfile
+import threading
+
+from database import get_db_manager, AUDIO_STORE_DIR
+
+# 업로드/녹음 데이터를 읽어 해시를 계산하는 단위(바이트)
+CHUNK_SIZE = 1024 * 1024
+
+
+class AudioStore:
+    """
+    내용 주소(SHA-256) 기반 오디오 저장소
+    같은 내용의 오디오는 한 번만 저장하고 멘트는 저장소 파일 경로를 참조
+    참조 수는 데이터베이스 트리거가 관리하며, 참조가 없어진 파일은 백그라운드 작업자가 회수
+    """
+
+    def __init__(self, db_manager, root=AUDIO_STORE_DIR, enabled=True):
+        """
+        오디오 저장소 초기화
+
+        Args:
+            db_manager (DatabaseManager): 데이터베이스 관리자
+            root (str): 저장소 루트 폴더
+            enabled (bool): 저장소 사용 여부 (False면 기존처럼 audio_files 폴더에 저장)
+        """
+        self.db_manager = db_manager
+        self.root = root
+        self.enabled = enabled
+
+        # 누적 저장 통계
+        self.stored_count = 0
+        self.deduplicated_count = 0
+
+    def path_for(self, digest, ext):
+        """
+        저장소 파일 경로
+
+        Args:
+            digest (str): 파일 내용의 SHA-256 (16진수)
+            ext (str): 파일 확장자 (점 제외)
+
+        Returns:
+            str: {root}/{digest 앞 두 글자}/{digest}.{ext}
+        """
+        return os.path.join(self.root, digest[:2], f"{digest}.{ext.lower()}")
+
+    def put(self, audio_file, ext="wav"):
+        """
+        오디오 데이터를 읽으면서 SHA-256을 계산해 임시 파일에 쓰고 저장소에 등록
+
+        Args:
+            audio_file (UploadedFile | bytes): 저장할 오디오 데이터
+            ext (str): 파일 확장자
+
+        Returns:
+            str: 저장소 파일 경로 (같은 내용이 이미 있으면 기존 파일 경로)
+        """
+        if isinstance(audio_file, bytes):
+            chunks = (audio_file[i : i + CHUNK_SIZE] for i in range(0, len(audio_file), CHUNK_SIZE))
+        else:
+            # UploadedFile 객체인 경우 처음부터 나눠 읽음
+            audio_file.seek(0)
+            chunks = iter(lambda: audio_file.read(CHUNK_SIZE), b"")
+
+        # 저장소와 같은 파일 시스템의 임시 파일에 써야 os.replace로 옮길 수 있음
+        os.makedirs(self.root, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".upload_", dir=self.root)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+
+            hex_digest = digest.hexdigest()
+            path = self.path_for(hex_digest, ext)
+            created = self.db_manager.store_audio_blob(path, hex_digest, size, temp_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        if created:
+            self.stored_count += 1
+        else:
+            self.deduplicated_count += 1
+            logging.debug(f"같은 내용의 오디오 파일 재사용: {path}")
+        return path
+
+    def contains(self, digest):
+        """같은 내용의 파일이 저장소에 있는지 확인 (인덱스 조회, 파일 시스템 접근 없음)"""
+        return self.db_manager.find_audio_blob(digest) is not None
+
+    def stats(self):
+        """
+        저장소 사용량과 이 프로세스의 누적 저장 통계
+
+        Returns:
+            dict: blobs, bytes, references, unreferenced, stored, deduplicated
+        """
+        stats = self.db_manager.audio_blob_stats()
+        stats.update({"stored": self.stored_count, "deduplicated": self.deduplicated_count})
+        return stats
+
+
+# 싱글톤 인스턴스 생성을 위한 전역 함수
+_store_instance = None
+_store_lock = threading.Lock()
+
+
+def get_audio_store():
+    """
+    오디오 저장소의 싱글톤 인스턴스를 가져옴
+
+    AUDIO_STORE_ENABLED=1 환경 변수로 활성화 (기본: 비활성화), AUDIO_STORE_DIR로 저장소 폴더 지정 가능
+
+    Returns:
+        AudioStore: 오디오 저장소 인스턴스
+    """
+    global _store_instance
+    with _store_lock:
+        if _store_instance is None:
+            _store_instance = AudioStore(
+                get_db_manager(),
+                root=os.getenv("AUDIO_STORE_DIR", AUDIO_STORE_DIR),
+                enabled=os.getenv("AUDIO_STORE_ENABLED", "0") == "1",
+            )
+    return _store_instance
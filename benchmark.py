@@ -0,0 +1,1182 @@
+"""
+성능 측정 스크립트
+
+사용 예:
+    python benchmark.py chat --turns 10
+    python benchmark.py importtime --budget-ms 1500
+    python benchmark.py concurrency --threads 16 --duration 5
+    python benchmark.py plan --groups 1000
+    python benchmark.py catalog --groups 200 --reruns 50
+    python benchmark.py upsert --threads 8 --ops 500
+    python benchmark.py rebuild --groups 2000
+    python benchmark.py history --days 30 --customers 20
+    python benchmark.py suite --sizes 1000,10000,100000 --output suite.json
+    python benchmark.py suite --sizes 1000 --baseline suite.json
+"""
+
+import io
+import os
+import sys
+import json
+import logging
+import time
+import wave
+import random
+import shutil
+import sqlite3
+import platform
+import threading
+import contextlib
+import subprocess
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+# 프로젝트 루트
+ROOT_DIR = Path(__file__).resolve().parent
+APP_PATH = ROOT_DIR / "streamlit_app.py"
+
+# 앱 import 시점에 로드되면 안 되는 모듈 (lazy_import 또는 함수 내부 import로 사용 시점에 로드)
+LAZY_MODULES = ["openai", "gtts", "pyaudio", "pydub", "firebase_admin"]
+
+# fragment 단독 실행용 스크립트 (모듈 전역 초기화는 import 시 한 번만 수행됨)
+CHAT_FRAGMENT_SCRIPT = """
+import sys
+import streamlit as st
+
+sys.path.insert(0, {root!r})
+import streamlit_app
+
+defaults = {{
+    "conversation": [],
+    "current_speaker": "나",
+    "my_translation_language": "번역 안함",
+    "customer_translation_language": "번역 안함",
+}}
+for key, value in defaults.items():
+    if key not in st.session_state:
+        st.session_state[key] = value
+
+# streamlit_authenticator가 import 시 username을 None으로 초기화함
+if not st.session_state.username:
+    st.session_state.username = "benchmark"
+
+streamlit_app.show_conversation_chat({customer_id!r})
+"""
+
+
+def _summarize(samples):
+    """측정값(초) 목록을 ms 단위 통계로 변환"""
+    ms = [s * 1000 for s in samples]
+    return {
+        "mean": statistics.mean(ms),
+        "median": statistics.median(ms),
+        "min": min(ms),
+        "max": max(ms),
+    }
+
+
+def _send_text_message(at, text):
+    """AppTest에서 텍스트 메시지를 입력하고 전송 버튼을 누른 뒤 소요 시간 반환"""
+    text_area = next(t for t in at.text_area if "메시지 입력" in t.label)
+    text_area.set_value(text)
+
+    button = next(b for b in at.button if b.label == "메시지 전송")
+    started = time.perf_counter()
+    button.click().run()
+    elapsed = time.perf_counter() - started
+
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return elapsed
+
+
+def _select_text_input(at):
+    """입력 방식을 텍스트 입력으로 변경"""
+    radio = next(r for r in at.radio if r.label == "입력 방식")
+    radio.set_value("텍스트 입력").run()
+
+
+def bench_chat(args):
+    """
+    대화 탭 메시지 전송 1회당 지연 시간 비교
+
+    - full: 앱 전체 스크립트 재실행 (기존 st.rerun() 방식)
+    - fragment: show_conversation_chat fragment만 재실행
+
+    AppTest는 fragment 단위 재실행을 직접 지원하지 않으므로 fragment 함수만 실행하는 스크립트로 측정
+    """
+    from streamlit.testing.v1 import AppTest
+
+    customer_id = "benchmark"
+
+    # 전체 앱 재실행
+    full_app = AppTest.from_file(str(APP_PATH), default_timeout=args.timeout)
+    full_app.run()
+    full_app.checkbox[0].check().run()  # 개발 모드 로그인
+    full_app.radio(key="main_nav").set_value("대화").run()
+    full_app.text_input[0].set_value(customer_id).run()
+    _select_text_input(full_app)
+
+    full_samples = [_send_text_message(full_app, f"전체 실행 메시지 {i}") for i in range(args.turns)]
+
+    # fragment 재실행
+    fragment_app = AppTest.from_string(
+        CHAT_FRAGMENT_SCRIPT.format(root=str(ROOT_DIR), customer_id=customer_id), default_timeout=args.timeout
+    )
+    fragment_app.run()
+    _select_text_input(fragment_app)
+
+    fragment_samples = [_send_text_message(fragment_app, f"fragment 메시지 {i}") for i in range(args.turns)]
+
+    full = _summarize(full_samples)
+    fragment = _summarize(fragment_samples)
+
+    print(f"대화 메시지 전송 지연 시간 ({args.turns}회, ms)")
+    print(f"{'방식':<10}{'평균':>10}{'중앙값':>10}{'최소':>10}{'최대':>10}")
+    for name, stats in (("full", full), ("fragment", fragment)):
+        print(f"{name:<10}{stats['mean']:>10.1f}{stats['median']:>10.1f}{stats['min']:>10.1f}{stats['max']:>10.1f}")
+
+    reduction = (1 - fragment["median"] / full["median"]) * 100 if full["median"] else 0
+    print(f"메시지당 지연 감소: {full['median'] - fragment['median']:.1f}ms ({reduction:.0f}%)")
+
+
+def _parse_importtime(stderr):
+    """
+    python -X importtime 출력을 파싱
+
+    Args:
+        stderr (str): -X importtime 출력
+
+    Returns:
+        list: (모듈 이름, 깊이, self 시간(us), 누적 시간(us)) 목록 (출력 순서 유지)
+    """
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        records.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return records
+
+
+def _measure_import(module_name):
+    """
+    새 인터프리터에서 모듈을 import하여 import 시간과 로드된 지연 모듈 측정
+
+    Returns:
+        dict: total_ms, self_ms, children(이름, ms 목록), loaded_lazy_modules
+    """
+    code = (
+        f"import sys, json; import {module_name}; "
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT_DIR), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, encoding="utf-8", env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{module_name} import 실패:\n{result.stderr[-2000:]}")
+
+    records = _parse_importtime(result.stderr)
+    index = next(i for i, record in enumerate(records) if record[0] == module_name and record[1] == 0)
+    _, _, self_us, cumulative_us = records[index]
+
+    # -X importtime은 자식 모듈을 부모보다 먼저 출력하므로 직전 최상위 모듈 이후의 depth 1 항목이 자식
+    children = []
+    for name, depth, _, child_cumulative_us in reversed(records[:index]):
+        if depth == 0:
+            break
+        if depth == 1:
+            children.append((name, child_cumulative_us / 1000))
+
+    return {
+        "total_ms": cumulative_us / 1000,
+        "self_ms": self_us / 1000,
+        "children": sorted(children, key=lambda item: item[1], reverse=True),
+        "loaded_lazy_modules": json.loads(result.stdout.strip().splitlines()[-1]),
+    }
+
+
+def bench_importtime(args):
+    """
+    streamlit_app import 시간 회귀 검사
+
+    python -X importtime으로 여러 번 측정한 최소값을 사용하며,
+    모듈 전체 import 시간(모듈 본문 실행 포함)이 예산을 넘거나 지연 로드 대상 모듈이 import 시점에 로드되면 실패(종료 코드 1)
+    """
+    samples = [_measure_import(args.module) for _ in range(args.repeat)]
+    best = min(samples, key=lambda sample: sample["total_ms"])
+    dependency_ms = sum(ms for _, ms in best["children"])
+
+    print(f"{args.module} import 시간 ({args.repeat}회 중 최소)")
+    print(f"  전체: {best['total_ms']:.1f}ms (예산 {args.budget_ms:.0f}ms, 모듈 본문 실행 {best['self_ms']:.1f}ms 포함)")
+    print(f"  의존성 import: {dependency_ms:.1f}ms")
+    print("  주요 의존성:")
+    for name, ms in best["children"][: args.top]:
+        print(f"    {name:<40}{ms:>10.1f}ms")
+
+    failures = []
+    if best["total_ms"] > args.budget_ms:
+        failures.append(f"import 시간 {best['total_ms']:.1f}ms가 예산 {args.budget_ms:.0f}ms를 초과했습니다.")
+    if best["loaded_lazy_modules"]:
+        failures.append(f"지연 로드 대상 모듈이 import 시점에 로드되었습니다: {', '.join(best['loaded_lazy_modules'])}")
+
+    for failure in failures:
+        print(f"실패: {failure}")
+    if failures:
+        sys.exit(1)
+    print("통과")
+
+
+def _percentile(values, percent):
+    """정렬되지 않은 값 목록의 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def _run_concurrency(pool_size, args):
+    """
+    지정한 연결 풀 크기로 여러 스레드에서 읽기/쓰기 반복
+
+    Returns:
+        dict: ops, errors(잠금 오류 수), read/write 지연 시간 목록(ms)
+    """
+    from database import DatabaseManager
+
+    # 모드별로 별도 데이터베이스 사용 (WAL 설정은 파일에 유지되므로)
+    mode_dir = Path(f"concurrency_pool_{pool_size}")
+    mode_dir.mkdir(exist_ok=True)
+    os.chdir(mode_dir)
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            # 카탈로그 캐시는 끄고 SQLite 동시 접근만 측정
+            db_manager = DatabaseManager(pool_size=pool_size, catalog_cache=False)
+            group_ids = [db_manager.add_phrase_group(f"벤치마크 그룹 {i}") for i in range(args.groups)]
+            db_manager.ensure_language_coverage()
+            phrase_ids = [phrase["id"] for group_id in group_ids for phrase in db_manager.get_phrases_by_group(group_id)]
+
+        lock = threading.Lock()
+        results = {"reads": [], "writes": [], "errors": 0, "error_messages": set()}
+        deadline = time.perf_counter() + args.duration
+
+        def worker(seed):
+            rng = random.Random(seed)
+            reads, writes, errors = [], [], 0
+            messages = set()
+            while time.perf_counter() < deadline:
+                is_write = rng.random() < args.write_ratio
+                started = time.perf_counter()
+                try:
+                    if is_write:
+                        db_manager.update_phrase(rng.choice(phrase_ids), f"동시성 테스트 {rng.random()}")
+                    elif rng.random() < 0.5:
+                        db_manager.get_phrase(rng.choice(phrase_ids))
+                    else:
+                        db_manager.get_phrases_by_group(rng.choice(group_ids))
+                except sqlite3.OperationalError as e:
+                    errors += 1
+                    messages.add(str(e))
+                    continue
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                (writes if is_write else reads).append(elapsed_ms)
+
+            with lock:
+                results["reads"].extend(reads)
+                results["writes"].extend(writes)
+                results["errors"] += errors
+                results["error_messages"].update(messages)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        if db_manager.pool is not None:
+            results["pool"] = db_manager.pool.stats()
+        db_manager.close()
+        return results
+    finally:
+        os.chdir("..")
+
+
+def bench_concurrency(args):
+    """
+    연결 풀 사용 여부에 따른 동시 읽기/쓰기 처리량 및 잠금 오류 비교
+
+    - legacy: 호출마다 sqlite3.connect (pool_size=0)
+    - pool: 스레드 안전 연결 풀 + WAL + busy_timeout + synchronous=NORMAL
+    """
+    modes = [("legacy", 0), ("pool", args.pool_size)]
+
+    print(
+        f"동시성 측정: 스레드 {args.threads}개, {args.duration:.0f}초, "
+        f"쓰기 비율 {args.write_ratio:.0%}, 그룹 {args.groups}개"
+    )
+    print(f"{'방식':<8}{'ops/s':>10}{'읽기 p50':>10}{'읽기 p95':>10}{'쓰기 p50':>10}{'쓰기 p95':>10}{'잠금 오류':>10}")
+    for name, pool_size in modes:
+        results = _run_concurrency(pool_size, args)
+        ops = len(results["reads"]) + len(results["writes"])
+        print(
+            f"{name:<8}{ops / args.duration:>10.0f}"
+            f"{_percentile(results['reads'], 50):>10.2f}{_percentile(results['reads'], 95):>10.2f}"
+            f"{_percentile(results['writes'], 50):>10.2f}{_percentile(results['writes'], 95):>10.2f}"
+            f"{results['errors']:>10}"
+        )
+        for message in sorted(results["error_messages"]):
+            print(f"    오류: {message}")
+        if "pool" in results:
+            print(f"    풀 통계: {results['pool']}")
+
+
+# 마이그레이션 이전(인덱스 없음) 스키마
+LEGACY_SCHEMA = """
+CREATE TABLE phrase_groups (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE phrases (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    group_id INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    content TEXT NOT NULL,
+    audio_path TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (group_id) REFERENCES phrase_groups(id) ON DELETE CASCADE
+);
+"""
+
+# 실행 계획을 비교할 DatabaseManager 쿼리 (이름, SQL, 매개변수 생성 함수)
+PLAN_QUERIES = [
+    (
+        "get_phrases_by_group",
+        "SELECT * FROM phrases WHERE group_id = ? ORDER BY language",
+        lambda rng, groups: (rng.randint(1, groups),),
+    ),
+    (
+        "ensure_phrase_exists / add_phrase",
+        "SELECT id FROM phrases WHERE group_id = ? AND language = ? LIMIT 1",
+        lambda rng, groups: (rng.randint(1, groups), rng.choice(["ko", "en", "ja", "zh"])),
+    ),
+    (
+        "get_phrase_groups",
+        "SELECT * FROM phrase_groups ORDER BY name",
+        lambda rng, groups: (),
+    ),
+    (
+        "get_all_phrases",
+        "SELECT p.*, g.name as group_name FROM phrases p JOIN phrase_groups g ON p.group_id = g.id "
+        "ORDER BY g.name, p.language",
+        lambda rng, groups: (),
+    ),
+    (
+        "ensure_language_coverage",
+        "WITH languages(language) AS (VALUES ('ko'), ('en'), ('ja'), ('zh')) "
+        "SELECT g.id, l.language FROM phrase_groups g CROSS JOIN languages l "
+        "WHERE NOT EXISTS (SELECT 1 FROM phrases p WHERE p.group_id = g.id AND p.language = l.language)",
+        lambda rng, groups: (),
+    ),
+]
+
+
+def _populate_catalog(conn, groups):
+    """그룹 수만큼 그룹/언어별 멘트 생성"""
+    conn.executemany(
+        "INSERT INTO phrase_groups (id, name, description) VALUES (?, ?, ?)",
+        [(i, f"그룹 {i:06d}", "") for i in range(1, groups + 1)],
+    )
+    conn.executemany(
+        "INSERT INTO phrases (group_id, language, content, audio_path) VALUES (?, ?, ?, ?)",
+        [
+            (i, language, f"그룹 {i} {language} 멘트", f"audio_files/{i}/{language}/phrase.wav")
+            for i in range(1, groups + 1)
+            for language in ["ko", "en", "ja", "zh"]
+        ],
+    )
+    conn.commit()
+
+
+def bench_plan(args):
+    """
+    스키마 마이그레이션 전/후 주요 쿼리의 실행 계획(EXPLAIN QUERY PLAN)과 실행 시간 비교
+    """
+    from database import DatabaseManager
+
+    # 마이그레이션 이전 스키마
+    before_path = Path("plan_before.db")
+    before = sqlite3.connect(before_path)
+    before.executescript(LEGACY_SCHEMA)
+    _populate_catalog(before, args.groups)
+
+    # 마이그레이션 적용 스키마
+    with contextlib.redirect_stdout(io.StringIO()):
+        db_manager = DatabaseManager(db_name="plan_after.db", pool_size=0)
+    after = sqlite3.connect(db_manager.db_path)
+    _populate_catalog(after, args.groups)
+
+    print(f"실행 계획 비교: 그룹 {args.groups}개, 멘트 {args.groups * 4}개, 쿼리당 {args.repeat}회")
+    for name, sql, make_params in PLAN_QUERIES:
+        print(f"\n[{name}]")
+        for label, conn in (("before", before), ("after", after)):
+            rng = random.Random(0)
+            params = make_params(rng, args.groups)
+            plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                conn.execute(sql, make_params(rng, args.groups)).fetchall()
+            elapsed_ms = (time.perf_counter() - started) * 1000 / args.repeat
+
+            print(f"  {label:<7}{elapsed_ms:>9.3f}ms  {' / '.join(plan)}")
+
+    before.close()
+    after.close()
+
+
+def _simulate_rerun(db_manager, page_size):
+    """한 번의 rerun에서 앱이 수행하는 그룹/멘트 목록 조회 재현"""
+    # main(), 디렉토리 준비, 녹음 탭, 목록 탭, 그룹 탭
+    for _ in range(5):
+        groups = db_manager.get_phrase_groups()
+    # 그룹 탭 한 페이지 분량의 그룹별 멘트 조회
+    for group in groups[:page_size]:
+        db_manager.get_phrases_by_group(group["id"])
+
+
+def bench_catalog(args):
+    """
+    rerun 읽기 패턴에서 카탈로그 캐시 사용 여부에 따른 조회 시간 비교
+    """
+    from database import DatabaseManager, PAGE_SIZE
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        db_manager = DatabaseManager(db_name="catalog.db", pool_size=4)
+    conn = sqlite3.connect(db_manager.db_path)
+    _populate_catalog(conn, args.groups)
+    conn.close()
+
+    print(f"카탈로그 캐시 비교: 그룹 {args.groups}개, rerun {args.reruns}회, {args.write_every}회마다 쓰기")
+    phrase_ids = [row["id"] for row in db_manager.get_all_phrases()]
+    rng = random.Random(0)
+
+    results = {}
+    for label, enabled in (("uncached", False), ("cached", True)):
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager = DatabaseManager(db_name="catalog.db", pool_size=4, catalog_cache=enabled)
+            samples = []
+            for i in range(args.reruns):
+                if args.write_every and i % args.write_every == args.write_every - 1:
+                    manager.update_phrase(rng.choice(phrase_ids), f"캐시 테스트 {i}")
+                started = time.perf_counter()
+                _simulate_rerun(manager, PAGE_SIZE)
+                samples.append(time.perf_counter() - started)
+
+        results[label] = _summarize(samples)
+        line = f"  {label:<9} 평균 {results[label]['mean']:8.2f}ms  중앙값 {results[label]['median']:8.2f}ms"
+        stats = manager.cache_stats()
+        if stats:
+            line += f"  (적중 {stats['hits']}, 미스 {stats['misses']}, 무효화 {stats['invalidations']})"
+        print(line)
+        manager.close()
+
+    print(f"  개선: {results['uncached']['mean'] / results['cached']['mean']:.1f}x")
+    db_manager.close()
+
+
+def _legacy_add_phrase(db_manager, group_id, language, content):
+    """upsert 도입 이전 방식: SELECT 후 UPDATE, 없으면 MAX(id)+1로 ID를 정해 INSERT"""
+    conn = db_manager._get_connection()
+    try:
+        row = conn.execute("SELECT id FROM phrases WHERE group_id = ? AND language = ?", (group_id, language)).fetchone()
+        if row:
+            conn.execute("UPDATE phrases SET content = ? WHERE id = ?", (content, row["id"]))
+        else:
+            phrase_id = (conn.execute("SELECT MAX(id) FROM phrases").fetchone()[0] or 0) + 1
+            conn.execute(
+                "INSERT INTO phrases (id, group_id, language, content) VALUES (?, ?, ?, ?)",
+                (phrase_id, group_id, language, content),
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _run_upsert(db_manager, mode, group_ids, args):
+    """
+    여러 스레드에서 무작위 그룹-언어 멘트를 동시에 추가/갱신
+
+    Returns:
+        dict: rows(처리한 멘트 수), elapsed(초), errors, error_messages, written(성공한 그룹-언어 조합)
+    """
+    languages = ["ko", "en", "ja", "zh"]
+    lock = threading.Lock()
+    results = {"rows": 0, "errors": 0, "error_messages": set(), "written": set()}
+
+    def worker(seed):
+        rng = random.Random(seed)
+        keys = [(rng.choice(group_ids), rng.choice(languages)) for _ in range(args.ops)]
+        rows, errors, messages, written = 0, 0, set(), set()
+
+        if mode == "batch":
+            batches = [keys[i : i + args.batch_size] for i in range(0, len(keys), args.batch_size)]
+        else:
+            batches = [[key] for key in keys]
+
+        for batch in batches:
+            try:
+                if mode == "legacy":
+                    _legacy_add_phrase(db_manager, *batch[0], f"스레드 {seed}")
+                elif mode == "upsert":
+                    db_manager.upsert_phrase(*batch[0], f"스레드 {seed}")
+                else:
+                    db_manager.upsert_phrases([(group_id, language, f"스레드 {seed}") for group_id, language in batch])
+            except sqlite3.Error as e:
+                errors += 1
+                messages.add(f"{type(e).__name__}: {e}")
+                continue
+            rows += len(batch)
+            written.update(batch)
+
+        with lock:
+            results["rows"] += rows
+            results["errors"] += errors
+            results["error_messages"].update(messages)
+            results["written"].update(written)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results["elapsed"] = time.perf_counter() - started
+    return results
+
+
+def bench_upsert(args):
+    """
+    동시 멘트 추가/갱신의 정합성과 처리량 비교
+
+    - legacy: SELECT 후 UPDATE/INSERT, MAX(id)+1 ID 할당
+    - upsert: upsert_phrase() (INSERT ... ON CONFLICT DO UPDATE, 호출당 한 문장)
+    - batch: upsert_phrases() (배치당 executemany 한 번)
+
+    정합성: 오류 없이 성공한 그룹-언어 조합마다 멘트가 정확히 하나 있어야 함
+    """
+    from database import DatabaseManager
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        db_manager = DatabaseManager(db_name="upsert.db", pool_size=args.threads, catalog_cache=False)
+        group_ids = [db_manager.add_phrase_group(f"upsert 그룹 {i}") for i in range(args.groups)]
+
+    print(
+        f"upsert 측정: 스레드 {args.threads}개 x {args.ops}회, 그룹 {args.groups}개 (조합 {args.groups * 4}개), "
+        f"배치 {args.batch_size}개"
+    )
+    print(f"{'방식':<8}{'rows/s':>10}{'오류':>8}{'멘트 수':>10}{'조합 수':>10}  정합성")
+
+    failed = False
+    for mode in ["legacy", "upsert", "batch"]:
+        conn = sqlite3.connect(db_manager.db_path)
+        conn.execute("DELETE FROM phrases")
+        conn.commit()
+
+        results = _run_upsert(db_manager, mode, group_ids, args)
+
+        phrase_count, key_count = conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT group_id || ':' || language) FROM phrases"
+        ).fetchone()
+        conn.close()
+
+        consistent = results["errors"] == 0 and phrase_count == key_count == len(results["written"])
+        if mode != "legacy" and not consistent:
+            failed = True
+
+        print(
+            f"{mode:<8}{results['rows'] / results['elapsed']:>10.0f}{results['errors']:>8}"
+            f"{phrase_count:>10}{len(results['written']):>10}  {'OK' if consistent else 'FAIL'}"
+        )
+        for message in sorted(results["error_messages"])[:3]:
+            print(f"    오류: {message}")
+
+    db_manager.close()
+    if failed:
+        sys.exit(1)
+
+
+def _write_audio_library(groups, languages=("ko", "en", "ja", "zh")):
+    """audio_files/{group}/{lang}/ 구조의 합성 오디오 라이브러리 생성 (짧은 무음 WAV)"""
+    for group_id in range(1, groups + 1):
+        for language in languages:
+            language_dir = Path("audio_files") / str(group_id) / language
+            language_dir.mkdir(parents=True, exist_ok=True)
+            with wave.open(str(language_dir / f"phrase_{group_id}_{language}.wav"), "wb") as wav_file:
+                wav_file.setnchannels(1)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(8000)
+                wav_file.writeframes(b"\0\0" * 800)
+
+
+def _legacy_reinitialize(db_manager):
+    """섀도 재구성 도입 이전 방식: 현재 데이터베이스를 비우고 그 자리에서 다시 채움"""
+    conn = db_manager._get_connection()
+    for table in ("phrases", "phrase_groups", "audio_manifest", "audio_manifest_dirs"):
+        conn.execute(f"DELETE FROM {table}")
+    conn.commit()
+
+    created_groups = []
+    for group_folder in Path("audio_files").iterdir():
+        if group_folder.is_dir() and group_folder.name.isdigit():
+            group_id = int(group_folder.name)
+            conn.execute(
+                "INSERT INTO phrase_groups (id, name, description) VALUES (?, ?, ?)",
+                (group_id, f"그룹-{group_id}", ""),
+            )
+            created_groups.append(group_id)
+    conn.commit()
+
+    for group_id in created_groups:
+        for lang_folder in (Path("audio_files") / str(group_id)).iterdir():
+            db_manager.add_phrase(group_id, lang_folder.name, f"그룹-{group_id}의 {lang_folder.name} 멘트")
+    conn.close()
+
+    db_manager.scan_audio_files_and_update_db(full=True)
+
+
+def bench_rebuild(args):
+    """
+    데이터베이스 재구성 시간과 재구성 중 다른 세션이 보는 카탈로그 비교
+
+    - legacy: 현재 데이터베이스를 비우고 다시 채움 (재구성 중 빈/부분 카탈로그 노출)
+    - shadow: 섀도 데이터베이스에서 구성 후 한 트랜잭션으로 교체
+    """
+    from database import DatabaseManager
+
+    _write_audio_library(args.groups)
+    expected = args.groups * 4
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        db_manager = DatabaseManager(db_name="rebuild.db", pool_size=4, catalog_cache=False)
+        db_manager.reinitialize_database_and_scan()
+
+    print(f"재구성 측정: 그룹 {args.groups}개, 멘트/오디오 파일 {expected}개")
+    print(f"{'방식':<8}{'재구성(s)':>10}{'조회 수':>8}{'빈/부분':>8}{'오류':>6}{'조회 p95(ms)':>14}{'조회 최대(ms)':>14}")
+
+    for mode in ["legacy", "shadow"]:
+        reader = DatabaseManager(db_name="rebuild.db", pool_size=2, catalog_cache=False)
+        stop = threading.Event()
+        stats = {"latencies": [], "partial": 0, "errors": 0}
+
+        def read_loop():
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    phrases = reader.get_all_phrases()
+                except sqlite3.Error:
+                    stats["errors"] += 1
+                    continue
+                stats["latencies"].append((time.perf_counter() - started) * 1000)
+                if len(phrases) != expected:
+                    stats["partial"] += 1
+
+        thread = threading.Thread(target=read_loop)
+        thread.start()
+
+        started = time.perf_counter()
+        if mode == "legacy":
+            _legacy_reinitialize(db_manager)
+        else:
+            db_manager.reinitialize_database_and_scan()
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        thread.join()
+        reader.close()
+
+        latencies = stats["latencies"]
+        print(
+            f"{mode:<8}{elapsed:>10.2f}{len(latencies):>8}{stats['partial']:>8}{stats['errors']:>6}"
+            f"{_percentile(latencies, 95):>14.1f}{max(latencies, default=0):>14.1f}"
+        )
+
+    db_manager.close()
+
+
+def _write_history_tree(days, customers, recordings):
+    """recordings/conversations/{user}/{date}/{customer}/ 구조의 합성 녹음/대화 기록 생성"""
+    for day in range(days):
+        date_str = time.strftime("%Y-%m-%d", time.localtime(time.time() - day * 86400))
+        for customer in range(customers):
+            recording_dir = Path("recordings") / "bench" / date_str / f"C{customer:04d}"
+            recording_dir.mkdir(parents=True, exist_ok=True)
+            for index in range(recordings):
+                time_str = f"{index:06d}"
+                (recording_dir / f"recording_{time_str}.wav").write_bytes(b"RIFF")
+                phrase_info = {"phrase_id": index, "group_id": 1, "language": "ko", "content": f"멘트 {index}"}
+                (recording_dir / f"phrase_info_{time_str}.json").write_text(
+                    json.dumps(phrase_info, ensure_ascii=False), encoding="utf-8"
+                )
+                (recording_dir / f"stt_result_{time_str}.txt").write_text(f"STT {index}", encoding="utf-8")
+                (recording_dir / f"translated_en_{time_str}.txt").write_text(f"translation {index}", encoding="utf-8")
+
+            conversation_dir = Path("conversations") / "bench" / date_str / f"C{customer:04d}"
+            conversation_dir.mkdir(parents=True, exist_ok=True)
+            messages = [{"speaker": "나", "timestamp": date_str, "text": f"메시지 {i}"} for i in range(10)]
+            (conversation_dir / "conversation.json").write_text(
+                json.dumps(messages, ensure_ascii=False), encoding="utf-8"
+            )
+
+
+def _legacy_history_view(date):
+    """기록 테이블 도입 이전 방식: 날짜/고객 목록, 고객별 개수, 기록 목록을 매번 폴더에서 읽음"""
+    dates = set()
+    for root in ("recordings", "conversations"):
+        base_path = os.path.join(root, "bench")
+        for date_dir in os.listdir(base_path):
+            if os.path.isdir(os.path.join(base_path, date_dir)):
+                dates.add(date_dir)
+
+    customers = set()
+    for root in ("recordings", "conversations"):
+        date_path = os.path.join(root, "bench", date)
+        customers.update(os.listdir(date_path))
+
+    counts = {}
+    for customer in customers:
+        files = os.listdir(os.path.join("recordings", "bench", date, customer))
+        counts[customer] = sum(1 for file in files if file.startswith("recording_") and file.endswith(".wav"))
+
+    entries = []
+    for customer in sorted(customers):
+        customer_path = os.path.join("recordings", "bench", date, customer)
+        for file in os.listdir(customer_path):
+            if file.startswith("recording_") and file.endswith(".wav"):
+                time_str = file[len("recording_") : -len(".wav")]
+                for meta_file in os.listdir(customer_path):
+                    if meta_file == f"phrase_info_{time_str}.json":
+                        with open(os.path.join(customer_path, meta_file), "r", encoding="utf-8") as f:
+                            entries.append(json.load(f))
+        with open(os.path.join("conversations", "bench", date, customer, "conversation.json"), encoding="utf-8") as f:
+            entries.append(json.load(f))
+    return len(dates), len(customers), len(entries)
+
+
+def _indexed_history_view(db_manager, date):
+    """기록 테이블 조회: 녹음 기록 탭 한 번 표시에 필요한 쿼리"""
+    dates = db_manager.get_history_dates("bench")
+    customers = db_manager.get_history_customers("bench", date)
+    db_manager.get_history_counts("bench", date)
+    entries = db_manager.get_history_entries("bench", date)
+    return len(dates), len(customers), len(entries)
+
+
+def bench_history(args):
+    """
+    녹음 기록 탭 한 번 표시에 걸리는 시간 비교
+
+    - legacy: 날짜/고객 폴더를 순회하고 멘트 정보/대화 JSON 파일을 매번 읽음
+    - indexed: 저장 시점에 기록된 recordings/conversations/messages 테이블 조회
+    """
+    from database import DatabaseManager
+
+    _write_history_tree(args.days, args.customers, args.recordings)
+    date = time.strftime("%Y-%m-%d")
+
+    started = time.perf_counter()
+    db_manager = DatabaseManager(db_name="history.db", pool_size=2)
+    backfill_elapsed = time.perf_counter() - started
+
+    total = args.days * args.customers * args.recordings
+    print(f"기록 조회 측정: {args.days}일 x 고객 {args.customers}명 x 녹음 {args.recordings}개 (총 녹음 {total}개)")
+    print(f"기존 폴더 색인 (v6 마이그레이션): {backfill_elapsed:.2f}s")
+    print(f"{'방식':<8}{'p50(ms)':>10}{'p95(ms)':>10}{'날짜':>6}{'고객':>6}{'기록':>8}")
+
+    for mode in ["legacy", "indexed"]:
+        latencies = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            if mode == "legacy":
+                result = _legacy_history_view(date)
+            else:
+                result = _indexed_history_view(db_manager, date)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        print(
+            f"{mode:<8}{statistics.median(latencies):>10.1f}{_percentile(latencies, 95):>10.1f}"
+            f"{result[0]:>6}{result[1]:>6}{result[2]:>8}"
+        )
+
+    db_manager.close()
+
+
+# suite 합성 멘트 내용에 사용하는 단어
+SUITE_WORDS = [
+    "환불", "결제", "배송", "예약", "취소", "교환", "문의", "확인", "안내", "요금",
+    "할인", "쿠폰", "회원", "주문", "반품", "영수증", "카드", "현금", "포인트", "매장",
+]  # fmt: skip
+
+
+def _write_suite_library(groups):
+    """
+    suite용 audio_files/{group}/{lang} 오디오 트리 생성 (같은 짧은 무음 WAV를 그대로 복사해 기록)
+
+    Returns:
+        int: 생성한 오디오 파일 수
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(8000)
+        wav_file.writeframes(b"\0\0" * 80)
+    data = buffer.getvalue()
+
+    count = 0
+    for group_id in range(1, groups + 1):
+        for language in ["ko", "en", "ja", "zh"]:
+            language_dir = os.path.join("audio_files", str(group_id), language)
+            os.makedirs(language_dir, exist_ok=True)
+            with open(os.path.join(language_dir, f"phrase_{group_id}_{language}.wav"), "wb") as fp:
+                fp.write(data)
+            count += 1
+    return count
+
+
+def _suite_cases(db_manager, groups, rng):
+    """
+    suite에서 측정할 (메서드, 변형, 호출 함수, 무거운 작업 여부) 목록
+
+    호출 함수는 측정할 때마다 새 인자를 뽑도록 매번 호출됨
+    """
+    group_id = lambda: rng.randint(1, groups)  # noqa: E731
+    phrase_id = lambda: rng.randint(1, groups * 4)  # noqa: E731
+
+    return [
+        ("get_phrase_groups", "", lambda: db_manager.get_phrase_groups(), False),
+        ("get_phrases_by_group", "", lambda: db_manager.get_phrases_by_group(group_id()), False),
+        ("get_group_name", "", lambda: db_manager.get_group_name(group_id()), False),
+        ("get_phrase", "", lambda: db_manager.get_phrase(phrase_id()), False),
+        ("get_catalog_snapshot", "", lambda: db_manager.get_catalog_snapshot(), True),
+        ("get_phrase_groups_page", "", lambda: db_manager.get_phrase_groups_page(), False),
+        ("get_phrases_page", "", lambda: db_manager.get_phrases_page(), False),
+        ("get_phrases_page", "audio_only", lambda: db_manager.get_phrases_page(audio_only=True), False),
+        ("get_all_phrases", "", lambda: db_manager.get_all_phrases(), True),
+        ("get_all_phrases", "audio_only", lambda: db_manager.get_all_phrases(audio_only=True), True),
+        ("iter_phrases", "", lambda: list(db_manager.iter_phrases()), True),
+        ("search_phrases", "fts", lambda: db_manager.search_phrases(" ".join(rng.sample(SUITE_WORDS, 2))), False),
+        ("search_phrases", "like", lambda: db_manager.search_phrases(rng.choice(SUITE_WORDS)[:2]), False),
+        ("search_phrases", "group", lambda: db_manager.search_phrases(f"그룹-{group_id()}", "group"), False),
+        ("search_phrases", "no_match", lambda: db_manager.search_phrases("존재하지않는검색어"), False),
+        ("search_phrases_page", "fts", lambda: db_manager.search_phrases_page(rng.choice(SUITE_WORDS) + " "), False),
+        (
+            "upsert_phrase",
+            "",
+            lambda: db_manager.upsert_phrase(group_id(), rng.choice(["ko", "en", "ja", "zh"]), _suite_content(rng)),
+            False,
+        ),
+        ("update_phrase", "", lambda: db_manager.update_phrase(phrase_id(), _suite_content(rng)), False),
+        ("ensure_language_coverage", "", lambda: db_manager.ensure_language_coverage(), False),
+        ("sync_groups_with_folders", "", lambda: db_manager.sync_groups_with_folders(), True),
+        ("scan_audio_files_and_update_db", "incremental", lambda: db_manager.scan_audio_files_and_update_db(), True),
+        (
+            "scan_audio_files_and_update_db",
+            "full",
+            lambda: db_manager.scan_audio_files_and_update_db(full=True),
+            True,
+        ),
+        ("reinitialize_database_and_scan", "", lambda: db_manager.reinitialize_database_and_scan(), True),
+    ]
+
+
+def _suite_content(rng):
+    """합성 멘트 내용"""
+    return " ".join(rng.choices(SUITE_WORDS, k=6)) + f" {rng.randint(0, 99999)}번 안내입니다"
+
+
+def _rows_of(result):
+    """측정 결과에 기록할 반환 행 수"""
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        for key in ("items", "groups"):
+            if isinstance(result.get(key), list):
+                return len(result[key])
+    return None
+
+
+def _run_suite_size(phrases, args):
+    """
+    멘트 수 하나에 대한 합성 카탈로그 생성 및 메서드별 측정
+
+    Returns:
+        tuple: (준비 단계 정보 dict, 메서드별 결과 목록)
+    """
+    from database import DatabaseManager
+
+    groups = max(1, phrases // 4)
+    size_dir = Path(f"suite_{phrases}").resolve()
+    size_dir.mkdir(exist_ok=True)
+    previous_dir = os.getcwd()
+    os.chdir(size_dir)
+
+    try:
+        started = time.perf_counter()
+        audio_files = _write_suite_library(groups)
+        library_done = time.perf_counter()
+
+        # 캐시 적중이 아닌 실제 쿼리 비용을 측정하도록 카탈로그 캐시 없이 실행
+        with contextlib.redirect_stdout(io.StringIO()):
+            db_manager = DatabaseManager(db_name="suite.db", pool_size=4, catalog_cache=False)
+        db_manager.reinitialize_database_and_scan()
+        build_done = time.perf_counter()
+
+        rng = random.Random(args.seed)
+        db_manager.upsert_phrases(
+            (group_id, language, _suite_content(rng))
+            for group_id in range(1, groups + 1)
+            for language in ["ko", "en", "ja", "zh"]
+        )
+        content_done = time.perf_counter()
+
+        setup = {
+            "phrases": phrases,
+            "groups": groups,
+            "audio_files": audio_files,
+            "library_s": library_done - started,
+            "build_s": build_done - library_done,
+            "content_s": content_done - build_done,
+            "fts_enabled": db_manager.fts_enabled,
+        }
+
+        results = []
+        for method, variant, call, heavy in _suite_cases(db_manager, groups, rng):
+            if args.only and method not in args.only:
+                continue
+
+            # 준비 호출 1회 (연결 생성, 페이지 캐시 적재)
+            rows = _rows_of(call())
+
+            repeat = args.heavy_repeat if heavy else args.repeat
+            samples = []
+            for _ in range(repeat):
+                call_started = time.perf_counter()
+                call()
+                samples.append(time.perf_counter() - call_started)
+
+            summary = _summarize(samples)
+            results.append(
+                {
+                    "phrases": phrases,
+                    "method": method,
+                    "variant": variant,
+                    "samples": len(samples),
+                    "rows": rows,
+                    "min_ms": summary["min"],
+                    "median_ms": summary["median"],
+                    "mean_ms": summary["mean"],
+                    "p95_ms": _percentile(samples, 95) * 1000,
+                    "max_ms": summary["max"],
+                }
+            )
+            label = f"{method}[{variant}]" if variant else method
+            print(
+                f"  {label:<46}{summary['median']:>10.2f}{_percentile(samples, 95) * 1000:>10.2f}"
+                f"{summary['max']:>10.2f}{rows if rows is not None else '-':>10}",
+                file=sys.stderr,
+            )
+
+        db_manager.close()
+        return setup, results
+    finally:
+        os.chdir(previous_dir)
+        if not args.keep:
+            shutil.rmtree(size_dir, ignore_errors=True)
+
+
+def _git_revision():
+    """측정한 코드의 git 커밋 (git을 사용할 수 없으면 None)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _compare_suite(report, baseline, tolerance, min_delta_ms):
+    """
+    기준 결과와 중앙값 비교
+
+    Returns:
+        list: 회귀로 판단한 (멘트 수, 메서드, 변형, 기준 ms, 현재 ms) 목록
+    """
+    baseline_results = {(r["phrases"], r["method"], r["variant"]): r for r in baseline.get("results", [])}
+
+    regressions = []
+    for result in report["results"]:
+        before = baseline_results.get((result["phrases"], result["method"], result["variant"]))
+        if before is None:
+            continue
+        after_ms, before_ms = result["median_ms"], before["median_ms"]
+        if after_ms > before_ms * tolerance and after_ms - before_ms >= min_delta_ms:
+            regressions.append((result["phrases"], result["method"], result["variant"], before_ms, after_ms))
+    return regressions
+
+
+def bench_suite(args):
+    """
+    합성 카탈로그 크기별 DatabaseManager 공개 메서드 측정 (JSON 결과 출력, 기준 결과와 회귀 비교)
+
+    멘트 수마다 ko/en/ja/zh 4개 언어의 그룹과 audio_files/{group}/{lang} 오디오 트리를 작업 디렉토리에 만들고,
+    메서드별로 준비 호출 1회 후 반복 측정한 지연 시간(ms)을 기록함
+    사람이 읽는 표는 stderr, JSON은 --output 파일(없으면 stdout)에 기록
+    """
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    report = {
+        "suite": "database",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "heavy_repeat": args.heavy_repeat,
+        "seed": args.seed,
+        "setup": [],
+        "results": [],
+    }
+
+    for phrases in sizes:
+        print(f"\n[멘트 {phrases}개] 합성 카탈로그 생성 중...", file=sys.stderr)
+        print(f"  {'메서드':<44}{'p50(ms)':>10}{'p95(ms)':>10}{'최대(ms)':>10}{'반환 행':>10}", file=sys.stderr)
+        setup, results = _run_suite_size(phrases, args)
+        report["setup"].append(setup)
+        report["results"].extend(results)
+        print(
+            f"  준비: 오디오 트리 {setup['library_s']:.1f}s, 재구성 {setup['build_s']:.1f}s, "
+            f"내용 저장 {setup['content_s']:.1f}s",
+            file=sys.stderr,
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, ensure_ascii=False, indent=2)
+    else:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fp:
+            baseline = json.load(fp)
+        regressions = _compare_suite(report, baseline, args.tolerance, args.min_delta_ms)
+        print(
+            f"\n기준 결과({baseline.get('revision')}) 대비 회귀 {len(regressions)}건 "
+            f"(중앙값 {args.tolerance:.2f}배 초과, {args.min_delta_ms}ms 이상 증가)",
+            file=sys.stderr,
+        )
+        for phrases, method, variant, before_ms, after_ms in regressions:
+            label = f"{method}[{variant}]" if variant else method
+            print(f"  멘트 {phrases}개 {label}: {before_ms:.2f}ms → {after_ms:.2f}ms", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="보이스 프로그램 성능 측정")
+    parser.add_argument(
+        "--workdir",
+        default=None,
+        help="측정 중 생성되는 파일/데이터베이스를 둘 작업 디렉토리 (기본값: 임시 디렉토리)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    chat_parser = subparsers.add_parser("chat", help="대화 탭 메시지 전송 지연 시간 (전체 재실행 vs fragment)")
+    chat_parser.add_argument("--turns", type=int, default=10, help="메시지 전송 횟수")
+    chat_parser.add_argument("--timeout", type=float, default=60, help="스크립트 실행 제한 시간(초)")
+    chat_parser.set_defaults(func=bench_chat)
+
+    importtime_parser = subparsers.add_parser("importtime", help="앱 모듈 import 시간 예산 검사 (python -X importtime)")
+    importtime_parser.add_argument("--module", default="streamlit_app", help="측정할 모듈")
+    importtime_parser.add_argument("--budget-ms", type=float, default=1500, help="모듈 전체 import 시간 예산(ms)")
+    importtime_parser.add_argument("--repeat", type=int, default=3, help="측정 횟수 (최소값 사용)")
+    importtime_parser.add_argument("--top", type=int, default=10, help="표시할 의존성 수")
+    importtime_parser.set_defaults(func=bench_importtime)
+
+    concurrency_parser = subparsers.add_parser("concurrency", help="여러 스레드의 동시 읽기/쓰기 (연결 풀 vs 호출별 연결)")
+    concurrency_parser.add_argument("--threads", type=int, default=16, help="동시 실행 스레드 수")
+    concurrency_parser.add_argument("--duration", type=float, default=5, help="방식별 측정 시간(초)")
+    concurrency_parser.add_argument("--write-ratio", type=float, default=0.2, help="쓰기 작업 비율 (0~1)")
+    concurrency_parser.add_argument("--groups", type=int, default=50, help="생성할 멘트 그룹 수")
+    concurrency_parser.add_argument("--pool-size", type=int, default=4, help="연결 풀 크기")
+    concurrency_parser.set_defaults(func=bench_concurrency)
+
+    plan_parser = subparsers.add_parser("plan", help="스키마 마이그레이션 전/후 쿼리 실행 계획 비교")
+    plan_parser.add_argument("--groups", type=int, default=1000, help="생성할 멘트 그룹 수")
+    plan_parser.add_argument("--repeat", type=int, default=10, help="쿼리별 반복 횟수")
+    plan_parser.set_defaults(func=bench_plan)
+
+    catalog_parser = subparsers.add_parser("catalog", help="rerun 읽기 패턴에서 카탈로그 캐시 효과 측정")
+    catalog_parser.add_argument("--groups", type=int, default=200, help="생성할 멘트 그룹 수")
+    catalog_parser.add_argument("--reruns", type=int, default=50, help="rerun 시뮬레이션 횟수")
+    catalog_parser.add_argument("--write-every", type=int, default=10, help="N회 rerun마다 멘트 수정 (0이면 쓰기 없음)")
+    catalog_parser.set_defaults(func=bench_catalog)
+
+    upsert_parser = subparsers.add_parser("upsert", help="동시 멘트 추가/갱신 정합성 및 처리량 (upsert vs 기존 방식)")
+    upsert_parser.add_argument("--threads", type=int, default=8, help="동시 실행 스레드 수")
+    upsert_parser.add_argument("--ops", type=int, default=500, help="스레드별 멘트 추가/갱신 횟수")
+    upsert_parser.add_argument("--groups", type=int, default=100, help="생성할 멘트 그룹 수")
+    upsert_parser.add_argument("--batch-size", type=int, default=50, help="batch 방식의 배치 크기")
+    upsert_parser.set_defaults(func=bench_upsert)
+
+    rebuild_parser = subparsers.add_parser("rebuild", help="데이터베이스 재구성 시간 및 재구성 중 조회 결과 (섀도 교체 vs 제자리)")
+    rebuild_parser.add_argument("--groups", type=int, default=2000, help="합성 오디오 라이브러리 그룹 수 (그룹당 4개 언어)")
+    rebuild_parser.set_defaults(func=bench_rebuild)
+
+    history_parser = subparsers.add_parser("history", help="녹음 기록 탭 조회 시간 (폴더 순회 vs 기록 테이블)")
+    history_parser.add_argument("--days", type=int, default=30, help="합성 기록 날짜 수")
+    history_parser.add_argument("--customers", type=int, default=20, help="날짜별 고객 수")
+    history_parser.add_argument("--recordings", type=int, default=10, help="고객별 녹음 수")
+    history_parser.add_argument("--repeat", type=int, default=10, help="방식별 반복 측정 횟수")
+    history_parser.set_defaults(func=bench_history)
+
+    suite_parser = subparsers.add_parser("suite", help="합성 카탈로그 크기별 DatabaseManager 메서드 측정 (JSON 결과, 회귀 비교)")
+    suite_parser.add_argument("--sizes", default="1000,10000,100000", help="측정할 멘트 수 목록 (쉼표로 구분)")
+    suite_parser.add_argument("--repeat", type=int, default=20, help="메서드별 반복 측정 횟수")
+    suite_parser.add_argument("--heavy-repeat", type=int, default=3, help="전체 조회/스캔/재구성의 반복 측정 횟수")
+    suite_parser.add_argument("--only", nargs="+", help="측정할 메서드 이름 (기본: 전체)")
+    suite_parser.add_argument("--seed", type=int, default=0, help="합성 데이터/인자 난수 시드")
+    # 작업 디렉토리로 이동하기 전에 절대 경로로 변환
+    suite_parser.add_argument("--output", type=os.path.abspath, help="JSON 결과 파일 경로 (기본: 표준 출력)")
+    suite_parser.add_argument("--baseline", type=os.path.abspath, help="비교할 기준 JSON 결과 파일")
+    suite_parser.add_argument("--tolerance", type=float, default=1.25, help="회귀로 판단할 중앙값 배율")
+    suite_parser.add_argument("--min-delta-ms", type=float, default=1.0, help="회귀로 판단할 최소 증가량(ms)")
+    suite_parser.add_argument("--keep", action="store_true", help="측정 후 합성 카탈로그/오디오 트리 유지")
+    suite_parser.set_defaults(func=bench_suite)
+
+    args = parser.parse_args()
+
+    # 측정 중 데이터베이스 로그(느린 쿼리 경고 등) 출력 억제
+    logging.getLogger("database").setLevel(logging.ERROR)
+
+    # 실제 데이터에 영향을 주지 않도록 별도 작업 디렉토리에서 실행
+    workdir = args.workdir or tempfile.mkdtemp(prefix="voice_benchmark_")
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    os.environ.setdefault("FS_WATCHER_ENABLED", "0")
+    sys.path.insert(0, str(ROOT_DIR))
+
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
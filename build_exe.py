@@ -65,6 +65,24 @@ def build_exe():
     else:
         logging.error(f"오류: 데이터베이스 스크립트를 찾을 수 없습니다: {database_path}")
 
+    # 앱에서 사용하는 보조 모듈 추가
+    for module_name in [
+        "reconciliation.py",
+        "fs_watcher.py",
+        "lazy_import.py",
+        "query_stats.py",
+        "phrase_io.py",
+        "audio_gc.py",
+        "audio_store.py",
+        "translator.py",
+    ]:
+        module_path = current_dir / module_name
+        if module_path.exists():
+            add_data_params.extend(["--add-data", f"{module_path};."])
+            logging.info(f"보조 모듈 추가: {module_path}")
+        else:
+            logging.error(f"오류: 보조 모듈을 찾을 수 없습니다: {module_path}")
+
     # config.yaml 파일 확인
     config_path = current_dir / "config.yaml"
     if config_path.exists():
@@ -121,10 +139,8 @@ def build_exe():
     hidden_imports = [
         "streamlit",
         "streamlit_authenticator",
-        "pyaudio",
-        "pydub",
-        "openai",
-        "firebase_admin",
+        "openai",  # STT/번역/TTS용 (lazy_import로 지연 로드되므로 명시 필요)
+        "gtts",  # Google TTS용 (함수 내부에서 import)
         "ctypes",  # 관리자 권한 확인용
         "ctypes.wintypes",  # Windows API 호출용
         "ctypes.windll.shell32",  # Windows 쉘 인터페이스
@@ -137,7 +153,6 @@ def build_exe():
         "threading",  # 멀티스레딩용
         "yaml",  # 설정 파일 로드용
         "dotenv",  # 환경 변수 로드용
-        "numpy",  # 음성 처리용
         "encodings.utf_8",  # 인코딩 처리
         "encodings.ascii",  # 인코딩 처리
         "encodings.cp949",  # 한글 인코딩 처리
@@ -1,891 +1,3473 @@
 import sqlite3
 import os
+import re
+import json
+import time
+import wave
+import logging
+import threading
 from pathlib import Path
+from contextlib import contextmanager
 import shutil
 
+from query_stats import QueryStats, instrumented
+
+logger = logging.getLogger("database")
+
+# 지원하는 언어 코드
+SUPPORTED_LANGUAGES = ["ko", "en", "ja", "zh"]
+
+# 스캔 대상 오디오 파일 확장자
+AUDIO_EXTENSIONS = (".wav", ".mp3")
+
+# 전문 검색(FTS5 trigram) 최소 검색어 길이 (이보다 짧으면 LIKE 검색)
+FTS_MIN_QUERY_LENGTH = 3
+
+# 검색 결과 기본 최대 개수
+SEARCH_RESULT_LIMIT = 50
+
+# 페이지 단위 조회 기본 크기
+PAGE_SIZE = 20
+
+# INSERT ... RETURNING 지원 여부 (SQLite 3.35 이상)
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# 그룹/언어별 멘트 upsert (ux_phrases_group_language 고유 인덱스 기준)
+# 오디오 경로가 주어지지 않으면 기존 오디오 경로와 상태를 유지
+UPSERT_PHRASE_SQL = """
+INSERT INTO phrases (group_id, language, content, audio_path, audio_exists, audio_size, audio_duration)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(group_id, language) DO UPDATE SET
+    content = excluded.content,
+    audio_path = COALESCE(excluded.audio_path, phrases.audio_path),
+    audio_exists = CASE WHEN excluded.audio_path IS NULL THEN phrases.audio_exists ELSE excluded.audio_exists END,
+    audio_size = CASE WHEN excluded.audio_path IS NULL THEN phrases.audio_size ELSE excluded.audio_size END,
+    audio_duration = CASE WHEN excluded.audio_path IS NULL THEN phrases.audio_duration ELSE excluded.audio_duration END
+"""
+
+# 삭제된 오디오 파일을 실제로 지우기 전 유예 시간(초, 이 시간 안에는 삭제 되돌리기 가능)
+AUDIO_GC_GRACE_SECONDS = 300
+
+# 파일 삭제에 실패한 항목의 재시도 간격(초)
+AUDIO_GC_RETRY_SECONDS = 60
+
+# 내용 주소(SHA-256) 기반 오디오 저장소 루트 폴더 ({root}/{digest[:2]}/{digest}{ext})
+AUDIO_STORE_DIR = "audio_store"
+
+# 회수 중인 저장소 파일을 잠시 옮겨 두는 이름의 접미사 (회수 도중 같은 내용이 다시 저장되면 되살림)
+AUDIO_RECLAIM_SUFFIX = ".reclaim"
+
+# 녹음/대화 기록 루트 폴더 ({root}/{username}/{YYYY-MM-DD}/{customer_id})
+HISTORY_ROOTS = ("recordings", "conversations")
+
+# 기록 날짜 폴더 이름 형식
+HISTORY_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# 기존 기록 폴더 색인(backfill_history) 시 한 트랜잭션에서 처리할 고객 폴더 수
+HISTORY_BACKFILL_BATCH = 50
+
+# 녹음 기록 upsert (audio_path 기준, 새 값이 없으면 기존 멘트/STT/번역 정보 유지)
+UPSERT_RECORDING_SQL = """
+INSERT INTO recordings (
+    username, date, customer_id, time_str, audio_path, metadata_path,
+    phrase_id, group_id, group_name, language, content, stt_text, translations
+)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(audio_path) DO UPDATE SET
+    metadata_path = COALESCE(excluded.metadata_path, recordings.metadata_path),
+    phrase_id = COALESCE(excluded.phrase_id, recordings.phrase_id),
+    group_id = COALESCE(excluded.group_id, recordings.group_id),
+    group_name = COALESCE(excluded.group_name, recordings.group_name),
+    language = COALESCE(excluded.language, recordings.language),
+    content = COALESCE(excluded.content, recordings.content),
+    stt_text = COALESCE(excluded.stt_text, recordings.stt_text),
+    translations = COALESCE(excluded.translations, recordings.translations)
+"""
+
+# 기록 폴더 색인용 upsert (STT/번역은 파일이 기준이므로 파일이 삭제되면 비움)
+INDEX_RECORDING_SQL = """
+INSERT INTO recordings (
+    username, date, customer_id, time_str, audio_path, metadata_path,
+    phrase_id, group_id, group_name, language, content, stt_text, translations
+)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(audio_path) DO UPDATE SET
+    metadata_path = COALESCE(excluded.metadata_path, recordings.metadata_path),
+    phrase_id = COALESCE(excluded.phrase_id, recordings.phrase_id),
+    group_id = COALESCE(excluded.group_id, recordings.group_id),
+    group_name = COALESCE(excluded.group_name, recordings.group_name),
+    language = COALESCE(excluded.language, recordings.language),
+    content = COALESCE(excluded.content, recordings.content),
+    stt_text = excluded.stt_text,
+    translations = excluded.translations
+"""
+
+# 재구성 시 섀도 데이터베이스에서 옮겨 담는 카탈로그 테이블과 컬럼 (삽입 순서대로)
+CATALOG_TABLE_COLUMNS = [
+    ("phrase_groups", ("id", "name", "description", "created_at")),
+    (
+        "phrases",
+        (
+            "id",
+            "group_id",
+            "language",
+            "content",
+            "audio_path",
+            "created_at",
+            "audio_exists",
+            "audio_size",
+            "audio_duration",
+        ),
+    ),
+    ("audio_manifest", ("path", "group_id", "language", "size", "mtime_ns", "inode", "scanned_at")),
+    ("audio_manifest_dirs", ("path", "mtime_ns")),
+]
+
+# 언어별 기본 멘트 템플릿 ({group_name}에 그룹 이름 삽입)
+DEFAULT_PHRASE_TEMPLATES = {
+    "ko": "{group_name} 관련 기본 멘트입니다 (한국어)",
+    "en": "Default phrase for {group_name} (English)",
+    "ja": "{group_name}に関する基本メッセージです (日本語)",
+    "zh": "关于{group_name}的默认信息 (中文)",
+}
+
+
+def default_phrase_content(group_name, language):
+    """
+    그룹/언어에 대한 기본 멘트 내용 생성
 
-class DatabaseManager:
+    Args:
+        group_name (str): 그룹 이름
+        language (str): 언어 코드
+
+    Returns:
+        str: 기본 멘트 내용
     """
-    데이터베이스 관리 클래스
-    멘트 그룹 및 멘트 관리, 오디오 파일 스캔 등의 기능 제공
+    template = DEFAULT_PHRASE_TEMPLATES.get(language, "Default phrase for {group_name}")
+    return template.format(group_name=group_name)
+
+
+def probe_audio_file(path):
+    """
+    오디오 파일의 존재 여부, 크기, 재생 시간 확인
+
+    재생 시간은 WAV 헤더에서만 읽음 (그 외 형식은 None)
+
+    Args:
+        path (str): 오디오 파일 경로
+
+    Returns:
+        tuple: (존재 여부, 크기(바이트), 재생 시간(초))
+    """
+    if not path:
+        return (False, None, None)
+
+    try:
+        size = os.stat(path).st_size
+    except OSError:
+        return (False, None, None)
+
+    duration = None
+    if path.lower().endswith(".wav"):
+        try:
+            with wave.open(path, "rb") as wav_file:
+                frame_rate = wav_file.getframerate()
+                if frame_rate:
+                    duration = wav_file.getnframes() / frame_rate
+        except (wave.Error, EOFError, OSError):
+            pass
+
+    return (True, size, duration)
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    연결 풀에서 사용하는 SQLite 연결
+    close() 호출 시 실제로 닫지 않고 풀에 반환 (진행 중인 트랜잭션은 롤백)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+
+    def close(self):
+        if self.pool is None:
+            super().close()
+            return
+        self.pool.release(self)
+
+    def force_close(self):
+        """풀에 반환하지 않고 연결 종료"""
+        super().close()
+
+
+class ConnectionPool:
+    """
+    스레드 안전 SQLite 연결 풀
+    Streamlit 세션 스레드들이 연결을 재사용하여 문장 캐시/페이지 캐시를 유지
     """
 
-    def __init__(self, db_name="voiceprogram.db"):
+    def __init__(self, db_path, size=4, timeout=5.0, cache_size_kb=8192):
         """
-        데이터베이스 관리자 초기화
+        연결 풀 초기화
 
         Args:
-            db_name (str): 데이터베이스 파일명
+            db_path (Path): 데이터베이스 파일 경로
+            size (int): 유지할 최대 유휴 연결 수
+            timeout (float): 잠금 대기 시간(초, busy_timeout)
+            cache_size_kb (int): 연결별 페이지 캐시 크기(KB)
         """
-        self.db_name = db_name
-        self.data_dir = Path("data")
-        self.data_dir.mkdir(exist_ok=True)
-        self.db_path = self.data_dir / self.db_name
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.cache_size_kb = cache_size_kb
 
-        # 데이터베이스 연결 및 테이블 생성
-        self._create_tables()
+        self._idle = []
+        self._lock = threading.Lock()
 
-    def _get_connection(self):
-        """데이터베이스 연결 가져오기"""
-        conn = sqlite3.connect(self.db_path)
+        # 통계
+        self.created = 0
+        self.reused = 0
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_path, timeout=self.timeout, check_same_thread=False, factory=PooledConnection
+        )
         conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{self.cache_size_kb}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.pool = self
+        self.created += 1
         return conn
 
-    def _create_tables(self):
-        """필요한 테이블 생성"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # 멘트 그룹 테이블
-        cursor.execute(
-            """
-        CREATE TABLE IF NOT EXISTS phrase_groups (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            description TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
+    def acquire(self):
         """
-        )
-
-        # 멘트 테이블 확인 및 생성
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='phrases'")
-        if not cursor.fetchone():
-            # 멘트 테이블이 없으면 생성
-            cursor.execute(
-                """
-            CREATE TABLE phrases (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                group_id INTEGER NOT NULL,
-                language TEXT NOT NULL,
-                content TEXT NOT NULL,
-                audio_path TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (group_id) REFERENCES phrase_groups(id) ON DELETE CASCADE
-            )
-            """
-            )
+        유휴 연결을 가져오거나 새로 생성
 
-        conn.commit()
-        conn.close()
+        Returns:
+            PooledConnection: 데이터베이스 연결
+        """
+        with self._lock:
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop()
+        return self._connect()
 
-    def add_phrase_group(self, name, description=""):
+    def release(self, conn):
         """
-        멘트 그룹 추가
+        연결을 풀에 반환 (풀이 가득 찼으면 종료)
 
         Args:
-            name (str): 그룹 이름
-            description (str): 그룹 설명
-
-        Returns:
-            int: 생성된 그룹 ID
+            conn (PooledConnection): 반환할 연결
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("INSERT INTO phrase_groups (name, description) VALUES (?, ?)", (name, description))
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.force_close()
+            return
 
-        group_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.force_close()
 
-        return group_id
+    def close_all(self):
+        """유휴 연결 모두 종료"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.force_close()
 
-    def add_phrase(self, group_id, language, content, audio_path=None):
+    def stats(self):
         """
-        멘트 추가 - 그룹별로 언어당 하나만 유지
-
-        Args:
-            group_id (int): 그룹 ID
-            language (str): 언어 코드
-            content (str): 멘트 내용
-            audio_path (str, optional): 오디오 파일 경로
+        풀 사용 통계
 
         Returns:
-            int: 생성된 멘트 ID
+            dict: size, idle, created, reused
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._lock:
+            return {"size": self.size, "idle": len(self._idle), "created": self.created, "reused": self.reused}
 
-        # 현재 그룹의 언어 조합 존재 여부 확인
-        cursor.execute("SELECT id FROM phrases WHERE group_id = ? AND language = ?", (group_id, language))
-        existing = cursor.fetchone()
 
-        if existing:
-            # 이미 해당 그룹-언어 멘트가 있으면 업데이트
-            phrase_id = existing["id"]
-            print(f"[DEBUG] 기존 그룹-언어 멘트 업데이트: 그룹 {group_id}, 언어 {language}, ID {phrase_id}")
+class CatalogCache:
+    """
+    멘트 그룹/그룹별 멘트 목록의 프로세스 내 읽기 캐시
+    카탈로그 버전이 바뀌면 모든 항목을 버림 (버전은 멘트 그룹/멘트 테이블의 트리거가 올림)
+    """
 
-            # 내용 업데이트
-            cursor.execute("UPDATE phrases SET content = ? WHERE id = ?", (content, phrase_id))
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = {}
 
-            # 오디오 경로가 있으면 업데이트
-            if audio_path:
-                cursor.execute("UPDATE phrases SET audio_path = ? WHERE id = ?", (audio_path, phrase_id))
-                print(f"[DEBUG] 오디오 경로 업데이트: {audio_path}")
-        else:
-            # 새 멘트 추가 (ID는 자동 생성)
-            cursor.execute(
-                "INSERT INTO phrases (group_id, language, content, audio_path) VALUES (?, ?, ?, ?)",
-                (group_id, language, content, audio_path),
-            )
-            phrase_id = cursor.lastrowid
-            print(f"[DEBUG] 새 멘트 추가: 그룹 {group_id}, 언어 {language}, ID {phrase_id}")
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
 
-        conn.commit()
-        conn.close()
+    def get(self, key, version, loader):
+        """
+        캐시된 값을 가져오거나 loader로 읽어 저장
 
-        print(
-            f"[DEBUG] 저장완료: 그룹-언어 조합 ({group_id}-{language}), ID {phrase_id}, 내용: {content}, 오디오: {audio_path}"
-        )
-        return phrase_id
+        Args:
+            key (tuple): 캐시 키 (예: ("groups",), ("phrases", group_id))
+            version (object): 현재 데이터 버전 (조회 전에 읽은 값)
+            loader (callable): 캐시 미스 시 값을 읽어 오는 함수
 
-    def get_phrase_groups(self):
+        Returns:
+            object: 캐시된 값
         """
-        모든 멘트 그룹 가져오기
+        with self._lock:
+            if self._version != version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries = {}
+                self._version = version
+
+            if key in self._entries:
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = loader()
+
+        with self._lock:
+            # 조회 중에 쓰기가 있었으면 저장하지 않음 (다음 호출에서 다시 읽음)
+            if self._version == version:
+                self._entries[key] = value
+        return value
+
+    def clear(self):
+        """캐시 항목 모두 삭제"""
+        with self._lock:
+            self._entries = {}
+            self._version = None
+
+    def stats(self):
+        """
+        캐시 사용 통계
 
         Returns:
-            list: 멘트 그룹 목록
+            dict: entries, hits, misses, invalidations, hit_rate
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM phrase_groups ORDER BY name")
-        groups = cursor.fetchall()
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
 
-        conn.close()
 
-        return groups
+class DatabaseManager:
+    """
+    데이터베이스 관리 클래스
+    멘트 그룹 및 멘트 관리, 오디오 파일 스캔 등의 기능 제공
+    """
 
-    def get_phrases_by_group(self, group_id):
+    def __init__(
+        self,
+        db_name="voiceprogram.db",
+        pool_size=4,
+        catalog_cache=True,
+        slow_query_ms=200,
+        slow_query_log=None,
+        gc_grace_seconds=AUDIO_GC_GRACE_SECONDS,
+        history_backfill=True,
+    ):
         """
-        그룹 ID로 멘트 가져오기
+        데이터베이스 관리자 초기화
 
         Args:
-            group_id (int): 그룹 ID
-
-        Returns:
-            list: 멘트 목록
+            db_name (str): 데이터베이스 파일명
+            pool_size (int): 연결 풀 크기 (0이면 호출마다 연결을 새로 열고 닫음)
+            catalog_cache (bool): 그룹/멘트 목록 읽기 캐시 사용 여부
+            slow_query_ms (float): 느린 쿼리로 기록할 기준 시간(ms)
+            slow_query_log (str, optional): 느린 쿼리를 기록할 로그 파일 경로
+            gc_grace_seconds (float): 삭제된 오디오 파일을 실제로 지우기 전 유예 시간(초)
+            history_backfill (bool): 기록 테이블 생성(v6 마이그레이션) 후 기존 기록 폴더 색인 여부
+                (마이그레이션 트랜잭션 밖에서 backfill_history()로 나눠 처리)
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        self.db_name = db_name
+        self.gc_grace_seconds = gc_grace_seconds
+        self.history_backfill = history_backfill
+        self.data_dir = Path("data")
+        self.data_dir.mkdir(exist_ok=True)
+        self.db_path = self.data_dir / self.db_name
 
-        cursor.execute("SELECT * FROM phrases WHERE group_id = ? ORDER BY language", (group_id,))
-        phrases = cursor.fetchall()
+        # 연결 풀 (WAL, busy_timeout, synchronous=NORMAL 적용)
+        self.pool = ConnectionPool(self.db_path, size=pool_size) if pool_size > 0 else None
 
-        print(f"[DEBUG] 그룹 {group_id} 멘트 조회: {len(phrases)}개 발견")
-        for p in phrases:
-            if isinstance(p, dict):
-                print(
-                    f"[DEBUG] 멘트 ID: {p.get('id')}, 언어: {p.get('language')}, 오디오: {p.get('audio_path', 'None')}"
-                )
-            else:
-                print(f"[DEBUG] 멘트(Raw): {p}")
+        # 데이터 변경 세대 번호 (쓰기 작업마다 증가, 변경 감지용)
+        self.generation = 0
+        self._generation_lock = threading.Lock()
 
-        # 각 phrase 딕셔너리에 audio_path가 None인 경우 빈 문자열로 변환하여 인덱스 에러 방지
-        result = []
-        for phrase in phrases:
-            phrase_dict = dict(phrase)
-            if "audio_path" not in phrase_dict or phrase_dict["audio_path"] is None:
-                phrase_dict["audio_path"] = ""
-                print(f"[DEBUG] audio_path 없음: 멘트 ID {phrase_dict.get('id')}")
-            else:
-                # 오디오 파일 존재 여부 확인
-                if os.path.exists(phrase_dict["audio_path"]):
-                    print(f"[DEBUG] 오디오 파일 존재: {phrase_dict['audio_path']}")
-                else:
-                    print(f"[DEBUG] 오디오 파일 없음: {phrase_dict['audio_path']}")
+        # 그룹/그룹별 멘트 목록 읽기 캐시 (카탈로그 버전이 바뀌면 무효화)
+        self.catalog_cache = CatalogCache() if catalog_cache else None
 
-            result.append(phrase_dict)
+        # 카탈로그 버전 조회용 연결 (다른 프로세스의 카탈로그 변경도 감지)
+        self._version_conn = None
+        self._version_lock = threading.Lock()
 
-        conn.close()
+        # 재구성(reinitialize_database_and_scan) 동시 실행 방지
+        self._rebuild_lock = threading.Lock()
 
-        print(f"[DEBUG] 최종 결과: {len(result)}개 멘트 반환")
-        return result
+        # 메서드별 호출 수/지연 시간/반환 행 수 집계 및 느린 쿼리 로그 (instrumentation 훅)
+        self.query_stats = QueryStats(slow_threshold_ms=slow_query_ms, slow_log_path=slow_query_log)
+        self._query_listeners = [self.query_stats]
 
-    def search_phrases(self, query, search_type="all"):
-        """
-        멘트 검색 (간단한 키워드 검색)
+        # 적용된 스키마 버전 (PRAGMA user_version)
+        self.schema_version = 0
 
-        Args:
-            query (str): 검색 키워드
-            search_type (str): 검색 타입 - "all", "group", "content" 중 하나
+        # FTS5 전문 검색 사용 가능 여부 (마이그레이션 후 결정)
+        self.fts_enabled = False
 
-        Returns:
-            list: 검색 결과 멘트 목록
+        # 기존 기록 폴더 색인 대기 여부 (v6 마이그레이션이 표시, backfill_history()가 처리)
+        self.history_backfill_pending = False
+
+        # 데이터베이스 연결 및 테이블 생성
+        self._create_tables()
+
+    def _get_connection(self):
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        데이터베이스 연결 가져오기
 
-        # 키워드로 검색
-        search_term = f"%{query}%"
+        연결 풀을 사용하는 경우 conn.close()는 연결을 풀에 반환함 (보통은 _connection()을 사용)
+        """
+        if self.pool is not None:
+            return self.pool.acquire()
 
-        # 검색 타입에 따라 쿼리 분기
-        if search_type == "group":
-            # 그룹 이름으로만 검색
-            cursor.execute(
-                """
-            SELECT p.*, g.name as group_name
-            FROM phrases p
-            JOIN phrase_groups g ON p.group_id = g.id
-            WHERE g.name LIKE ?
-            ORDER BY g.name, p.language
-            """,
-                (search_term,),
-            )
-        elif search_type == "content":
-            # 멘트 내용으로만 검색
-            cursor.execute(
-                """
-            SELECT p.*, g.name as group_name
-            FROM phrases p
-            JOIN phrase_groups g ON p.group_id = g.id
-            WHERE p.content LIKE ?
-            ORDER BY g.name, p.language
-            """,
-                (search_term,),
-            )
-        else:
-            # 기본: 모든 필드 검색
-            cursor.execute(
-                """
-            SELECT p.*, g.name as group_name
-            FROM phrases p
-            JOIN phrase_groups g ON p.group_id = g.id
-            WHERE p.content LIKE ? OR g.name LIKE ?
-            ORDER BY g.name, p.language
-            """,
-                (search_term, search_term),
-            )
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
 
-        results = cursor.fetchall()
-        conn.close()
+    @contextmanager
+    def _connection(self):
+        """
+        연결을 가져와 블록이 끝나면 반환하는 컨텍스트 관리자
 
-        return results
+        블록 도중 예외가 발생해도 진행 중인 트랜잭션을 롤백하고 연결을 반환(풀이 없으면 종료)함
 
-    def delete_phrase(self, phrase_id):
+        Yields:
+            sqlite3.Connection: 데이터베이스 연결
         """
-        멘트 삭제
+        conn = self._get_connection()
+        try:
+            yield conn
+        finally:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            finally:
+                conn.close()
+
+    def close(self):
+        """연결 풀의 유휴 연결 종료"""
+        if self.pool is not None:
+            self.pool.close_all()
+
+        with self._version_lock:
+            if self._version_conn is not None:
+                self._version_conn.close()
+                self._version_conn = None
+
+    def add_query_listener(self, listener):
+        """
+        instrumentation 훅 등록
 
         Args:
-            phrase_id (int): 멘트 ID
+            listener (callable): listener(메서드 이름, 소요 시간(초), 반환 행 수, 예외 repr, 인자) 형태의 함수
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        self._query_listeners.append(listener)
+
+    def remove_query_listener(self, listener):
+        """
+        instrumentation 훅 해제
 
-        # 멘트 오디오 파일 경로 확인
-        cursor.execute("SELECT audio_path FROM phrases WHERE id = ?", (phrase_id,))
-        row = cursor.fetchone()
+        Args:
+            listener (callable): add_query_listener()로 등록한 함수
+        """
+        if listener in self._query_listeners:
+            self._query_listeners.remove(listener)
 
-        if row and row["audio_path"]:
-            # 파일이 존재하면 삭제
+    def _record_query(self, method, elapsed, rows, error, args):
+        """@instrumented 메서드 호출 결과를 등록된 훅에 전달 (훅 오류는 호출에 영향을 주지 않음)"""
+        for listener in self._query_listeners:
             try:
-                audio_path = row["audio_path"]
-                if os.path.exists(audio_path):
-                    os.remove(audio_path)
-            except Exception as e:
-                print(f"오디오 파일 삭제 중 오류: {e}")
+                listener(method, elapsed, rows, error, args)
+            except Exception:
+                logger.exception("instrumentation 훅 실행 중 오류 발생")
 
-        # 멘트 삭제
-        cursor.execute("DELETE FROM phrases WHERE id = ?", (phrase_id,))
-        conn.commit()
-        conn.close()
+    def _bump_generation(self):
+        """
+        데이터 변경 세대 번호 증가 (커밋 이후에 호출)
+        """
+        with self._generation_lock:
+            self.generation += 1
 
-    def delete_phrase_group(self, group_id):
+    def _cached(self, key, loader):
         """
-        멘트 그룹 삭제
+        카탈로그 캐시를 거쳐 조회 (캐시를 사용하지 않으면 바로 조회)
 
         Args:
-            group_id (int): 그룹 ID
+            key (tuple): 캐시 키
+            loader (callable): 실제 조회 함수
+
+        Returns:
+            object: 조회 결과
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        if self.catalog_cache is None:
+            return loader()
+        return self.catalog_cache.get(key, self._cache_version(), loader)
 
-        # 그룹에 속한 모든 멘트의 오디오 파일 삭제
-        cursor.execute("SELECT audio_path FROM phrases WHERE group_id = ?", (group_id,))
-        rows = cursor.fetchall()
+    def _cache_version(self):
+        """
+        캐시 무효화 기준 버전
 
-        for row in rows:
-            if row["audio_path"]:
-                try:
-                    audio_path = row["audio_path"]
-                    if os.path.exists(audio_path):
-                        os.remove(audio_path)
-                except Exception as e:
-                    print(f"오디오 파일 삭제 중 오류: {e}")
+        멘트 그룹/멘트 테이블이 바뀔 때만 트리거가 올리는 catalog_version 값을 사용하므로
+        녹음/대화 기록 등 다른 테이블의 커밋은 캐시를 무효화하지 않음 (다른 프로세스의 변경은 반영)
 
-        # 그룹 및 관련 멘트 삭제 (외래 키 제약조건으로 인해 자동 삭제)
-        cursor.execute("DELETE FROM phrase_groups WHERE id = ?", (group_id,))
-        conn.commit()
-        conn.close()
+        Returns:
+            int: 카탈로그 버전
+        """
+        with self._version_lock:
+            if self._version_conn is None:
+                self._version_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            return self._version_conn.execute("SELECT version FROM catalog_version").fetchone()[0]
 
-    def update_phrase(self, phrase_id, content):
+    def cache_stats(self):
         """
-        멘트 내용 업데이트
+        카탈로그 캐시 사용 통계
 
-        Args:
-            phrase_id (int): 멘트 ID
-            content (str): 새 멘트 내용
+        Returns:
+            dict: 캐시 통계 (캐시를 사용하지 않으면 None)
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        if self.catalog_cache is None:
+            return None
+        return self.catalog_cache.stats()
 
-        cursor.execute("UPDATE phrases SET content = ? WHERE id = ?", (content, phrase_id))
-        conn.commit()
-        conn.close()
+    def _create_tables(self):
+        """
+        필요한 테이블 생성 및 스키마 마이그레이션 적용
 
-    def update_phrase_group(self, group_id, name, description):
+        PRAGMA user_version에 적용된 스키마 버전을 기록하고, 그보다 높은 버전의 마이그레이션만
+        순서대로 한 트랜잭션씩 실행
         """
-        멘트 그룹 정보 업데이트
+        with self._connection() as conn:
+            for version, description, migrate in self._migrations():
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                    continue
 
-        Args:
-            group_id (int): 그룹 ID
-            name (str): 새 그룹 이름
-            description (str): 새 그룹 설명
+                # 다른 프로세스가 동시에 마이그레이션하는 경우를 대비해 쓰기 잠금 후 버전 재확인
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    current_version = conn.execute("PRAGMA user_version").fetchone()[0]
+                    if current_version >= version:
+                        conn.rollback()
+                        continue
+
+                    migrate(conn.cursor())
+                    conn.execute(f"PRAGMA user_version = {version}")
+                    conn.commit()
+                    logger.info("스키마 마이그레이션 v%d 적용: %s", version, description)
+                except Exception:
+                    conn.rollback()
+                    raise
+
+            self.schema_version = conn.execute("PRAGMA user_version").fetchone()[0]
+            self.fts_enabled = (
+                conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'phrase_search'").fetchone()
+                is not None
+            )
+            # 이전 버전에서 v6를 적용한 데이터베이스에는 pending_tasks 테이블이 없음 (색인도 이미 끝남)
+            self.history_backfill_pending = (
+                conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pending_tasks'").fetchone()
+                is not None
+                and conn.execute("SELECT 1 FROM pending_tasks WHERE name = 'history_backfill'").fetchone() is not None
+            )
+
+    def _migrations(self):
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        스키마 마이그레이션 목록
 
+        Returns:
+            list: (버전, 설명, 마이그레이션 함수) 목록 (버전 오름차순)
+        """
+        return [
+            (1, "기본 스키마 (멘트 그룹, 멘트, 오디오 매니페스트)", self._migrate_v1),
+            (2, "멘트 (group_id, language) 중복 제거 및 고유 인덱스", self._migrate_v2),
+            (3, "멘트 전문 검색 인덱스 (FTS5 trigram)", self._migrate_v3),
+            (4, "멘트 오디오 상태 컬럼 (존재 여부, 크기, 재생 시간)", self._migrate_v4),
+            (5, "삭제 기록 및 오디오 파일 삭제 대기열", self._migrate_v5),
+            (6, "녹음/대화/메시지 기록 테이블 (기존 기록 폴더 색인 대기 표시)", self._migrate_v6),
+            (7, "내용 주소 오디오 저장소 (blob 참조 수 트리거)", self._migrate_v7),
+            (8, "카탈로그 버전 (멘트 그룹/멘트 변경 트리거, 캐시 무효화용)", self._migrate_v8),
+            (9, "저장소 파일 회수 중 표시 컬럼", self._migrate_v9),
+        ]
+
+    def _migrate_v1(self, cursor):
+        """기본 스키마 생성 (이전 버전에서 만든 데이터베이스에도 안전하게 적용)"""
+        # 멘트 그룹 테이블
         cursor.execute(
-            "UPDATE phrase_groups SET name = ?, description = ? WHERE id = ?", (name, description, group_id)
+            """
+        CREATE TABLE IF NOT EXISTS phrase_groups (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            description TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
-        conn.commit()
-        conn.close()
-
-    def update_phrase_audio(self, phrase_id, audio_path):
         """
-        멘트 오디오 파일 경로 업데이트
+        )
 
-        Args:
-            phrase_id (int): 멘트 ID
-            audio_path (str): 새 오디오 파일 경로
+        # 멘트 테이블
+        cursor.execute(
+            """
+        CREATE TABLE IF NOT EXISTS phrases (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            group_id INTEGER NOT NULL,
+            language TEXT NOT NULL,
+            content TEXT NOT NULL,
+            audio_path TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (group_id) REFERENCES phrase_groups(id) ON DELETE CASCADE
+        )
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # 현재 phrases 테이블에 audio_path 열이 있는지 확인
-        cursor.execute("PRAGMA table_info(phrases)")
-        columns = cursor.fetchall()
-
-        has_audio_path = any(col["name"] == "audio_path" for col in columns)
-        print("업데이트", has_audio_path, audio_path)
+        )
 
-        if not has_audio_path:
-            # audio_path 열이 없으면 추가
+        # audio_path 열이 없던 초기 버전의 멘트 테이블 보완
+        columns = [row["name"] for row in cursor.execute("PRAGMA table_info(phrases)").fetchall()]
+        if "audio_path" not in columns:
             cursor.execute("ALTER TABLE phrases ADD COLUMN audio_path TEXT")
-            conn.commit()
-
-        # 이후 코드 실행
-        try:
-            # 기존 오디오 파일 경로 확인
-            cursor.execute("SELECT audio_path FROM phrases WHERE id = ?", (phrase_id,))
-            row = cursor.fetchone()
-
-            if row and row["audio_path"]:
-                # 기존 파일이 존재하면 삭제
-                try:
-                    old_audio_path = row["audio_path"]
-                    if os.path.exists(old_audio_path):
-                        os.remove(old_audio_path)
-                except Exception as e:
-                    print(f"기존 오디오 파일 삭제 중 오류: {e}")
-        except sqlite3.OperationalError:
-            # audio_path 열이 없는 경우에도 계속 진행
-            pass
 
-        # 새 오디오 파일 경로 업데이트
-        cursor.execute("UPDATE phrases SET audio_path = ? WHERE id = ?", (audio_path, phrase_id))
-        conn.commit()
-        conn.close()
+        # 오디오 파일 매니페스트 (증분 스캔용)
+        cursor.execute(
+            """
+        CREATE TABLE IF NOT EXISTS audio_manifest (
+            path TEXT PRIMARY KEY,
+            group_id INTEGER NOT NULL,
+            language TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            inode INTEGER,
+            scanned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+        )
+        cursor.execute(
+            """
+        CREATE INDEX IF NOT EXISTS idx_audio_manifest_group_language
+        ON audio_manifest (group_id, language, mtime_ns)
+        """
+        )
 
-    def get_phrase(self, phrase_id):
+        # 언어 폴더별 마지막 스캔 시점의 mtime
+        cursor.execute(
+            """
+        CREATE TABLE IF NOT EXISTS audio_manifest_dirs (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL
+        )
         """
-        특정 멘트 정보 가져오기
+        )
 
-        Args:
-            phrase_id (int): 멘트 ID
+    def _migrate_v2(self, cursor):
+        """
+        그룹/언어별 멘트를 하나로 제한하는 고유 인덱스 추가
+
+        중복된 (group_id, language) 멘트는 오디오가 있는 멘트, 그다음 ID가 가장 작은 멘트만 남김
+        """
+        cursor.execute(
+            """
+        DELETE FROM phrases
+        WHERE id NOT IN (
+            SELECT (
+                SELECT p2.id FROM phrases p2
+                WHERE p2.group_id = p.group_id AND p2.language = p.language
+                ORDER BY (p2.audio_path IS NULL OR p2.audio_path = ''), p2.id
+                LIMIT 1
+            )
+            FROM phrases p
+            GROUP BY p.group_id, p.language
+        )
+        """
+        )
+        if cursor.rowcount > 0:
+            logger.info("중복 멘트 %d개 삭제 (그룹/언어별 하나만 유지)", cursor.rowcount)
+
+        # 그룹/언어별 멘트 조회, 누락 언어 확인, 스캐너 조회용 (이전의 일반 인덱스 대체)
+        cursor.execute("DROP INDEX IF EXISTS idx_phrases_group_language")
+        cursor.execute(
+            """
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_phrases_group_language
+        ON phrases (group_id, language)
+        """
+        )
+
+    def _migrate_v3(self, cursor):
+        """
+        멘트 내용/그룹 이름 전문 검색용 FTS5 테이블 및 동기화 트리거 생성
+
+        trigram 토크나이저를 사용하여 띄어쓰기가 없는 한국어/일본어/중국어도 부분 문자열로 검색 가능
+        SQLite에 FTS5 또는 trigram 토크나이저가 없으면 건너뛰고 LIKE 검색을 사용
+        """
+        try:
+            cursor.execute(
+                """
+            CREATE VIRTUAL TABLE IF NOT EXISTS phrase_search
+            USING fts5(content, group_name, tokenize = 'trigram')
+            """
+            )
+        except sqlite3.OperationalError as e:
+            logger.info("FTS5 trigram을 사용할 수 없어 LIKE 검색을 사용합니다: %s", e)
+            return
+
+        # 멘트 추가/수정/삭제 시 검색 인덱스 갱신 (rowid = 멘트 ID)
+        cursor.execute(
+            """
+        CREATE TRIGGER IF NOT EXISTS phrases_search_insert AFTER INSERT ON phrases BEGIN
+            INSERT INTO phrase_search (rowid, content, group_name)
+            VALUES (new.id, new.content, (SELECT name FROM phrase_groups WHERE id = new.group_id));
+        END
+        """
+        )
+        cursor.execute(
+            """
+        CREATE TRIGGER IF NOT EXISTS phrases_search_update AFTER UPDATE OF content, group_id ON phrases BEGIN
+            DELETE FROM phrase_search WHERE rowid = old.id;
+            INSERT INTO phrase_search (rowid, content, group_name)
+            VALUES (new.id, new.content, (SELECT name FROM phrase_groups WHERE id = new.group_id));
+        END
+        """
+        )
+        cursor.execute(
+            """
+        CREATE TRIGGER IF NOT EXISTS phrases_search_delete AFTER DELETE ON phrases BEGIN
+            DELETE FROM phrase_search WHERE rowid = old.id;
+        END
+        """
+        )
+
+        # 그룹 이름 변경 시, 또는 멘트보다 그룹이 나중에 생성된 경우 그룹 이름 반영
+        cursor.execute(
+            """
+        CREATE TRIGGER IF NOT EXISTS phrase_groups_search_insert AFTER INSERT ON phrase_groups BEGIN
+            UPDATE phrase_search SET group_name = new.name
+            WHERE rowid IN (SELECT id FROM phrases WHERE group_id = new.id);
+        END
+        """
+        )
+        cursor.execute(
+            """
+        CREATE TRIGGER IF NOT EXISTS phrase_groups_search_update AFTER UPDATE OF name ON phrase_groups BEGIN
+            UPDATE phrase_search SET group_name = new.name
+            WHERE rowid IN (SELECT id FROM phrases WHERE group_id = new.id);
+        END
+        """
+        )
+
+        # 기존 멘트 색인
+        cursor.execute("DELETE FROM phrase_search")
+        cursor.execute(
+            """
+        INSERT INTO phrase_search (rowid, content, group_name)
+        SELECT p.id, p.content, g.name
+        FROM phrases p
+        LEFT JOIN phrase_groups g ON g.id = p.group_id
+        """
+        )
+
+    def _migrate_v4(self, cursor):
+        """멘트 오디오 상태 컬럼 추가 및 기존 멘트의 오디오 파일 확인"""
+        cursor.execute("ALTER TABLE phrases ADD COLUMN audio_exists INTEGER NOT NULL DEFAULT 0")
+        cursor.execute("ALTER TABLE phrases ADD COLUMN audio_size INTEGER")
+        cursor.execute("ALTER TABLE phrases ADD COLUMN audio_duration REAL")
+        self._refresh_audio_status(cursor)
+
+    def _migrate_v5(self, cursor):
+        """삭제 기록(되돌리기용 스냅샷)과 오디오 파일 삭제 대기열 테이블 생성"""
+        # 삭제 작업 단위 기록 (kind: phrase/group/audio, payload: 되돌리기용 JSON 스냅샷)
+        cursor.execute(
+            """
+        CREATE TABLE IF NOT EXISTS deletion_batches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            group_id INTEGER,
+            label TEXT,
+            payload TEXT NOT NULL,
+            deleted_at REAL NOT NULL,
+            purge_after REAL NOT NULL
+        )
+        """
+        )
+
+        # 유예 시간이 지나면 백그라운드 작업자가 지울 오디오 파일
+        cursor.execute(
+            """
+        CREATE TABLE IF NOT EXISTS audio_gc_queue (
+            path TEXT PRIMARY KEY,
+            batch_id INTEGER NOT NULL,
+            purge_after REAL NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT
+        )
+        """
+        )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_audio_gc_queue_purge ON audio_gc_queue (purge_after)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_audio_gc_queue_batch ON audio_gc_queue (batch_id)")
+
+    def _migrate_v6(self, cursor):
+        """녹음/대화/메시지 기록 테이블 생성 (기존 recordings/conversations 폴더 색인은 backfill_history()에서 처리)"""
+        # 녹음 기록 (멘트 정보, STT 결과, 언어별 번역(JSON) 포함)
+        cursor.execute(
+            """
+        CREATE TABLE IF NOT EXISTS recordings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            date TEXT NOT NULL,
+            customer_id TEXT NOT NULL,
+            time_str TEXT NOT NULL,
+            audio_path TEXT NOT NULL UNIQUE,
+            metadata_path TEXT,
+            phrase_id INTEGER,
+            group_id INTEGER,
+            group_name TEXT,
+            language TEXT,
+            content TEXT,
+            stt_text TEXT,
+            translations TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+        )
+        cursor.execute(
+            """
+        CREATE INDEX IF NOT EXISTS idx_recordings_user_date_customer
+        ON recordings (username, date, customer_id, time_str)
+        """
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_recordings_user_customer ON recordings (username, customer_id, date)"
+        )
+
+        # 대화 기록 파일 (conversation.json 또는 conversation_{HHMMSS}.json)
+        cursor.execute(
+            """
+        CREATE TABLE IF NOT EXISTS conversations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            date TEXT NOT NULL,
+            customer_id TEXT NOT NULL,
+            file_path TEXT NOT NULL UNIQUE,
+            file_name TEXT NOT NULL,
+            time_str TEXT NOT NULL,
+            message_count INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+        )
+        cursor.execute(
+            """
+        CREATE INDEX IF NOT EXISTS idx_conversations_user_date_customer
+        ON conversations (username, date, customer_id)
+        """
+        )
+
+        # 대화 메시지 (대화 파일 내 순서대로)
+        cursor.execute(
+            """
+        CREATE TABLE IF NOT EXISTS messages (
+            conversation_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            speaker TEXT NOT NULL,
+            timestamp TEXT,
+            text TEXT,
+            translation TEXT,
+            audio_path TEXT,
+            PRIMARY KEY (conversation_id, position)
+        )
+        """
+        )
+
+        # 기존 기록 폴더 색인은 파일을 모두 읽어야 하므로 표시만 해 두고 마이그레이션 트랜잭션 밖에서 나눠 처리
+        # (중간에 종료되어도 표시가 남아 다음 실행에서 이어서 색인)
+        cursor.execute("CREATE TABLE IF NOT EXISTS pending_tasks (name TEXT PRIMARY KEY)")
+        if self.history_backfill:
+            cursor.execute("INSERT OR IGNORE INTO pending_tasks (name) VALUES ('history_backfill')")
+
+    def _migrate_v7(self, cursor):
+        """내용 주소 오디오 저장소의 blob 테이블과 멘트 오디오 경로 참조 수 트리거 생성"""
+        # 저장소 파일 (path = {AUDIO_STORE_DIR}/{digest[:2]}/{digest}{ext}, released_at: 마지막 참조 해제 시각)
+        cursor.execute(
+            """
+        CREATE TABLE IF NOT EXISTS audio_blobs (
+            path TEXT PRIMARY KEY,
+            digest TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            refcount INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL,
+            released_at REAL
+        )
+        """
+        )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_audio_blobs_digest ON audio_blobs (digest)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_audio_blobs_unreferenced ON audio_blobs (refcount, released_at)")
+
+        # 멘트 추가/오디오 변경/삭제 시 참조 수 갱신 (저장소 밖의 경로는 일치하는 행이 없어 무시됨)
+        now = "((julianday('now') - 2440587.5) * 86400.0)"
+        cursor.execute(
+            """
+        CREATE TRIGGER IF NOT EXISTS phrases_blob_insert AFTER INSERT ON phrases
+        WHEN new.audio_path IS NOT NULL BEGIN
+            UPDATE audio_blobs SET refcount = refcount + 1 WHERE path = new.audio_path;
+        END
+        """
+        )
+        cursor.execute(
+            f"""
+        CREATE TRIGGER IF NOT EXISTS phrases_blob_update AFTER UPDATE OF audio_path ON phrases
+        WHEN old.audio_path IS NOT new.audio_path BEGIN
+            UPDATE audio_blobs SET refcount = refcount - 1, released_at = {now} WHERE path = old.audio_path;
+            UPDATE audio_blobs SET refcount = refcount + 1 WHERE path = new.audio_path;
+        END
+        """
+        )
+        cursor.execute(
+            f"""
+        CREATE TRIGGER IF NOT EXISTS phrases_blob_delete AFTER DELETE ON phrases
+        WHEN old.audio_path IS NOT NULL BEGIN
+            UPDATE audio_blobs SET refcount = refcount - 1, released_at = {now} WHERE path = old.audio_path;
+        END
+        """
+        )
+
+    def _migrate_v8(self, cursor):
+        """멘트 그룹/멘트가 바뀔 때마다 올라가는 카탈로그 버전 테이블과 트리거 생성"""
+        cursor.execute(
+            """
+        CREATE TABLE IF NOT EXISTS catalog_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+        """
+        )
+        cursor.execute("INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0)")
+
+        for table in ("phrase_groups", "phrases"):
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                cursor.execute(
+                    f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_catalog_{event.lower()} AFTER {event} ON {table} BEGIN
+                    UPDATE catalog_version SET version = version + 1;
+                END
+                """
+                )
+
+    def _migrate_v9(self, cursor):
+        """저장소 파일 회수를 쓰기 잠금 밖에서 진행하기 위한 회수 중 표시 컬럼 추가"""
+        cursor.execute("ALTER TABLE audio_blobs ADD COLUMN reclaiming INTEGER NOT NULL DEFAULT 0")
+
+    def _audio_status_values(self, audio_path):
+        """
+        오디오 상태 컬럼(audio_exists, audio_size, audio_duration)에 저장할 값
+
+        Args:
+            audio_path (str): 오디오 파일 경로
+
+        Returns:
+            tuple: (존재 여부(0/1), 크기, 재생 시간)
+        """
+        exists, size, duration = probe_audio_file(audio_path)
+        return (int(exists), size, duration)
+
+    def _refresh_audio_status(self, cursor, where="", params=()):
+        """
+        멘트의 오디오 상태(존재 여부, 크기, 재생 시간)를 파일 시스템에서 다시 읽어 저장
+
+        UI가 렌더링마다 파일을 확인하지 않도록 스캔/오디오 변경 시점에만 호출
+
+        Args:
+            cursor (sqlite3.Cursor): 트랜잭션 중인 커서
+            where (str): 대상 멘트 조건 (예: "WHERE group_id = ? AND language = ?", 없으면 전체)
+            params (tuple): 조건 파라미터
+
+        Returns:
+            int: 상태가 바뀐 멘트 수
+        """
+        cursor.execute(f"SELECT id, audio_path, audio_exists, audio_size, audio_duration FROM phrases {where}", params)
+
+        updates = []
+        for row in cursor.fetchall():
+            status = probe_audio_file(row["audio_path"])
+            exists, size, duration = status
+            if (bool(row["audio_exists"]), row["audio_size"], row["audio_duration"]) != status:
+                updates.append((int(exists), size, duration, row["id"]))
+
+        cursor.executemany(
+            "UPDATE phrases SET audio_exists = ?, audio_size = ?, audio_duration = ? WHERE id = ?", updates
+        )
+        return len(updates)
+
+    @instrumented
+    def add_phrase_group(self, name, description=""):
+        """
+        멘트 그룹 추가
+
+        Args:
+            name (str): 그룹 이름
+            description (str): 그룹 설명
+
+        Returns:
+            int: 생성된 그룹 ID
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("INSERT INTO phrase_groups (name, description) VALUES (?, ?)", (name, description))
+
+            group_id = cursor.lastrowid
+            conn.commit()
+        self._bump_generation()
+
+        return group_id
+
+    def add_phrase(self, group_id, language, content, audio_path=None):
+        """
+        멘트 추가 - 그룹별로 언어당 하나만 유지
+
+        이미 해당 그룹-언어 멘트가 있으면 내용(및 오디오 경로가 주어진 경우 오디오)을 갱신 (upsert_phrase 사용)
+
+        Args:
+            group_id (int): 그룹 ID
+            language (str): 언어 코드
+            content (str): 멘트 내용
+            audio_path (str, optional): 오디오 파일 경로
+
+        Returns:
+            int: 생성되거나 갱신된 멘트 ID
+        """
+        return self.upsert_phrase(group_id, language, content, audio_path or None)
+
+    def _upsert_params(self, group_id, language, content, audio_path):
+        """UPSERT_PHRASE_SQL 파라미터 (오디오 경로가 있으면 파일 상태 포함)"""
+        if audio_path:
+            return (group_id, language, content, audio_path, *self._audio_status_values(audio_path))
+        return (group_id, language, content, None, 0, None, None)
+
+    @instrumented
+    def upsert_phrase(self, group_id, language, content, audio_path=None):
+        """
+        그룹-언어 멘트를 한 문장으로 추가 또는 갱신 (INSERT ... ON CONFLICT DO UPDATE)
+
+        SELECT 후 INSERT/UPDATE 하거나 MAX(id)+1로 ID를 정하지 않으므로 여러 세션이 동시에 호출해도
+        중복 행이나 ID 충돌이 생기지 않음
+
+        Args:
+            group_id (int): 그룹 ID
+            language (str): 언어 코드
+            content (str): 멘트 내용
+            audio_path (str, optional): 오디오 파일 경로 (없으면 기존 오디오 유지)
+
+        Returns:
+            int: 멘트 ID
+        """
+        params = self._upsert_params(group_id, language, content, audio_path)
+
+        with self._connection() as conn:
+            if SQLITE_HAS_RETURNING:
+                phrase_id = conn.execute(UPSERT_PHRASE_SQL + " RETURNING id", params).fetchone()[0]
+            else:
+                conn.execute(UPSERT_PHRASE_SQL, params)
+                phrase_id = conn.execute(
+                    "SELECT id FROM phrases WHERE group_id = ? AND language = ?", (group_id, language)
+                ).fetchone()[0]
+            conn.commit()
+        self._bump_generation()
+
+        logger.debug(
+            "멘트 저장 완료: group_id=%s language=%s id=%s audio_path=%s", group_id, language, phrase_id, audio_path
+        )
+        return phrase_id
+
+    @instrumented
+    def upsert_phrases(self, phrases):
+        """
+        여러 그룹-언어 멘트를 한 트랜잭션, 한 번의 executemany로 추가 또는 갱신
+
+        Args:
+            phrases (iterable): (group_id, language, content, audio_path) 튜플 또는 같은 키를 가진 dict 목록
+
+        Returns:
+            int: 처리한 멘트 수
+        """
+        rows = []
+        for phrase in phrases:
+            if isinstance(phrase, dict):
+                phrase = (phrase["group_id"], phrase["language"], phrase["content"], phrase.get("audio_path"))
+            group_id, language, content, audio_path = (tuple(phrase) + (None,))[:4]
+            rows.append(self._upsert_params(group_id, language, content, audio_path or None))
+
+        if not rows:
+            return 0
+
+        with self._connection() as conn:
+            conn.executemany(UPSERT_PHRASE_SQL, rows)
+            conn.commit()
+        self._bump_generation()
+
+        logger.debug("멘트 일괄 저장 완료: %d개", len(rows))
+        return len(rows)
+
+    @instrumented
+    def import_phrases(self, records):
+        """
+        그룹/멘트 목록을 한 트랜잭션으로 가져오기
+
+        그룹은 group_id가 있으면 ID로, 없으면 이름으로 찾고 없으면 생성함
+        멘트는 그룹-언어 기준 upsert (executemany), 오류가 나면 전체 롤백
+
+        Args:
+            records (list): group_id(선택), group_name, group_description(선택), language, content,
+                audio_path(선택) 키를 가진 dict 목록 (phrase_io에서 검증된 값)
+
+        Returns:
+            dict: groups_created(생성한 그룹 수), phrases(처리한 멘트 수)
+        """
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+
+            existing_ids = {row["id"] for row in conn.execute("SELECT id FROM phrase_groups")}
+            ids_by_name = {}
+            for row in conn.execute("SELECT id, name FROM phrase_groups ORDER BY id"):
+                ids_by_name.setdefault(row["name"], row["id"])
+
+            # 없는 그룹 생성 (ID가 지정된 그룹은 ID 유지)
+            new_groups = {}
+            for record in records:
+                group_id = record.get("group_id")
+                group_row = (group_id, record["group_name"], record.get("group_description") or "")
+                if group_id is not None and group_id not in existing_ids:
+                    new_groups.setdefault(("id", group_id), group_row)
+                elif group_id is None and record["group_name"] not in ids_by_name:
+                    new_groups.setdefault(("name", record["group_name"]), group_row)
+
+            conn.executemany(
+                "INSERT INTO phrase_groups (id, name, description) VALUES (?, ?, ?)", list(new_groups.values())
+            )
+            for row in conn.execute("SELECT id, name FROM phrase_groups ORDER BY id"):
+                ids_by_name.setdefault(row["name"], row["id"])
+
+            rows = []
+            for record in records:
+                group_id = record.get("group_id")
+                if group_id is None:
+                    group_id = ids_by_name[record["group_name"]]
+                audio_path = record.get("audio_path") or None
+                rows.append(self._upsert_params(group_id, record["language"], record["content"], audio_path))
+            conn.executemany(UPSERT_PHRASE_SQL, rows)
+            conn.commit()
+        self._bump_generation()
+
+        logger.info("멘트 가져오기 완료: groups_created=%d phrases=%d", len(new_groups), len(rows))
+        return {"groups_created": len(new_groups), "phrases": len(rows)}
+
+    @instrumented
+    def get_phrase_groups(self):
+        """
+        모든 멘트 그룹 가져오기 (카탈로그 캐시 사용)
+
+        Returns:
+            list: 멘트 그룹 목록
+        """
+        return list(self._cached(("groups",), self._load_phrase_groups))
+
+    @instrumented
+    def _load_phrase_groups(self):
+        """데이터베이스에서 모든 멘트 그룹 조회"""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT * FROM phrase_groups ORDER BY name")
+            groups = cursor.fetchall()
+
+        return groups
+
+    @instrumented
+    def get_phrases_by_group(self, group_id):
+        """
+        그룹 ID로 멘트 가져오기 (카탈로그 캐시 사용)
+
+        Args:
+            group_id (int): 그룹 ID
+
+        Returns:
+            list: 멘트 목록 (호출자가 수정해도 캐시에 영향이 없도록 복사본 반환)
+        """
+        phrases = self._cached(("phrases", group_id), lambda: self._load_phrases_by_group(group_id))
+        return [dict(phrase) for phrase in phrases]
+
+    @instrumented
+    def _load_phrases_by_group(self, group_id):
+        """데이터베이스에서 그룹의 멘트 조회"""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT * FROM phrases WHERE group_id = ? ORDER BY language", (group_id,))
+            phrases = cursor.fetchall()
+
+            # 각 phrase 딕셔너리에 audio_path가 None인 경우 빈 문자열로 변환하여 인덱스 에러 방지
+            result = []
+            for phrase in phrases:
+                phrase_dict = dict(phrase)
+                if "audio_path" not in phrase_dict or phrase_dict["audio_path"] is None:
+                    phrase_dict["audio_path"] = ""
+                result.append(phrase_dict)
+
+        logger.debug("그룹 멘트 조회: group_id=%s phrases=%d", group_id, len(result))
+        return result
+
+    @instrumented
+    def get_catalog_snapshot(self):
+        """
+        전체 그룹 → 언어 → 멘트 구조를 한 번의 JOIN 쿼리로 가져오기 (카탈로그 캐시 사용)
+
+        그룹마다 get_phrases_by_group()을 호출하던 N+1 조회를 대체함
+        캐시된 객체를 그대로 반환하므로 호출자는 내용을 수정하지 말 것
+
+        Returns:
+            dict: {
+                "groups": 그룹 목록 (이름순),
+                "by_id": 그룹 ID → 그룹,
+            }
+            각 그룹은 id, name, description, phrases(언어순 멘트 목록), languages(언어 → 멘트 목록)를 가짐
+        """
+        return self._cached(("snapshot",), self._load_catalog_snapshot)
+
+    @instrumented
+    def _load_catalog_snapshot(self):
+        """데이터베이스에서 그룹/멘트 전체를 조회하여 중첩 구조로 정리"""
+        with self._connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT g.id AS g_id, g.name AS g_name, g.description AS g_description,
+                       p.id, p.group_id, p.language, p.content, p.audio_path, p.created_at,
+                       p.audio_exists, p.audio_size, p.audio_duration
+                FROM phrase_groups g
+                LEFT JOIN phrases p ON p.group_id = g.id
+                ORDER BY g.name, g.id, p.language, p.id
+                """
+            ).fetchall()
+
+        groups = []
+        by_id = {}
+        for row in rows:
+            group = by_id.get(row["g_id"])
+            if group is None:
+                group = {
+                    "id": row["g_id"],
+                    "name": row["g_name"],
+                    "description": row["g_description"],
+                    "phrases": [],
+                    "languages": {},
+                }
+                by_id[row["g_id"]] = group
+                groups.append(group)
+
+            # 멘트가 없는 그룹 (LEFT JOIN)
+            if row["id"] is None:
+                continue
+
+            phrase = {
+                "id": row["id"],
+                "group_id": row["group_id"],
+                "language": row["language"],
+                "content": row["content"],
+                "audio_path": row["audio_path"] or "",
+                "created_at": row["created_at"],
+                "audio_exists": bool(row["audio_exists"]),
+                "audio_size": row["audio_size"],
+                "audio_duration": row["audio_duration"],
+            }
+            group["phrases"].append(phrase)
+            group["languages"].setdefault(phrase["language"], []).append(phrase)
+
+        return {"groups": groups, "by_id": by_id}
+
+    @instrumented
+    def get_phrase_groups_page(self, after=None, limit=PAGE_SIZE):
+        """
+        멘트 그룹을 이름순으로 한 페이지씩 가져오기 (키셋 페이지네이션)
+
+        Args:
+            after (tuple, optional): 이전 페이지의 next_cursor (이름, ID). 없으면 첫 페이지
+            limit (int): 페이지 크기
+
+        Returns:
+            dict: items(그룹 목록), next_cursor(다음 페이지 커서, 마지막 페이지면 None)
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            if after is None:
+                cursor.execute("SELECT * FROM phrase_groups ORDER BY name, id LIMIT ?", (limit + 1,))
+            else:
+                cursor.execute(
+                    "SELECT * FROM phrase_groups WHERE (name, id) > (?, ?) ORDER BY name, id LIMIT ?",
+                    (after[0], after[1], limit + 1),
+                )
+            rows = [dict(row) for row in cursor.fetchall()]
+
+        items = rows[:limit]
+        next_cursor = (items[-1]["name"], items[-1]["id"]) if len(rows) > limit else None
+        return {"items": items, "next_cursor": next_cursor}
+
+    @instrumented
+    def get_phrases_page(self, after_id=0, limit=PAGE_SIZE, group_id=None, audio_only=False):
+        """
+        멘트를 ID순으로 한 페이지씩 가져오기 (키셋 페이지네이션)
+
+        Args:
+            after_id (int): 이전 페이지의 마지막 멘트 ID (첫 페이지는 0)
+            limit (int): 페이지 크기
+            group_id (int, optional): 특정 그룹의 멘트만 조회
+            audio_only (bool): True인 경우 오디오 파일이 있는 멘트만 조회 (audio_exists 컬럼 기준)
+
+        Returns:
+            dict: items(멘트 목록, group_name/group_description 포함), next_after_id(다음 페이지 커서, 마지막 페이지면 None)
+        """
+        conditions = ["p.id > ?"]
+        params = [after_id]
+        if group_id is not None:
+            conditions.append("p.group_id = ?")
+            params.append(group_id)
+        if audio_only:
+            conditions.append("p.audio_exists = 1")
+
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+            SELECT p.*, g.name as group_name, g.description as group_description
+            FROM phrases p
+            LEFT JOIN phrase_groups g ON p.group_id = g.id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY p.id
+            LIMIT ?
+            """,
+                (*params, limit + 1),
+            )
+            rows = cursor.fetchmany(limit + 1)
+
+        items = []
+        for row in rows[:limit]:
+            phrase = dict(row)
+            phrase["audio_path"] = phrase["audio_path"] or ""
+            items.append(phrase)
+
+        next_after_id = items[-1]["id"] if len(rows) > limit else None
+        return {"items": items, "next_after_id": next_after_id}
+
+    def iter_phrases(self, group_id=None, audio_only=False, batch_size=500):
+        """
+        멘트를 ID순으로 하나씩 생성하는 제너레이터
+
+        batch_size 단위로 키셋 조회하며, 배치 사이에는 연결을 반환하므로 소비 속도와 무관하게 잠금을 오래 잡지 않음
+
+        Args:
+            group_id (int, optional): 특정 그룹의 멘트만 조회
+            audio_only (bool): True인 경우 오디오 파일이 있는 멘트만 조회 (audio_exists 컬럼 기준)
+            batch_size (int): 한 번에 읽을 행 수
+
+        Yields:
+            dict: 멘트 정보 (group_name/group_description 포함)
+        """
+        after_id = 0
+        while after_id is not None:
+            page = self.get_phrases_page(after_id, batch_size, group_id=group_id, audio_only=audio_only)
+            yield from page["items"]
+            after_id = page["next_after_id"]
+
+    def search_phrases(self, query, search_type="all", limit=SEARCH_RESULT_LIMIT):
+        """
+        멘트 검색
+
+        FTS5 trigram 인덱스가 있고 검색어가 3자 이상이면 BM25 관련도순으로 검색하고,
+        그렇지 않으면 LIKE 부분 문자열 검색으로 대체
+
+        Args:
+            query (str): 검색 키워드
+            search_type (str): 검색 타입 - "all", "group", "content" 중 하나
+            limit (int): 최대 결과 수
+
+        Returns:
+            list: 검색 결과 멘트 목록 (dict, group_name 포함)
+        """
+        return self.search_phrases_page(query, search_type, limit=limit)["items"]
+
+    @instrumented
+    def search_phrases_page(self, query, search_type="all", after=None, limit=PAGE_SIZE):
+        """
+        멘트 검색 결과를 한 페이지씩 가져오기 (키셋 페이지네이션)
+
+        FTS 검색은 (BM25 점수, ID), LIKE 검색은 (그룹 이름, 언어, ID) 순서의 커서를 사용
+
+        Args:
+            query (str): 검색 키워드
+            search_type (str): 검색 타입 - "all", "group", "content" 중 하나
+            after (tuple, optional): 이전 페이지의 next_cursor. 없으면 첫 페이지
+            limit (int): 페이지 크기
+
+        Returns:
+            dict: items(멘트 목록), next_cursor(다음 페이지 커서, 마지막 페이지면 None)
+        """
+        query = (query or "").strip()
+        if not query:
+            return {"items": [], "next_cursor": None}
+
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            use_fts = self.fts_enabled and len(query) >= FTS_MIN_QUERY_LENGTH
+            if use_fts:
+                # 검색어 전체를 하나의 구문으로 처리 (FTS5 문법 문자 이스케이프)
+                phrase_query = '"' + query.replace('"', '""') + '"'
+                if search_type == "group":
+                    match = f"group_name : {phrase_query}"
+                elif search_type == "content":
+                    match = f"content : {phrase_query}"
+                else:
+                    match = phrase_query
+
+                keyset = "WHERE (score, id) > (?, ?)" if after else ""
+                cursor.execute(
+                    f"""
+                SELECT * FROM (
+                    SELECT p.*, g.name as group_name, bm25(phrase_search) as score
+                    FROM phrase_search s
+                    JOIN phrases p ON p.id = s.rowid
+                    JOIN phrase_groups g ON p.group_id = g.id
+                    WHERE phrase_search MATCH ?
+                )
+                {keyset}
+                ORDER BY score, id
+                LIMIT ?
+                """,
+                    (match, *(after or ()), limit + 1),
+                )
+            else:
+                # 키워드로 검색
+                search_term = f"%{query}%"
+
+                # 검색 타입에 따라 조건 분기
+                if search_type == "group":
+                    # 그룹 이름으로만 검색
+                    condition, params = "g.name LIKE ?", [search_term]
+                elif search_type == "content":
+                    # 멘트 내용으로만 검색
+                    condition, params = "p.content LIKE ?", [search_term]
+                else:
+                    # 기본: 모든 필드 검색
+                    condition, params = "(p.content LIKE ? OR g.name LIKE ?)", [search_term, search_term]
+
+                if after:
+                    condition += " AND (g.name, p.language, p.id) > (?, ?, ?)"
+                    params.extend(after)
+
+                cursor.execute(
+                    f"""
+                SELECT p.*, g.name as group_name
+                FROM phrases p
+                JOIN phrase_groups g ON p.group_id = g.id
+                WHERE {condition}
+                ORDER BY g.name, p.language, p.id
+                LIMIT ?
+                """,
+                    (*params, limit + 1),
+                )
+
+            rows = [dict(row) for row in cursor.fetchall()]
+
+        items = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = (last["score"], last["id"]) if use_fts else (last["group_name"], last["language"], last["id"])
+        return {"items": items, "next_cursor": next_cursor}
+
+    def _enqueue_deletion(self, cursor, kind, group_id, label, payload, paths):
+        """
+        삭제 기록을 남기고 오디오 파일을 삭제 대기열에 추가 (트랜잭션 중인 커서로 호출)
+
+        Args:
+            cursor (sqlite3.Cursor): 트랜잭션 중인 커서
+            kind (str): "phrase", "group" 또는 "audio"
+            group_id (int): 그룹 ID
+            label (str): 화면에 표시할 설명
+            payload (dict): 되돌리기용 스냅샷
+            paths (list): 삭제할 오디오 파일 경로 (None은 무시)
+
+        Returns:
+            int: 삭제 기록 ID
+        """
+        deleted_at = time.time()
+        purge_after = deleted_at + self.gc_grace_seconds
+        cursor.execute(
+            """
+        INSERT INTO deletion_batches (kind, group_id, label, payload, deleted_at, purge_after)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            (kind, group_id, label, json.dumps(payload, ensure_ascii=False), deleted_at, purge_after),
+        )
+        batch_id = cursor.lastrowid
+
+        paths = [path for path in paths if path]
+        cursor.executemany(
+            "INSERT OR REPLACE INTO audio_gc_queue (path, batch_id, purge_after) VALUES (?, ?, ?)",
+            [(path, batch_id, purge_after) for path in paths],
+        )
+        # 스캔이 삭제 대기 파일을 최신 파일로 다시 연결하지 않도록 매니페스트에서 제거
+        cursor.executemany("DELETE FROM audio_manifest WHERE path = ?", [(path,) for path in paths])
+        return batch_id
+
+    def _pending_gc_exclusions(self, cursor):
+        """
+        스캔에서 제외할 삭제 대기 항목
+
+        Returns:
+            tuple: (삭제 대기 중인 오디오 파일 경로 set (정규화), 삭제 대기 중인 그룹 ID set)
+        """
+        paths = {os.path.normpath(row[0]) for row in cursor.execute("SELECT path FROM audio_gc_queue").fetchall()}
+        group_ids = {
+            row[0] for row in cursor.execute("SELECT group_id FROM deletion_batches WHERE kind = 'group'").fetchall()
+        }
+        return paths, group_ids
+
+    @instrumented
+    def delete_phrase(self, phrase_id):
+        """
+        멘트 삭제
+
+        데이터베이스 변경은 바로 커밋하고 오디오 파일은 삭제 대기열에 넣음
+        (유예 시간이 지나면 백그라운드 작업자가 삭제, 그 전에는 undo_deletion()으로 되돌릴 수 있음)
+
+        Args:
+            phrase_id (int): 멘트 ID
+
+        Returns:
+            int: 삭제 기록 ID (멘트가 없으면 None)
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.execute(
+                    """
+                SELECT p.group_id, p.language, p.content, p.audio_path, g.name AS group_name
+                FROM phrases p
+                LEFT JOIN phrase_groups g ON g.id = p.group_id
+                WHERE p.id = ?
+                """,
+                    (phrase_id,),
+                )
+                row = cursor.fetchone()
+                if row is None:
+                    conn.rollback()
+                    return None
+
+                batch_id = self._enqueue_deletion(
+                    cursor,
+                    "phrase",
+                    row["group_id"],
+                    f"{row['group_name'] or row['group_id']} / {row['language']} 멘트",
+                    {"phrases": [self._phrase_snapshot(row)]},
+                    [row["audio_path"]],
+                )
+                cursor.execute("DELETE FROM phrases WHERE id = ?", (phrase_id,))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        self._bump_generation()
+        return batch_id
+
+    @instrumented
+    def delete_phrase_group(self, group_id):
+        """
+        멘트 그룹 삭제
+
+        그룹과 그룹의 멘트는 바로 삭제하고 오디오 파일은 삭제 대기열에 넣음
+        (유예 시간 동안 그룹 폴더는 스캔/폴더 동기화에서 제외되어 그룹이 다시 생성되지 않음)
+
+        Args:
+            group_id (int): 그룹 ID
+
+        Returns:
+            int: 삭제 기록 ID (그룹이 없으면 None)
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.execute("SELECT id, name, description, created_at FROM phrase_groups WHERE id = ?", (group_id,))
+                group = cursor.fetchone()
+                if group is None:
+                    conn.rollback()
+                    return None
+
+                cursor.execute(
+                    "SELECT group_id, language, content, audio_path FROM phrases WHERE group_id = ?", (group_id,)
+                )
+                phrases = cursor.fetchall()
+
+                batch_id = self._enqueue_deletion(
+                    cursor,
+                    "group",
+                    group_id,
+                    f"그룹 '{group['name']}'",
+                    {"group": dict(group), "phrases": [self._phrase_snapshot(row) for row in phrases]},
+                    [row["audio_path"] for row in phrases],
+                )
+
+                # 외래 키 제약조건이 꺼져 있으므로 멘트도 직접 삭제
+                cursor.execute("DELETE FROM phrases WHERE group_id = ?", (group_id,))
+                cursor.execute("DELETE FROM phrase_groups WHERE id = ?", (group_id,))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        self._bump_generation()
+        return batch_id
+
+    def _phrase_snapshot(self, row):
+        """되돌리기용 멘트 스냅샷"""
+        return {
+            "group_id": row["group_id"],
+            "language": row["language"],
+            "content": row["content"],
+            "audio_path": row["audio_path"],
+        }
+
+    @instrumented
+    def get_pending_deletions(self):
+        """
+        삭제 대기 중인 삭제 기록 목록 (최신순)
+
+        Returns:
+            list: id, kind, label, deleted_at, purge_after, files(대기 중인 파일 수), undoable
+        """
+        with self._connection() as conn:
+            rows = conn.execute(
+                """
+            SELECT b.id, b.kind, b.label, b.deleted_at, b.purge_after, COUNT(q.path) AS files
+            FROM deletion_batches b
+            LEFT JOIN audio_gc_queue q ON q.batch_id = b.id
+            GROUP BY b.id
+            ORDER BY b.deleted_at DESC
+            """
+            ).fetchall()
+
+        now = time.time()
+        return [dict(row, undoable=row["purge_after"] > now) for row in rows]
+
+    @instrumented
+    def undo_deletion(self, batch_id):
+        """
+        삭제 되돌리기 (유예 시간이 지나지 않은 경우만)
+
+        멘트/그룹을 스냅샷에서 복원하고 오디오 파일을 삭제 대기열에서 뺌
+
+        Args:
+            batch_id (int): 삭제 기록 ID
+
+        Returns:
+            bool: 되돌리기 성공 여부
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.execute("SELECT * FROM deletion_batches WHERE id = ?", (batch_id,))
+                batch = cursor.fetchone()
+                # 유예 시간이 지난 기록은 삭제 작업자가 처리 중일 수 있으므로 되돌리지 않음
+                if batch is None or batch["purge_after"] <= time.time():
+                    conn.rollback()
+                    return False
+
+                payload = json.loads(batch["payload"])
+                cursor.execute("SELECT path FROM audio_gc_queue WHERE batch_id = ?", (batch_id,))
+                paths = [row["path"] for row in cursor.fetchall()]
+
+                if batch["kind"] == "audio":
+                    cursor.execute("SELECT group_id, audio_path FROM phrases WHERE id = ?", (payload["phrase_id"],))
+                    phrase = cursor.fetchone()
+                    if phrase is None:
+                        conn.rollback()
+                        return False
+
+                    # 이후에 교체된 오디오 파일은 새로 삭제 대기열에 넣음
+                    if phrase["audio_path"] and phrase["audio_path"] != payload["audio_path"]:
+                        self._enqueue_deletion(
+                            cursor,
+                            "audio",
+                            phrase["group_id"],
+                            batch["label"],
+                            {"phrase_id": payload["phrase_id"], "audio_path": phrase["audio_path"]},
+                            [phrase["audio_path"]],
+                        )
+                    cursor.execute(
+                        """
+                    UPDATE phrases SET audio_path = ?, audio_exists = ?, audio_size = ?, audio_duration = ?
+                    WHERE id = ?
+                    """,
+                        (
+                            payload["audio_path"],
+                            *self._audio_status_values(payload["audio_path"]),
+                            payload["phrase_id"],
+                        ),
+                    )
+                else:
+                    if batch["kind"] == "group":
+                        group = payload["group"]
+                        cursor.execute(
+                            "INSERT INTO phrase_groups (id, name, description, created_at) VALUES (?, ?, ?, ?)",
+                            (group["id"], group["name"], group["description"], group["created_at"]),
+                        )
+                    cursor.executemany(
+                        UPSERT_PHRASE_SQL,
+                        [
+                            self._upsert_params(p["group_id"], p["language"], p["content"], p["audio_path"])
+                            for p in payload["phrases"]
+                        ],
+                    )
+
+                cursor.execute("DELETE FROM audio_gc_queue WHERE batch_id = ?", (batch_id,))
+                cursor.execute("DELETE FROM deletion_batches WHERE id = ?", (batch_id,))
+
+                # 스캔에서 제외됐던 파일이 다음 스캔에서 매니페스트에 다시 들어가도록 폴더 스캔 기록 삭제
+                cursor.executemany(
+                    "DELETE FROM audio_manifest_dirs WHERE path = ?", [(os.path.dirname(path),) for path in paths]
+                )
+                if batch["kind"] == "group":
+                    cursor.execute(
+                        "DELETE FROM audio_manifest_dirs WHERE path LIKE ?",
+                        (os.path.join("audio_files", str(batch["group_id"]), "%"),),
+                    )
+                conn.commit()
+            except sqlite3.IntegrityError as e:
+                conn.rollback()
+                logger.warning("삭제 되돌리기 실패 (batch_id=%s): %s", batch_id, e)
+                return False
+            except Exception:
+                conn.rollback()
+                raise
+
+        self._bump_generation()
+        return True
+
+    @instrumented
+    def purge_audio_gc_queue(self, limit=200, now=None):
+        """
+        유예 시간이 지난 오디오 파일 삭제 (백그라운드 작업자가 주기적으로 호출)
+
+        대상 조회는 짧은 트랜잭션으로 처리하고 파일 삭제는 트랜잭션 밖에서 수행한 뒤 대기열에서 제거
+        (파일 삭제 전에 중단되어도 대기열 항목이 남아 다음 실행에서 다시 처리)
+        다른 멘트가 참조 중인 파일은 지우지 않으며, 삭제에 실패한 파일은 나중에 다시 시도
+        오디오 저장소 파일은 참조 수로 관리하므로 여기서 지우지 않고 reclaim_audio_blobs에 맡김
+
+        Args:
+            limit (int): 한 번에 처리할 최대 파일 수
+            now (float, optional): 기준 시각 (기본: 현재 시각)
+
+        Returns:
+            dict: processed(대기열에서 꺼낸 수), removed, skipped(참조 중이거나 저장소 파일이라 건너뜀), failed,
+                batches(정리된 삭제 기록 수)
+        """
+        now = time.time() if now is None else now
+
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.execute(
+                    """
+                SELECT path, batch_id, attempts FROM audio_gc_queue
+                WHERE purge_after <= ?
+                ORDER BY purge_after
+                LIMIT ?
+                """,
+                    (now, limit),
+                )
+                due = cursor.fetchall()
+
+                referenced = set()
+                if due:
+                    placeholders = ", ".join("?" for _ in due)
+                    cursor.execute(
+                        f"""
+                    SELECT audio_path FROM phrases WHERE audio_path IN ({placeholders})
+                    UNION
+                    SELECT path FROM audio_blobs WHERE path IN ({placeholders})
+                    """,
+                        [row["path"] for row in due] * 2,
+                    )
+                    referenced = {row[0] for row in cursor.fetchall()}
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+            removed = 0
+            failed = []
+            for row in due:
+                if row["path"] in referenced:
+                    continue
+                try:
+                    os.remove(row["path"])
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning("오디오 파일 삭제 실패 (%s): %s", row["path"], e)
+                    failed.append(
+                        (row["path"], row["batch_id"], now + AUDIO_GC_RETRY_SECONDS, row["attempts"] + 1, str(e))
+                    )
+
+            with conn:
+                # 처리한 항목을 대기열에서 제거 (그 사이 새 삭제 기록으로 다시 등록된 항목은 유지)
+                failed_paths = {row[0] for row in failed}
+                cursor.executemany(
+                    "DELETE FROM audio_gc_queue WHERE path = ? AND purge_after <= ?",
+                    [(row["path"], now) for row in due if row["path"] not in failed_paths],
+                )
+                cursor.executemany(
+                    """
+                INSERT OR REPLACE INTO audio_gc_queue (path, batch_id, purge_after, attempts, last_error)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                    failed,
+                )
+
+                # 파일 삭제가 모두 끝난 삭제 기록 정리 (그룹 삭제는 빈 폴더도 정리)
+                finished = """
+                FROM deletion_batches b
+                WHERE b.purge_after <= ? AND NOT EXISTS (SELECT 1 FROM audio_gc_queue q WHERE q.batch_id = b.id)
+                """
+                cursor.execute(
+                    f"""
+                SELECT b.group_id {finished} AND b.kind = 'group'
+                AND NOT EXISTS (SELECT 1 FROM phrase_groups g WHERE g.id = b.group_id)
+                """,
+                    (now,),
+                )
+                deleted_groups = [row["group_id"] for row in cursor.fetchall()]
+                cursor.execute(f"DELETE FROM deletion_batches WHERE id IN (SELECT b.id {finished})", (now,))
+                purged_batches = cursor.rowcount
+
+        for group_id in deleted_groups:
+            self._remove_empty_group_dirs(group_id)
+
+        result = {
+            "processed": len(due),
+            "removed": removed,
+            "skipped": len(referenced),
+            "failed": len(failed),
+            "batches": purged_batches,
+        }
+        if due or purged_batches:
+            logger.debug("오디오 삭제 대기열 처리: %s", result)
+        return result
+
+    def _remove_empty_group_dirs(self, group_id):
+        """삭제된 그룹의 빈 언어/그룹 폴더 삭제 (파일이 남아 있으면 그대로 둠)"""
+        group_dir = Path("audio_files") / str(group_id)
+        if not group_dir.is_dir():
+            return
+        for lang_dir in group_dir.iterdir():
+            if lang_dir.is_dir():
+                try:
+                    lang_dir.rmdir()
+                except OSError:
+                    pass
+        try:
+            group_dir.rmdir()
+        except OSError:
+            pass
+
+    @instrumented
+    def store_audio_blob(self, path, digest, size, temp_path):
+        """
+        오디오 저장소에 파일 등록 (같은 내용의 파일이 이미 있으면 임시 파일만 삭제)
+
+        파일은 쓰기 잠금 밖에서 먼저 저장소 경로에 두고(내용 주소이므로 이미 있으면 같은 내용), 짧은 트랜잭션으로
+        blob 행을 등록하거나 회수 대상에서 되살림. 등록 전에 reclaim_audio_blobs가 파일을 치웠으면 임시 파일로 다시 채움
+
+        Args:
+            path (str): 저장소 파일 경로
+            digest (str): 파일 내용의 SHA-256 (16진수)
+            size (int): 파일 크기(바이트)
+            temp_path (str): 내용을 미리 써 둔 임시 파일 경로 (저장소와 같은 파일 시스템)
+
+        Returns:
+            bool: 새 파일로 저장했으면 True, 이미 있는 파일을 재사용했으면 False
+        """
+        now = time.time()
+
+        # 등록 후 다시 확인할 때까지 임시 파일을 남겨 두도록 하드 링크로 배치
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            os.link(temp_path, path)
+            created = True
+        except FileExistsError:
+            created = False
+
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # 참조 전에 회수되지 않도록 released_at을 지금으로 갱신하고 회수 중 표시 해제
+            conn.execute(
+                """
+            INSERT INTO audio_blobs (path, digest, size, created_at, released_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET released_at = excluded.released_at, reclaiming = 0
+            """,
+                (path, digest, size, now, now),
+            )
+            conn.commit()
+
+        # 등록 이후에는 회수 대상이 아니므로, 그 전에 회수 작업자가 치운 파일만 다시 채우면 됨
+        if os.path.exists(path):
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, path)
+        return created
+
+    @instrumented
+    def find_audio_blob(self, digest):
+        """
+        같은 내용의 저장소 파일 경로 조회
+
+        Args:
+            digest (str): 파일 내용의 SHA-256 (16진수)
+
+        Returns:
+            str: 저장소 파일 경로 (없으면 None)
+        """
+        with self._connection() as conn:
+            row = conn.execute("SELECT path FROM audio_blobs WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+        return row["path"] if row else None
+
+    @instrumented
+    def reclaim_audio_blobs(self, limit=200, now=None):
+        """
+        참조하는 멘트가 없고 유예 시간이 지난 저장소 파일 회수 (백그라운드 작업자가 주기적으로 호출)
+
+        짧은 트랜잭션으로 회수 대상을 표시하고, 쓰기 잠금 밖에서 파일을 회수용 이름으로 옮긴 뒤
+        다시 짧은 트랜잭션으로 여전히 표시된 행만 삭제. 그 사이 store_audio_blob이 되살린 파일은 제자리로 돌려 놓음
+        삭제 대기열에 남아 있는 파일(되돌리기 가능)은 회수하지 않음
+
+        Args:
+            limit (int): 한 번에 회수할 최대 파일 수
+            now (float, optional): 기준 시각 (기본: 현재 시각)
+
+        Returns:
+            dict: reclaimed(회수한 파일 수), bytes(회수한 크기), failed
+        """
+        now = time.time() if now is None else now
+
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            candidates = conn.execute(
+                """
+            SELECT path, size FROM audio_blobs b
+            WHERE refcount <= 0 AND released_at <= ?
+            AND NOT EXISTS (SELECT 1 FROM audio_gc_queue q WHERE q.path = b.path)
+            LIMIT ?
+            """,
+                (now - self.gc_grace_seconds, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE audio_blobs SET reclaiming = 1 WHERE path = ?", [(row["path"],) for row in candidates]
+            )
+            conn.commit()
+
+        # 쓰기 잠금 밖에서 파일을 회수용 이름으로 옮김 (이후 저장되는 같은 내용의 파일과 겹치지 않음)
+        moved = []
+        failed = 0
+        for row in candidates:
+            try:
+                os.replace(row["path"], row["path"] + AUDIO_RECLAIM_SUFFIX)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("저장소 파일 회수 실패 (%s): %s", row["path"], e)
+                failed += 1
+                continue
+            moved.append(row)
+
+        reclaimed = []
+        revived = []
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for row in moved:
+                cursor = conn.execute(
+                    "DELETE FROM audio_blobs WHERE path = ? AND reclaiming = 1 AND refcount <= 0", (row["path"],)
+                )
+                (reclaimed if cursor.rowcount else revived).append(row)
+            conn.commit()
+
+        # 되살아난 파일은 새로 저장된 파일이 없을 때만 제자리로 돌려 놓고, 나머지는 삭제
+        for row, revive in [(row, False) for row in reclaimed] + [(row, True) for row in revived]:
+            reclaim_path = row["path"] + AUDIO_RECLAIM_SUFFIX
+            try:
+                if revive and not os.path.exists(row["path"]):
+                    os.replace(reclaim_path, row["path"])
+                else:
+                    os.remove(reclaim_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("저장소 파일 회수 정리 실패 (%s): %s", reclaim_path, e)
+
+        result = {"reclaimed": len(reclaimed), "bytes": sum(row["size"] for row in reclaimed), "failed": failed}
+        if candidates:
+            logger.debug("오디오 저장소 회수: %s", result)
+        return result
+
+    @instrumented
+    def audio_blob_stats(self):
+        """
+        오디오 저장소 사용량
+
+        Returns:
+            dict: blobs(파일 수), bytes(전체 크기), references(멘트 참조 수 합계), unreferenced(회수 대상 파일 수)
+        """
+        with self._connection() as conn:
+            row = conn.execute(
+                """
+            SELECT COUNT(*) AS blobs, COALESCE(SUM(size), 0) AS bytes,
+                   COALESCE(SUM(MAX(refcount, 0)), 0) AS refs, COALESCE(SUM(refcount <= 0), 0) AS unreferenced
+            FROM audio_blobs
+            """
+            ).fetchone()
+        return {
+            "blobs": row["blobs"],
+            "bytes": row["bytes"],
+            "references": row["refs"],
+            "unreferenced": row["unreferenced"],
+        }
+
+    @instrumented
+    def update_phrase(self, phrase_id, content):
+        """
+        멘트 내용 업데이트
+
+        Args:
+            phrase_id (int): 멘트 ID
+            content (str): 새 멘트 내용
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("UPDATE phrases SET content = ? WHERE id = ?", (content, phrase_id))
+            conn.commit()
+        self._bump_generation()
+
+    @instrumented
+    def update_phrase_group(self, group_id, name, description):
+        """
+        멘트 그룹 정보 업데이트
+
+        Args:
+            group_id (int): 그룹 ID
+            name (str): 새 그룹 이름
+            description (str): 새 그룹 설명
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(
+                "UPDATE phrase_groups SET name = ?, description = ? WHERE id = ?", (name, description, group_id)
+            )
+            conn.commit()
+        self._bump_generation()
+
+    @instrumented
+    def update_phrase_audio(self, phrase_id, audio_path):
+        """
+        멘트 오디오 파일 경로 업데이트
+
+        기존 오디오 파일은 바로 지우지 않고 삭제 대기열에 넣음 (유예 시간 동안 되돌리기 가능)
+
+        Args:
+            phrase_id (int): 멘트 ID
+            audio_path (str): 새 오디오 파일 경로 (None이면 오디오 삭제)
+
+        Returns:
+            int: 기존 오디오 파일의 삭제 기록 ID (기존 파일이 없으면 None)
+        """
+        status = self._audio_status_values(audio_path) if audio_path else (0, None, None)
+        batch_id = None
+
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                # 기존 오디오 파일 경로 확인
+                cursor.execute(
+                    """
+                SELECT p.group_id, p.language, p.audio_path, g.name AS group_name
+                FROM phrases p
+                LEFT JOIN phrase_groups g ON g.id = p.group_id
+                WHERE p.id = ?
+                """,
+                    (phrase_id,),
+                )
+                row = cursor.fetchone()
+
+                if row and row["audio_path"] and row["audio_path"] != audio_path:
+                    action = "오디오 교체" if audio_path else "오디오 삭제"
+                    batch_id = self._enqueue_deletion(
+                        cursor,
+                        "audio",
+                        row["group_id"],
+                        f"{row['group_name'] or row['group_id']} / {row['language']} {action}",
+                        {"phrase_id": phrase_id, "audio_path": row["audio_path"]},
+                        [row["audio_path"]],
+                    )
+
+                # 새 파일이 삭제 대기 중인 경로면 대기열에서 뺌
+                if audio_path:
+                    cursor.execute("DELETE FROM audio_gc_queue WHERE path = ?", (audio_path,))
+
+                # 새 오디오 파일 경로 및 오디오 상태 업데이트
+                cursor.execute(
+                    """
+                UPDATE phrases SET audio_path = ?, audio_exists = ?, audio_size = ?, audio_duration = ?
+                WHERE id = ?
+                """,
+                    (audio_path, *status, phrase_id),
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        self._bump_generation()
+        return batch_id
+
+    @instrumented
+    def get_phrase(self, phrase_id):
+        """
+        특정 멘트 정보 가져오기
+
+        Args:
+            phrase_id (int): 멘트 ID
 
         Returns:
             dict: 멘트 정보
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT * FROM phrases WHERE id = ?", (phrase_id,))
+            phrase = cursor.fetchone()
+
+        return phrase
+
+    @instrumented
+    def get_all_phrases(self, audio_only=False):
+        """
+        모든 멘트 가져오기 (그룹 정보 포함)
+
+        Args:
+            audio_only (bool): True인 경우 오디오 파일이 있는 멘트만 반환
+
+        Returns:
+            list: 멘트 목록
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            # 기본 쿼리
+            base_query = """
+            SELECT p.*, g.name as group_name
+            FROM phrases p
+            JOIN phrase_groups g ON p.group_id = g.id
+            """
+
+            # 오디오 파일이 있는 멘트만 필터링하는 조건 추가
+            if audio_only:
+                cursor.execute(
+                    base_query
+                    + """
+                    WHERE p.audio_exists = 1
+                    ORDER BY g.name, p.language
+                    """
+                )
+            else:
+                cursor.execute(
+                    base_query
+                    + """
+                    ORDER BY g.name, p.language
+                    """
+                )
+
+            phrases = cursor.fetchall()
+
+            # 각 phrase 딕셔너리에 audio_path가 None인 경우 빈 문자열로 변환하여 인덱스 에러 방지
+            result = []
+            for phrase in phrases:
+                phrase_dict = dict(phrase)
+                if "audio_path" not in phrase_dict or phrase_dict["audio_path"] is None:
+                    phrase_dict["audio_path"] = ""
+                result.append(phrase_dict)
+
+        return result
+
+    @instrumented
+    def sync_groups_with_folders(self):
+        """
+        audio_files 폴더 구조와 데이터베이스 그룹을 동기화
+
+        audio_files 폴더 내 숫자 폴더명을 그룹 ID로 사용해 그룹 생성
+        """
+        # audio_files 폴더 확인
+        audio_dir = Path("audio_files")
+        if not audio_dir.exists():
+            audio_dir.mkdir(exist_ok=True)
+            return
+
+        # 데이터베이스 연결
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            # 기존 그룹 확인
+            cursor.execute("SELECT id, name FROM phrase_groups")
+            existing_groups = {row["id"]: row["name"] for row in cursor.fetchall()}
+            logger.debug("기존 그룹: %d개", len(existing_groups))
+
+            # 삭제 대기 중인 그룹의 폴더는 그룹을 다시 만들지 않음
+            _, deleted_groups = self._pending_gc_exclusions(cursor)
+
+            # 폴더 기반 그룹 업데이트
+            created_count = 0
+            for folder in audio_dir.iterdir():
+                if folder.is_dir() and folder.name.isdigit():
+                    group_id = int(folder.name)
+                    logger.debug("그룹 폴더 발견: %s", folder.name)
+
+                    # 이미 존재하는 그룹인지 확인
+                    if group_id in existing_groups or group_id in deleted_groups:
+                        # 이미 존재하면 무시
+                        pass
+                    else:
+                        # 새 그룹 생성
+                        group_name = f"그룹-{group_id}"
+                        description = f"폴더 ID {group_id}에서 자동 생성된 그룹"
+
+                        # ID를 명시하여 그룹 생성
+                        cursor.execute(
+                            "INSERT INTO phrase_groups (id, name, description) VALUES (?, ?, ?)",
+                            (group_id, group_name, description),
+                        )
+                        logger.debug("새 그룹 생성: id=%s name=%s", group_id, group_name)
+                        created_count += 1
+
+            conn.commit()
+        if created_count:
+            self._bump_generation()
+
+    @instrumented
+    def scan_audio_files_and_update_db(self, full=False, dirs=None):
+        """
+        오디오 파일을 스캔하고 데이터베이스에 멘트를 추가/업데이트
+
+        audio_files/{group_id}/{language}/ 구조의 폴더를 스캔하여
+        발견된 오디오 파일에 해당하는 멘트가 없으면 추가하고,
+        있으면 오디오 경로를 최신 파일로 업데이트
+
+        audio_manifest 테이블에 파일별 크기/수정시간/inode를 기록해 두고,
+        언어 폴더의 mtime이 바뀐 폴더만 다시 읽어 새 파일/변경된 파일/삭제된 파일만 반영
+        (제자리에서 덮어써 폴더 mtime이 그대로인 파일은 파일 감시자가 알려준 폴더나 전체 스캔에서만 찾음)
+        모든 변경은 하나의 트랜잭션으로 처리
+
+        Args:
+            full (bool): True인 경우 폴더 mtime과 무관하게 모든 언어 폴더를 다시 읽음
+            dirs (iterable, optional): 변경된 것으로 알려진 폴더 (파일 감시자가 전달, 하위 언어 폴더를 모두 다시 읽음)
+
+        Returns:
+            dict: 스캔 결과 통계 (단계별 소요 시간 포함)
+        """
+        audio_base_dir = Path("audio_files")
+        if not audio_base_dir.exists():
+            logger.debug("audio_files 폴더 없음")
+            return
+
+        started = time.perf_counter()
+
+        # 데이터베이스 연결
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            # 1단계: 폴더 탐색 (mtime이 바뀐 언어 폴더만 파일 목록 조회)
+            cursor.execute("SELECT path, mtime_ns FROM audio_manifest_dirs")
+            known_dirs = {row["path"]: row["mtime_ns"] for row in cursor.fetchall()}
+
+            # 변경된 것으로 알려진 폴더 (언어 폴더 또는 그 상위 폴더)
+            forced_dirs = {os.path.normpath(d) for d in dirs or ()}
+
+            # 삭제 대기 중인 오디오 파일과 그룹 폴더는 없는 것으로 처리
+            pending_paths, deleted_groups = self._pending_gc_exclusions(cursor)
+
+            group_folders = []
+            seen_dirs = {}
+            dirty_dirs = {}
+            scanned_dirs = []
+            scanned_count = 0
+
+            for group_entry in os.scandir(audio_base_dir):
+                if not (group_entry.is_dir() and group_entry.name.isdigit()):
+                    continue
+
+                group_id = int(group_entry.name)
+                if group_id in deleted_groups:
+                    continue
+                group_folders.append(group_id)
+
+                for lang_entry in os.scandir(group_entry.path):
+                    if not (lang_entry.is_dir() and lang_entry.name in SUPPORTED_LANGUAGES):
+                        continue
+
+                    dir_path = os.path.join("audio_files", group_entry.name, lang_entry.name)
+                    # 목록 조회 전에 mtime을 기록해야 조회 도중 추가된 파일을 다음 스캔에서 놓치지 않음
+                    dir_mtime = lang_entry.stat().st_mtime_ns
+                    seen_dirs[dir_path] = dir_mtime
+
+                    if (
+                        not full
+                        and not (forced_dirs and self._is_forced_dir(dir_path, forced_dirs))
+                        and known_dirs.get(dir_path) == dir_mtime
+                    ):
+                        continue
+
+                    files = {}
+                    for file_entry in os.scandir(lang_entry.path):
+                        if not (file_entry.is_file() and file_entry.name.lower().endswith(AUDIO_EXTENSIONS)):
+                            continue
+                        file_path = os.path.join(dir_path, file_entry.name)
+                        if pending_paths and os.path.normpath(file_path) in pending_paths:
+                            continue
+                        stat = file_entry.stat()
+                        files[file_path] = (
+                            stat.st_size,
+                            stat.st_mtime_ns,
+                            file_entry.inode(),
+                        )
+                        scanned_count += 1
+
+                    dirty_dirs[(group_id, lang_entry.name)] = files
+                    scanned_dirs.append((dir_path, dir_mtime))
+
+            # 사라진 언어 폴더는 폴더 내 파일이 모두 삭제된 것으로 처리
+            removed_dirs = [path for path in known_dirs if path not in seen_dirs]
+            for dir_path in removed_dirs:
+                parts = Path(dir_path).parts
+                if len(parts) == 3 and parts[1].isdigit():
+                    dirty_dirs.setdefault((int(parts[1]), parts[2]), {})
+
+            walk_done = time.perf_counter()
+
+            # 2단계: 매니페스트와 비교하여 새 파일/변경 파일/삭제 파일 계산
+            new_files = []
+            changed_files = []
+            removed_files = []
+
+            for (group_id, language), files in dirty_dirs.items():
+                cursor.execute(
+                    "SELECT path, size, mtime_ns, inode FROM audio_manifest WHERE group_id = ? AND language = ?",
+                    (group_id, language),
+                )
+                known_files = {row["path"]: (row["size"], row["mtime_ns"], row["inode"]) for row in cursor.fetchall()}
+
+                for path, file_stat in files.items():
+                    if path not in known_files:
+                        new_files.append((path, group_id, language) + file_stat)
+                    elif known_files[path] != file_stat:
+                        changed_files.append((path, group_id, language) + file_stat)
+
+                for path in known_files:
+                    if path not in files:
+                        removed_files.append((path, group_id, language))
+
+            diff_done = time.perf_counter()
+
+            # 3단계: 변경 사항 반영 (단일 트랜잭션)
+            added_count = 0
+            updated_count = 0
+
+            # 그룹 폴더에 해당하는 그룹이 데이터베이스에 없으면 추가
+            cursor.execute("SELECT id, name FROM phrase_groups")
+            groups = {row["id"]: row["name"] for row in cursor.fetchall()}
+
+            for group_id in group_folders:
+                if group_id not in groups:
+                    group_name = f"그룹-{group_id}"
+                    description = f"폴더 {group_id}에서 자동 생성"
+                    cursor.execute(
+                        "INSERT INTO phrase_groups (id, name, description) VALUES (?, ?, ?)",
+                        (group_id, group_name, description),
+                    )
+                    groups[group_id] = group_name
+                    logger.debug("새 그룹 생성: id=%s name=%s", group_id, group_name)
+
+            # 매니페스트 갱신
+            cursor.executemany(
+                """
+            INSERT OR REPLACE INTO audio_manifest (path, group_id, language, size, mtime_ns, inode)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                new_files + changed_files,
+            )
+            cursor.executemany("DELETE FROM audio_manifest WHERE path = ?", [(f[0],) for f in removed_files])
+
+            # 파일이 바뀐 그룹-언어 조합만 멘트 갱신
+            touched = {(f[1], f[2]) for f in new_files + changed_files}
+            removed_paths = {f[0] for f in removed_files}
+
+            for group_id, language in dirty_dirs:
+                if group_id not in groups:
+                    continue
+
+                # 가장 최신 파일
+                cursor.execute(
+                    """
+                SELECT path FROM audio_manifest
+                WHERE group_id = ? AND language = ?
+                ORDER BY mtime_ns DESC LIMIT 1
+                """,
+                    (group_id, language),
+                )
+                newest = cursor.fetchone()
+                newest_path = newest["path"] if newest else None
+
+                cursor.execute(
+                    "SELECT id, audio_path FROM phrases WHERE group_id = ? AND language = ?", (group_id, language)
+                )
+                phrase = cursor.fetchone()
+
+                if phrase is None:
+                    # 그룹-언어 멘트가 없으면 새로 생성 (오디오 파일이 없으면 빈 멘트)
+                    if os.path.join("audio_files", str(group_id), language) not in seen_dirs:
+                        continue
+                    content = f"{groups[group_id]} 그룹의 {language} 멘트"
+                    cursor.execute(
+                        """
+                    INSERT INTO phrases (group_id, language, content, audio_path) VALUES (?, ?, ?, ?)
+                    ON CONFLICT(group_id, language) DO NOTHING
+                    """,
+                        (group_id, language, content, newest_path),
+                    )
+                    logger.debug("새 멘트 생성: group_id=%s language=%s audio_path=%s", group_id, language, newest_path)
+                    added_count += 1
+                elif phrase["audio_path"] != newest_path and (
+                    (group_id, language) in touched or phrase["audio_path"] in removed_paths
+                ):
+                    # 새 파일이 생겼거나 현재 파일이 삭제된 경우 최신 파일로 교체
+                    cursor.execute("UPDATE phrases SET audio_path = ? WHERE id = ?", (newest_path, phrase["id"]))
+                    logger.debug("오디오 경로 업데이트: id=%s %s → %s", phrase["id"], phrase["audio_path"], newest_path)
+                    updated_count += 1
+
+            # 오디오 상태 갱신 (전체 스캔이면 모든 멘트, 아니면 파일이 바뀐 그룹-언어의 멘트만)
+            if full:
+                status_count = self._refresh_audio_status(cursor)
+            else:
+                status_count = 0
+                for group_id, language in dirty_dirs:
+                    status_count += self._refresh_audio_status(
+                        cursor, "WHERE group_id = ? AND language = ?", (group_id, language)
+                    )
+
+            # 폴더 mtime 기록
+            cursor.executemany(
+                "INSERT OR REPLACE INTO audio_manifest_dirs (path, mtime_ns) VALUES (?, ?)", scanned_dirs
+            )
+            cursor.executemany("DELETE FROM audio_manifest_dirs WHERE path = ?", [(path,) for path in removed_dirs])
+
+            conn.commit()
+
+        finished = time.perf_counter()
+        if added_count or updated_count or status_count:
+            self._bump_generation()
+
+        result = {
+            "scanned": scanned_count,
+            "added": added_count,
+            "updated": updated_count,
+            "audio_status_updated": status_count,
+            "new_files": len(new_files),
+            "changed_files": len(changed_files),
+            "removed_files": len(removed_files),
+            "dirs_scanned": len(scanned_dirs),
+            "dirs_skipped": len(seen_dirs) - len(scanned_dirs),
+            "timings": {
+                "walk_ms": (walk_done - started) * 1000,
+                "diff_ms": (diff_done - walk_done) * 1000,
+                "apply_ms": (finished - diff_done) * 1000,
+                "total_ms": (finished - started) * 1000,
+            },
+        }
+        logger.debug("오디오 스캔 결과: %s", result)
+        return result
 
-        cursor.execute("SELECT * FROM phrases WHERE id = ?", (phrase_id,))
-        phrase = cursor.fetchone()
+    def _is_forced_dir(self, dir_path, forced_dirs):
+        """언어 폴더가 변경된 폴더 목록의 폴더이거나 그 하위 폴더인지 확인"""
+        path = Path(dir_path)
+        return any(os.path.normpath(parent) in forced_dirs for parent in [path, *path.parents])
+
+    def create_default_phrases_for_group(self, group_id, group_name=None):
+        """
+        그룹에 대한 기본 멘트를 모든 지원 언어로 생성
+
+        Args:
+            group_id (int): 멘트 그룹 ID
+            group_name (str, optional): 사용하지 않음 (하위 호환용, 그룹 이름은 DB에서 가져옴)
+
+        Returns:
+            dict: 생성된 멘트 수
+        """
+        result = self.ensure_language_coverage(group_ids=[group_id])
+        return {"created": result["created"]}
+
+    @instrumented
+    def ensure_language_coverage(self, group_ids=None, languages=None):
+        """
+        모든 그룹에 지원 언어별 멘트가 하나 이상 있도록 누락된 멘트를 일괄 생성
+
+        누락된 (그룹, 언어) 쌍을 한 번의 anti-join 쿼리로 찾고, executemany로 한 트랜잭션에 추가
+
+        Args:
+            group_ids (list, optional): 대상 그룹 ID 목록. 없으면 전체 그룹
+            languages (list, optional): 대상 언어 목록. 없으면 SUPPORTED_LANGUAGES
+
+        Returns:
+            dict: created(생성된 멘트 수), groups(그룹 이름별 생성 수)
+        """
+        languages = list(languages or SUPPORTED_LANGUAGES)
+        if not languages or group_ids == []:
+            return {"created": 0, "groups": {}}
+
+        query = f"""
+        WITH languages(language) AS (VALUES {", ".join("(?)" for _ in languages)})
+        SELECT g.id AS group_id, g.name AS group_name, l.language
+        FROM phrase_groups g
+        CROSS JOIN languages l
+        WHERE NOT EXISTS (
+            SELECT 1 FROM phrases p WHERE p.group_id = g.id AND p.language = l.language
+        )
+        """
+        params = list(languages)
+        if group_ids is not None:
+            query += f" AND g.id IN ({', '.join('?' for _ in group_ids)})"
+            params.extend(group_ids)
+        query += " ORDER BY g.id"
+
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            missing = cursor.execute(query, params).fetchall()
+            if not missing:
+                return {"created": 0, "groups": {}}
+
+            rows = [
+                (row["group_id"], row["language"], default_phrase_content(row["group_name"], row["language"]), None)
+                for row in missing
+            ]
+            with conn:
+                # 동시에 같은 쌍을 추가한 경우 고유 인덱스 충돌은 무시
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO phrases (group_id, language, content, audio_path) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                created = cursor.rowcount
+
+        # 음성 파일 디렉토리 생성
+        groups = {}
+        for row in missing:
+            Path(f"audio_files/{row['group_id']}/{row['language']}").mkdir(parents=True, exist_ok=True)
+            groups[row["group_name"]] = groups.get(row["group_name"], 0) + 1
+
+        logger.debug("누락된 언어 멘트 생성: %d개 (%d개 그룹)", created, len(groups))
+        self._bump_generation()
+
+        return {"created": created, "groups": groups}
+
+    @instrumented
+    def ensure_phrase_exists(self, group_id, language, content=None):
+        """
+        특정 그룹과 언어에 대한 멘트가 존재하는지 확인하고 없으면 생성
+
+        동시에 호출되어도 INSERT ... ON CONFLICT DO NOTHING으로 하나만 생성되며 기존 내용은 바꾸지 않음
+
+        Args:
+            group_id (int): 멘트 그룹 ID
+            language (str): 언어 코드 (ko, en, ja, zh)
+            content (str, optional): 멘트 내용, 없으면 기본 내용 사용
+
+        Returns:
+            int: 생성된 멘트 ID 또는 기존 멘트 ID
+        """
+        select_sql = "SELECT id FROM phrases WHERE group_id = ? AND language = ?"
+
+        with self._connection() as conn:
+            # 대부분의 호출은 이미 존재하는 멘트이므로 먼저 조회
+            row = conn.execute(select_sql, (group_id, language)).fetchone()
+            if row:
+                logger.debug("기존 멘트 사용: group_id=%s language=%s id=%s", group_id, language, row["id"])
+                return row["id"]
+
+            # 기본 내용 설정
+            if not content:
+                group_row = conn.execute("SELECT name FROM phrase_groups WHERE id = ?", (group_id,)).fetchone()
+                group_name = group_row["name"] if group_row else f"그룹-{group_id}"
+                language_labels = {"ko": "한국어", "en": "영어", "ja": "일본어", "zh": "중국어"}
+
+                # 기본 템플릿
+                default_templates = {
+                    "ko": f"{group_name} 그룹의 한국어 멘트",
+                    "en": f"English phrase for {group_name} group",
+                    "ja": f"{group_name}グループの日本語メッセージ",
+                    "zh": f"{group_name}组的中文信息",
+                }
+
+                content = default_templates.get(
+                    language, f"{group_name} 그룹의 {language_labels.get(language, language)} 멘트"
+                )
+
+            # 오디오 디렉토리 확인
+            Path(f"audio_files/{group_id}/{language}").mkdir(parents=True, exist_ok=True)
+
+            # 새 멘트 추가 (ID는 자동 생성, 다른 세션이 먼저 추가했으면 무시)
+            insert_sql = """
+            INSERT INTO phrases (group_id, language, content) VALUES (?, ?, ?)
+            ON CONFLICT(group_id, language) DO NOTHING
+            """
+            if SQLITE_HAS_RETURNING:
+                created = conn.execute(insert_sql + " RETURNING id", (group_id, language, content)).fetchone()
+            else:
+                cursor = conn.execute(insert_sql, (group_id, language, content))
+                created = (cursor.lastrowid,) if cursor.rowcount else None
+
+            phrase_id = created[0] if created else conn.execute(select_sql, (group_id, language)).fetchone()["id"]
+            conn.commit()
 
-        conn.close()
+        if created:
+            self._bump_generation()
+            logger.debug("새 멘트 생성: group_id=%s language=%s id=%s", group_id, language, phrase_id)
 
-        return phrase
+        return phrase_id
 
-    def get_all_phrases(self, audio_only=False):
+    @instrumented
+    def reinitialize_database_and_scan(self):
         """
-        모든 멘트 가져오기 (그룹 정보 포함)
+        데이터베이스를 초기화하고 오디오 파일을 다시 스캔하여 멘트를 재구성
 
-        Args:
-            audio_only (bool): True인 경우 오디오 파일이 있는 멘트만 반환
+        이 함수는 데이터베이스와 파일 시스템 간 불일치가 심한 경우 사용합니다.
+        주의: 기존 멘트 내용은 삭제되고, 오디오 파일만 유지됩니다.
 
-        Returns:
-            list: 멘트 목록
-        """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        재구성은 별도의 섀도 데이터베이스 파일에서 수행하고, 완료되면 한 트랜잭션으로 현재 데이터베이스에
+        옮겨 담음. 다른 세션은 교체 커밋 전까지 기존 카탈로그를 그대로 조회하며 빈 카탈로그를 보지 않음
 
-        # 기본 쿼리
-        base_query = """
-        SELECT p.*, g.name as group_name
-        FROM phrases p
-        JOIN phrase_groups g ON p.group_id = g.id
+        Returns:
+            dict: 처리 결과 통계 (build_ms: 섀도 구성 시간, swap_ms: 교체 시간)
         """
+        with self._rebuild_lock:
+            logger.info("데이터베이스 초기화 및 재구성 시작")
+            started = time.perf_counter()
 
-        # 오디오 파일이 있는 멘트만 필터링하는 조건 추가
-        if audio_only:
-            cursor.execute(
-                base_query
-                + """
-                WHERE p.audio_path IS NOT NULL AND p.audio_path != ''
-                ORDER BY g.name, p.language
-                """
-            )
-        else:
-            cursor.execute(
-                base_query
-                + """
-                ORDER BY g.name, p.language
-                """
-            )
+            shadow_name = f"{Path(self.db_name).stem}.rebuild{Path(self.db_name).suffix}"
+            shadow_path = self.data_dir / shadow_name
+            self._remove_database_files(shadow_path)
 
-        phrases = cursor.fetchall()
+            try:
+                # 섀도에서는 카탈로그 테이블만 가져오므로 기록 폴더 색인 생략
+                shadow = DatabaseManager(db_name=shadow_name, pool_size=0, catalog_cache=False, history_backfill=False)
+                self._copy_deletion_state(shadow)
+                created_groups, result = shadow._build_catalog_from_folders()
+                shadow._restore_audio_blob_links(self._audio_blob_links())
+                shadow.close()
+
+                build_done = time.perf_counter()
+                logger.info("섀도 데이터베이스 구성 완료, 교체 중")
+                self._swap_in_catalog(shadow_path)
+                finished = time.perf_counter()
+            finally:
+                self._remove_database_files(shadow_path)
+
+        self._bump_generation()
 
-        # 각 phrase 딕셔너리에 audio_path가 None인 경우 빈 문자열로 변환하여 인덱스 에러 방지
-        result = []
-        for phrase in phrases:
-            phrase_dict = dict(phrase)
-            if "audio_path" not in phrase_dict or phrase_dict["audio_path"] is None:
-                phrase_dict["audio_path"] = ""
-            result.append(phrase_dict)
+        # 최종 결과 확인
+        logger.info(
+            "데이터베이스 초기화 및 재구성 완료: groups=%d scanned=%d added=%d updated=%d build_ms=%.1f swap_ms=%.1f",
+            created_groups,
+            result.get("scanned", 0),
+            result.get("added", 0),
+            result.get("updated", 0),
+            (build_done - started) * 1000,
+            (finished - build_done) * 1000,
+        )
 
-        conn.close()
+        return {
+            "groups": created_groups,
+            "audio_files": result.get("scanned", 0),
+            "added_phrases": result.get("added", 0),
+            "updated_phrases": result.get("updated", 0),
+            "build_ms": (build_done - started) * 1000,
+            "swap_ms": (finished - build_done) * 1000,
+        }
 
-        return result
+    def _copy_deletion_state(self, shadow):
+        """삭제 기록과 오디오 삭제 대기열을 섀도 데이터베이스에 복사 (재구성 스캔에서 삭제 대기 항목 제외용)"""
+        with self._connection() as conn:
+            batches = conn.execute(
+                "SELECT id, kind, group_id, label, payload, deleted_at, purge_after FROM deletion_batches"
+            ).fetchall()
+            queue = conn.execute(
+                "SELECT path, batch_id, purge_after, attempts, last_error FROM audio_gc_queue"
+            ).fetchall()
+
+        with shadow._connection() as shadow_conn:
+            with shadow_conn:
+                shadow_conn.executemany(
+                    """
+                INSERT INTO deletion_batches (id, kind, group_id, label, payload, deleted_at, purge_after)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                    [tuple(row) for row in batches],
+                )
+                shadow_conn.executemany(
+                    """
+                INSERT INTO audio_gc_queue (path, batch_id, purge_after, attempts, last_error)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                    [tuple(row) for row in queue],
+                )
 
-    def sync_groups_with_folders(self):
+    def _audio_blob_links(self):
         """
-        audio_files 폴더 구조와 데이터베이스 그룹을 동기화
+        오디오 저장소 파일을 사용하는 멘트의 그룹/언어별 오디오 경로 (저장소 파일은 audio_files 폴더 스캔에 나오지 않음)
 
-        audio_files 폴더 내 숫자 폴더명을 그룹 ID로 사용해 그룹 생성
+        Returns:
+            list: (오디오 경로, 그룹 ID, 언어) 목록
         """
-        # audio_files 폴더 확인
-        audio_dir = Path("audio_files")
-        if not audio_dir.exists():
-            audio_dir.mkdir(exist_ok=True)
-            return
-
-        # 데이터베이스 연결
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # 기존 그룹 확인
-        cursor.execute("SELECT id, name FROM phrase_groups")
-        existing_groups = {row["id"]: row["name"] for row in cursor.fetchall()}
-        print(f"[DEBUG] 기존 그룹: {existing_groups}")
-
-        # 폴더 기반 그룹 업데이트
-        for folder in audio_dir.iterdir():
-            if folder.is_dir() and folder.name.isdigit():
-                group_id = int(folder.name)
-                print(f"[DEBUG] 그룹 폴더 발견: {folder.name}")
-
-                # 이미 존재하는 그룹인지 확인
-                if group_id in existing_groups:
-                    # 이미 존재하면 무시
-                    pass
-                else:
-                    # 새 그룹 생성
-                    group_name = f"그룹-{group_id}"
-                    description = f"폴더 ID {group_id}에서 자동 생성된 그룹"
+        with self._connection() as conn:
+            rows = conn.execute(
+                """
+            SELECT p.audio_path, p.group_id, p.language
+            FROM phrases p
+            JOIN audio_blobs b ON b.path = p.audio_path
+            """
+            ).fetchall()
+        return [tuple(row) for row in rows]
 
-                    # ID를 명시하여 그룹 생성
-                    cursor.execute(
-                        "INSERT INTO phrase_groups (id, name, description) VALUES (?, ?, ?)",
-                        (group_id, group_name, description),
-                    )
-                    print(f"[DEBUG] 새 그룹 생성: ID {group_id}, 이름 {group_name}")
+    def _restore_audio_blob_links(self, links):
+        """재구성한 섀도 카탈로그에서 저장소 파일을 사용하던 멘트의 오디오 경로 복원"""
+        if not links:
+            return
 
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            with conn:
+                cursor = conn.cursor()
+                # 언어 폴더가 없어 멘트가 만들어지지 않은 경우에도 그룹이 있으면 멘트 생성
+                cursor.executemany(
+                    """
+                INSERT INTO phrases (group_id, language, content, audio_path)
+                SELECT g.id, ?, g.name || '의 ' || ? || ' 멘트', ? FROM phrase_groups g WHERE g.id = ?
+                ON CONFLICT(group_id, language) DO UPDATE SET audio_path = excluded.audio_path
+                """,
+                    [(language, language, audio_path, group_id) for audio_path, group_id, language in links],
+                )
+                for _, group_id, language in links:
+                    self._refresh_audio_status(cursor, "WHERE group_id = ? AND language = ?", (group_id, language))
 
-    def scan_audio_files_and_update_db(self):
+    def _build_catalog_from_folders(self):
         """
-        오디오 파일을 스캔하고 데이터베이스에 멘트를 추가/업데이트
-
-        audio_files/{group_id}/{language}/ 구조의 폴더를 스캔하여
-        발견된 오디오 파일에 해당하는 멘트가 없으면 추가하고,
-        있으면 오디오 경로를 업데이트
+        audio_files 폴더 구조로 그룹/기본 멘트를 만들고 전체 오디오 스캔 (빈 섀도 데이터베이스에서 호출)
 
         Returns:
-            dict: 스캔 결과 통계
+            tuple: (생성한 그룹 수, 오디오 스캔 결과)
         """
-        audio_base_dir = Path("audio_files")
-        if not audio_base_dir.exists():
-            print("[DEBUG] audio_files 폴더 없음")
-            return
-
-        # 데이터베이스 연결
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # 우선 모든 그룹과 멘트 정보 가져오기
-        cursor.execute("SELECT id, name FROM phrase_groups")
-        groups = {row["id"]: row["name"] for row in cursor.fetchall()}
-        print(f"[DEBUG] 기존 그룹: {groups}")
-
-        # 그룹-언어 조합별 멘트 정보 가져오기
-        group_lang_phrases = {}
-        cursor.execute("SELECT id, group_id, language, content, audio_path FROM phrases")
-        for row in cursor.fetchall():
-            key = f"{row['group_id']}-{row['language']}"
-            group_lang_phrases[key] = {"id": row["id"], "content": row["content"], "audio_path": row["audio_path"]}
-        print(f"[DEBUG] 기존 그룹-언어 조합: {len(group_lang_phrases)}개")
-
-        # 지원하는 언어 코드
-        supported_languages = ["ko", "en", "ja", "zh"]
+        audio_dir = Path("audio_files")
+        audio_dir.mkdir(exist_ok=True)
 
-        # 스캔한 오디오 파일 수
-        scanned_count = 0
-        added_count = 0
-        updated_count = 0
+        with self._connection() as conn:
+            _, deleted_groups = self._pending_gc_exclusions(conn.cursor())
 
-        # 그룹 폴더 스캔
-        for group_folder in audio_base_dir.iterdir():
+        # 폴더 구조 스캔하여 그룹 및 실제 존재하는 언어 폴더의 기본 멘트 생성 (삭제 대기 중인 그룹 제외)
+        groups = []
+        phrases = []
+        for group_folder in audio_dir.iterdir():
             if not (group_folder.is_dir() and group_folder.name.isdigit()):
                 continue
+            if int(group_folder.name) in deleted_groups:
+                continue
 
             group_id = int(group_folder.name)
-            print(f"[DEBUG] 그룹 폴더 발견: {group_folder.name}")
-
-            # 그룹이 데이터베이스에 없으면 추가
-            if group_id not in groups:
-                group_name = f"그룹-{group_id}"
-                description = f"폴더 {group_id}에서 자동 생성"
-                cursor.execute(
-                    "INSERT INTO phrase_groups (id, name, description) VALUES (?, ?, ?)",
-                    (group_id, group_name, description),
-                )
-                groups[group_id] = group_name
-                print(f"[DEBUG] 새 그룹 생성: ID {group_id}, 이름 {group_name}")
+            group_name = f"그룹-{group_id}"
+            groups.append((group_id, group_name, f"폴더 {group_id}에서 자동 생성"))
 
-            # 언어 폴더 스캔
             for lang_folder in group_folder.iterdir():
-                if not (lang_folder.is_dir() and lang_folder.name in supported_languages):
-                    continue
-
-                language = lang_folder.name
-                print(f"[DEBUG] 언어 폴더 발견: {language}")
-
-                # 그룹-언어 키 생성
-                group_lang_key = f"{group_id}-{language}"
+                if lang_folder.is_dir() and lang_folder.name in SUPPORTED_LANGUAGES:
+                    phrases.append((group_id, lang_folder.name, f"{group_name}의 {lang_folder.name} 멘트"))
 
-                # 오디오 파일 스캔
-                audio_files = list(lang_folder.glob("*.wav"))
-                audio_files.extend(lang_folder.glob("*.mp3"))
+        with self._connection() as conn:
+            conn.executemany("INSERT INTO phrase_groups (id, name, description) VALUES (?, ?, ?)", groups)
+            conn.executemany("INSERT INTO phrases (group_id, language, content) VALUES (?, ?, ?)", phrases)
+            conn.commit()
+        logger.debug("섀도 카탈로그 생성: groups=%d phrases=%d", len(groups), len(phrases))
 
-                if audio_files:
-                    # 파일이 여러 개 있는 경우 가장 최신 파일 사용
-                    audio_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-                    audio_file = audio_files[0]
-                    audio_path = str(audio_file)
-                    scanned_count += 1
+        # 오디오 파일 스캔 및 매핑
+        result = self.scan_audio_files_and_update_db(full=True) or {}
+        return len(groups), result
 
-                    print(f"[DEBUG] 오디오 파일 발견: {audio_path} (총 {len(audio_files)}개 중 최신 파일)")
+    def _swap_in_catalog(self, shadow_path):
+        """
+        섀도 데이터베이스의 카탈로그 테이블을 한 트랜잭션으로 현재 데이터베이스에 복사
 
-                    # 그룹-언어 조합에 이미 멘트가 있는지 확인
-                    if group_lang_key in group_lang_phrases:
-                        # 이미 존재하면 오디오 경로만 업데이트
-                        phrase_id = group_lang_phrases[group_lang_key]["id"]
-                        old_audio = group_lang_phrases[group_lang_key]["audio_path"]
-                        print(f"[DEBUG] 기존 멘트 발견 (ID {phrase_id}): 오디오 {old_audio} → {audio_path}")
+        같은 파일을 여러 연결(연결 풀, 다른 프로세스)이 열고 있으므로 파일 이름 변경 대신 ATTACH 후 복사함
+        WAL 모드에서는 커밋 전까지 다른 연결이 기존 데이터를 읽으며, 검색 인덱스는 트리거로 함께 갱신됨
 
-                        cursor.execute("UPDATE phrases SET audio_path = ? WHERE id = ?", (audio_path, phrase_id))
-                        updated_count += 1
-                    else:
-                        # 새 멘트 생성
-                        content = f"{groups[group_id]} 그룹의 {language} 멘트"
-                        cursor.execute(
-                            "INSERT INTO phrases (group_id, language, content, audio_path) VALUES (?, ?, ?, ?)",
-                            (group_id, language, content, audio_path),
-                        )
-                        phrase_id = cursor.lastrowid
-                        print(
-                            f"[DEBUG] 새 멘트 생성: 그룹 {group_id}, 언어 {language}, ID {phrase_id}, 오디오 {audio_path}"
+        Args:
+            shadow_path (Path): 섀도 데이터베이스 파일 경로
+        """
+        with self._connection() as conn:
+            conn.execute("ATTACH DATABASE ? AS shadow", (str(shadow_path),))
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for table in ("phrases", "phrase_groups", "audio_manifest", "audio_manifest_dirs"):
+                        conn.execute(f"DELETE FROM main.{table}")
+
+                    # 그룹을 먼저 넣어야 멘트 검색 인덱스 트리거가 그룹 이름을 찾을 수 있음
+                    for table, columns in CATALOG_TABLE_COLUMNS:
+                        column_list = ", ".join(columns)
+                        conn.execute(
+                            f"INSERT INTO main.{table} ({column_list}) SELECT {column_list} FROM shadow.{table}"
                         )
-                        added_count += 1
-                elif group_lang_key not in group_lang_phrases:
-                    # 오디오 파일은 없지만 해당 그룹-언어 멘트도 없으면 빈 멘트 생성
-                    content = f"{groups[group_id]} 그룹의 {language} 멘트"
-                    cursor.execute(
-                        "INSERT INTO phrases (group_id, language, content, audio_path) VALUES (?, ?, ?, ?)",
-                        (group_id, language, content, None),
-                    )
-                    phrase_id = cursor.lastrowid
-                    print(f"[DEBUG] 빈 멘트 생성: 그룹 {group_id}, 언어 {language}, ID {phrase_id}")
-                    added_count += 1
-
-        # 커밋 전 확인
-        print(f"[DEBUG] 커밋 전 - 스캔: {scanned_count}, 추가: {added_count}, 업데이트: {updated_count}")
-        conn.commit()
-        conn.close()
-
-        print(f"[DEBUG] 최종 결과 - 스캔: {scanned_count}, 추가: {added_count}, 업데이트: {updated_count}")
-        return {"scanned": scanned_count, "added": added_count, "updated": updated_count}
-
-    def create_default_phrases_for_group(self, group_id, group_name=None):
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+            finally:
+                conn.execute("DETACH DATABASE shadow")
+
+    def _remove_database_files(self, path):
+        """SQLite 데이터베이스 파일과 WAL/공유 메모리 파일 삭제"""
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            try:
+                os.remove(f"{path}{suffix}")
+            except FileNotFoundError:
+                pass
+
+    @instrumented
+    def add_recording(
+        self, username, date, customer_id, time_str, audio_path, phrase=None, metadata_path=None, stt_text=None
+    ):
         """
-        그룹에 대한 기본 멘트를 모든 지원 언어로 생성
+        녹음 기록 저장 (녹음 파일을 저장한 직후 호출, 같은 파일이면 갱신)
 
         Args:
-            group_id (int): 멘트 그룹 ID
-            group_name (str, optional): 그룹 이름. 없으면 DB에서 가져옴
+            username (str): 사용자 이름
+            date (str): 날짜 (YYYY-MM-DD)
+            customer_id (str): 고객 ID
+            time_str (str): 녹음 시각 (HHMMSS)
+            audio_path (str): 녹음 파일 경로
+            phrase (dict, optional): 멘트 정보 (phrase_id, group_id, group_name, language, content)
+            metadata_path (str, optional): 멘트 정보 JSON 파일 경로
+            stt_text (str, optional): STT 결과
 
         Returns:
-            dict: 생성된 멘트 수
+            int: 녹음 기록 ID
         """
-        # 지원하는 언어 목록
-        supported_languages = ["ko", "en", "ja", "zh"]
-
-        # 데이터베이스 연결
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        phrase = phrase or {}
+        params = (
+            username,
+            date,
+            customer_id,
+            time_str,
+            audio_path,
+            metadata_path,
+            phrase.get("phrase_id"),
+            phrase.get("group_id"),
+            phrase.get("group_name"),
+            phrase.get("language"),
+            phrase.get("content"),
+            stt_text,
+            None,
+        )
 
-        # 그룹 이름 확인
-        if not group_name:
-            cursor.execute("SELECT name FROM phrase_groups WHERE id = ?", (group_id,))
-            row = cursor.fetchone()
-            if row:
-                group_name = row["name"]
-            else:
-                group_name = f"그룹-{group_id}"
-
-        # 기본 멘트 템플릿 (언어별로 다른 내용)
-        default_templates = {
-            "ko": f"{group_name} 관련 기본 멘트입니다 (한국어)",
-            "en": f"Default phrase for {group_name} (English)",
-            "ja": f"{group_name}に関する基本メッセージです (日本語)",
-            "zh": f"关于{group_name}的默认信息 (中文)",
-        }
+        with self._connection() as conn:
+            conn.execute(UPSERT_RECORDING_SQL, params)
+            recording_id = conn.execute("SELECT id FROM recordings WHERE audio_path = ?", (audio_path,)).fetchone()[0]
+            conn.commit()
+        return recording_id
 
-        # 카운터 초기화
-        created_count = 0
+    @instrumented
+    def update_recording_transcript(self, recording_id, stt_text, translations=None):
+        """
+        녹음 기록의 STT 결과와 언어별 번역 저장
 
-        # 현재 최대 phrase_id 가져오기
-        cursor.execute("SELECT MAX(id) as max_id FROM phrases")
-        result = cursor.fetchone()
-        next_id = (result["max_id"] or 0) + 1
+        Args:
+            recording_id (int): 녹음 기록 ID
+            stt_text (str): STT 결과
+            translations (dict, optional): 언어 코드별 번역 결과
+        """
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE recordings SET stt_text = ?, translations = ? WHERE id = ?",
+                (stt_text, json.dumps(translations, ensure_ascii=False) if translations else None, recording_id),
+            )
+            conn.commit()
 
-        # 기존 멘트 데이터 가져오기
-        existing_phrases = {}
-        cursor.execute("SELECT id, language, content, audio_path FROM phrases WHERE group_id = ?", (group_id,))
-        for row in cursor.fetchall():
-            existing_phrases[row["language"]] = {
-                "id": row["id"],
-                "content": row["content"],
-                "audio_path": row["audio_path"],
-            }
+    @instrumented
+    def save_conversation(self, username, date, customer_id, file_path, messages, time_str=None):
+        """
+        대화 기록 파일과 메시지 저장 (대화 JSON 파일을 쓴 직후 호출, 같은 파일이면 메시지를 교체)
 
-        # 각 언어별로 기본 멘트 생성
-        for language in supported_languages:
-            # 해당 언어의 멘트가 이미 있는지 확인
-            cursor.execute(
-                "SELECT COUNT(*) as cnt FROM phrases WHERE group_id = ? AND language = ?", (group_id, language)
-            )
-            result = cursor.fetchone()
+        Args:
+            username (str): 사용자 이름
+            date (str): 날짜 (YYYY-MM-DD)
+            customer_id (str): 고객 ID
+            file_path (str): 대화 JSON 파일 경로
+            messages (list): 메시지 목록 (speaker, timestamp, text, translation, audio_path)
+            time_str (str, optional): 저장 시각 (HHMMSS, 기본: 파일명 또는 현재 시각)
 
-            if result and result["cnt"] == 0:
-                # 멘트가 없으면 새로 생성
-                # 우선 그룹의 다른 언어 멘트 중 내용이 있으면 그 내용을 기반으로 새 멘트 생성
-                content = default_templates.get(language, f"Default phrase for {group_name}")
+        Returns:
+            int: 대화 기록 ID
+        """
+        with self._connection() as conn:
+            with conn:
+                conversation_id = self._store_conversation(
+                    conn.cursor(), username, date, customer_id, file_path, messages, time_str
+                )
+        return conversation_id
 
-                # 음성 파일 디렉토리 확인 및 생성
-                audio_dir = Path(f"audio_files/{group_id}/{language}")
-                audio_dir.mkdir(parents=True, exist_ok=True)
+    def _store_conversation(self, cursor, username, date, customer_id, file_path, messages, time_str=None):
+        """대화 기록 upsert 및 메시지 교체 (트랜잭션 중인 커서로 호출)"""
+        file_name = os.path.basename(file_path)
+        if time_str is None:
+            time_str = self._conversation_time_str(file_path)
 
-                # 기본 오디오 파일 경로 (실제 파일은 없음)
-                audio_path = None
+        cursor.execute(
+            """
+        INSERT INTO conversations (username, date, customer_id, file_path, file_name, time_str, message_count)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(file_path) DO UPDATE SET
+            time_str = excluded.time_str,
+            message_count = excluded.message_count,
+            updated_at = CURRENT_TIMESTAMP
+        """,
+            (username, date, customer_id, file_path, file_name, time_str, len(messages)),
+        )
+        conversation_id = cursor.execute("SELECT id FROM conversations WHERE file_path = ?", (file_path,)).fetchone()[0]
 
-                # 새 멘트 추가
-                cursor.execute(
-                    "INSERT INTO phrases (id, group_id, language, content, audio_path) VALUES (?, ?, ?, ?, ?)",
-                    (next_id, group_id, language, content, audio_path),
+        cursor.execute("DELETE FROM messages WHERE conversation_id = ?", (conversation_id,))
+        cursor.executemany(
+            """
+        INSERT INTO messages (conversation_id, position, speaker, timestamp, text, translation, audio_path)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+            [
+                (
+                    conversation_id,
+                    position,
+                    message.get("speaker", ""),
+                    message.get("timestamp"),
+                    message.get("text"),
+                    message.get("translation"),
+                    message.get("audio_path"),
                 )
-                next_id += 1
-                created_count += 1
-                print(f"[DEBUG] 새 멘트 생성: 그룹 {group_id}, 언어 {language}, 내용 {content}")
+                for position, message in enumerate(messages)
+            ],
+        )
+        return conversation_id
 
-        conn.commit()
-        conn.close()
+    def _conversation_time_str(self, file_path):
+        """대화 파일의 시각 (conversation_{HHMMSS}.json이면 파일명, 아니면 파일 수정 시각)"""
+        file_name = os.path.basename(file_path)
+        if file_name.startswith("conversation_") and file_name.endswith(".json"):
+            return file_name[len("conversation_") : -len(".json")]
+        try:
+            return time.strftime("%H%M%S", time.localtime(os.path.getmtime(file_path)))
+        except OSError:
+            return time.strftime("%H%M%S")
 
-        return {"created": created_count}
+    @instrumented
+    def index_history(self, dirs=None):
+        """
+        recordings/conversations 폴더를 읽어 녹음/대화 기록 테이블에 반영 (앱 밖에서 바뀐 기록 폴더 반영용)
 
-    def ensure_phrase_exists(self, group_id, language, content=None):
+        Args:
+            dirs (iterable, optional): 다시 읽을 폴더 목록 (루트, 사용자, 날짜, 고객 폴더 중 하나). 없으면 전체
+
+        Returns:
+            dict: recordings, conversations, messages (반영한 수), removed (폴더에서 사라져 삭제한 기록 수)
         """
-        특정 그룹과 언어에 대한 멘트가 존재하는지 확인하고 없으면 생성
+        with self._connection() as conn:
+            with conn:
+                return self._index_history(conn.cursor(), dirs)
+
+    def backfill_history(self, batch_size=HISTORY_BACKFILL_BATCH):
+        """
+        v6 마이그레이션으로 만든 기록 테이블에 기존 기록 폴더를 색인 (파일 감시 스레드에서 한 번 호출)
+
+        고객 폴더를 batch_size개씩 나눠 각각 짧은 트랜잭션으로 반영하므로 다른 쓰기 작업을 오래 막지 않음
 
         Args:
-            group_id (int): 멘트 그룹 ID
-            language (str): 언어 코드 (ko, en, ja, zh)
-            content (str, optional): 멘트 내용, 없으면 기본 내용 사용
+            batch_size (int): 한 트랜잭션에서 처리할 고객 폴더 수
 
         Returns:
-            int: 생성된 멘트 ID 또는 기존 멘트 ID
+            dict: recordings, conversations, messages, removed (색인이 필요 없으면 None)
         """
-        # 데이터베이스 연결
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        if not self.history_backfill_pending:
+            return None
 
-        # 해당 그룹과 언어에 멘트가 이미 있는지 확인
-        cursor.execute("SELECT id FROM phrases WHERE group_id = ? AND language = ? LIMIT 1", (group_id, language))
-        row = cursor.fetchone()
+        with self._connection() as conn:
+            targets = [os.path.join(*parts) for parts in self._iter_history_dirs(conn.cursor())]
 
-        if row:
-            # 멘트가 이미 있으면 ID 반환
-            phrase_id = row["id"]
-            print(f"[DEBUG] 기존 멘트 사용: 그룹 {group_id}, 언어 {language}, ID {phrase_id}")
-        else:
-            # 멘트가 없으면 새로 생성
+        counts = {"recordings": 0, "conversations": 0, "messages": 0, "removed": 0}
+        for start in range(0, len(targets), batch_size):
+            batch_counts = self.index_history(targets[start : start + batch_size])
+            for key, value in batch_counts.items():
+                counts[key] += value
 
-            # 그룹 이름 가져오기
-            cursor.execute("SELECT name FROM phrase_groups WHERE id = ?", (group_id,))
-            group_row = cursor.fetchone()
-            group_name = group_row["name"] if group_row else f"그룹-{group_id}"
+        with self._connection() as conn:
+            conn.execute("DELETE FROM pending_tasks WHERE name = 'history_backfill'")
+            conn.commit()
+        self.history_backfill_pending = False
+        logger.info("기존 기록 폴더 색인: %s", counts)
+        return counts
 
-            # 같은 그룹의 다른 언어 멘트 확인 (내용 참고용)
+    def _index_history(self, cursor, dirs=None):
+        """
+        기록 폴더의 고객 폴더별로 녹음/대화 파일을 읽어 반영하고, 폴더에서 사라진 파일의 기록은 삭제
+        (트랜잭션 중인 커서로 호출)
+        """
+        counts = {"recordings": 0, "conversations": 0, "messages": 0, "removed": 0}
+        for root, username, date, customer_id in self._iter_history_dirs(cursor, dirs):
+            customer_path = os.path.join(root, username, date, customer_id)
+            try:
+                files = set(os.listdir(customer_path))
+            except OSError:
+                files = set()
+
+            if root == "recordings":
+                rows = [
+                    self._recording_row_from_files(username, date, customer_id, customer_path, file, files)
+                    for file in sorted(files)
+                    if file.startswith("recording_") and file.endswith(".wav")
+                ]
+                cursor.executemany(INDEX_RECORDING_SQL, rows)
+                counts["recordings"] += len(rows)
+                keep = [row[4] for row in rows]
+                table, path_column = "recordings", "audio_path"
+            else:
+                keep = []
+                for file in sorted(files):
+                    is_conversation = file.startswith("conversation_") and file.endswith(".json")
+                    if file != "conversation.json" and not is_conversation:
+                        continue
+                    file_path = os.path.join(customer_path, file)
+                    try:
+                        with open(file_path, "r", encoding="utf-8") as f:
+                            messages = json.load(f)
+                    except (OSError, ValueError) as e:
+                        logger.warning("대화 파일 읽기 오류: %s - %s", file_path, e)
+                        continue
+                    if not isinstance(messages, list):
+                        continue
+                    messages = [message for message in messages if isinstance(message, dict)]
+                    self._store_conversation(cursor, username, date, customer_id, file_path, messages)
+                    keep.append(file_path)
+                    counts["conversations"] += 1
+                    counts["messages"] += len(messages)
+                table, path_column = "conversations", "file_path"
+
+            # 폴더에서 사라진 파일의 기록 삭제
             cursor.execute(
-                "SELECT language, content FROM phrases WHERE group_id = ? AND content IS NOT NULL AND content != ''",
-                (group_id,),
+                f"""
+            SELECT id FROM {table}
+            WHERE username = ? AND date = ? AND customer_id = ?
+            AND {path_column} NOT IN (SELECT value FROM json_each(?))
+            """,
+                (username, date, customer_id, json.dumps(keep)),
             )
-            existing_phrases = cursor.fetchall()
-
-            # 기본 내용 설정
-            if not content:
-                language_labels = {"ko": "한국어", "en": "영어", "ja": "일본어", "zh": "중국어"}
+            removed = [row[0] for row in cursor.fetchall()]
+            cursor.executemany(f"DELETE FROM {table} WHERE id = ?", [(record_id,) for record_id in removed])
+            if table == "conversations":
+                cursor.executemany(
+                    "DELETE FROM messages WHERE conversation_id = ?", [(record_id,) for record_id in removed]
+                )
+            counts["removed"] += len(removed)
 
-                # 기본 템플릿
-                default_templates = {
-                    "ko": f"{group_name} 그룹의 한국어 멘트",
-                    "en": f"English phrase for {group_name} group",
-                    "ja": f"{group_name}グループの日本語メッセージ",
-                    "zh": f"{group_name}组的中文信息",
-                }
+        return counts
 
-                content = default_templates.get(
-                    language, f"{group_name} 그룹의 {language_labels.get(language, language)} 멘트"
-                )
+    def _iter_history_dirs(self, cursor, dirs=None):
+        """
+        다시 읽을 고객 폴더 목록
 
-            # 다음 ID 가져오기
-            cursor.execute("SELECT MAX(id) as max_id FROM phrases")
-            result = cursor.fetchone()
-            phrase_id = (result["max_id"] or 0) + 1
+        Args:
+            cursor (sqlite3.Cursor): 기록 테이블 조회용 커서
+            dirs (iterable, optional): 루트/사용자/날짜/고객 폴더 경로 목록. 없으면 모든 기록 루트
 
-            # 오디오 디렉토리 확인
-            audio_dir = Path(f"audio_files/{group_id}/{language}")
-            audio_dir.mkdir(parents=True, exist_ok=True)
+        Yields:
+            tuple: (루트, 사용자 이름, 날짜, 고객 ID) - 폴더가 삭제된 경우에도 해당 기록 정리를 위해 포함
+        """
+        prefixes = [(root,) for root in HISTORY_ROOTS] if dirs is None else [Path(d).parts for d in dirs]
 
-            # 새 멘트 추가
+        seen = set()
+        for parts in prefixes:
+            if not parts or parts[0] not in HISTORY_ROOTS:
+                continue
+            parts = tuple(parts[:4])
+
+            # 주어진 폴더 아래의 고객 폴더까지 내려가며 목록 작성
+            candidates = [parts]
+            while candidates and len(candidates[0]) < 4:
+                expanded = []
+                for candidate in candidates:
+                    try:
+                        entries = os.listdir(os.path.join(*candidate))
+                    except OSError:
+                        continue
+                    for entry in entries:
+                        if not os.path.isdir(os.path.join(*candidate, entry)):
+                            continue
+                        if len(candidate) == 2 and not HISTORY_DATE_PATTERN.match(entry):
+                            continue
+                        expanded.append(candidate + (entry,))
+                candidates = expanded
+
+            # 폴더는 사라졌지만 기록이 남아 있는 고객 폴더
+            table = "recordings" if parts[0] == "recordings" else "conversations"
+            conditions = ["username = ?", "date = ?", "customer_id = ?"][: len(parts) - 1]
             cursor.execute(
-                "INSERT INTO phrases (id, group_id, language, content, audio_path) VALUES (?, ?, ?, ?, ?)",
-                (phrase_id, group_id, language, content, None),
+                f"SELECT DISTINCT username, date, customer_id FROM {table}"
+                + (f" WHERE {' AND '.join(conditions)}" if conditions else ""),
+                parts[1:],
             )
-            print(f"[DEBUG] 새 멘트 생성: 그룹 {group_id}, 언어 {language}, ID {phrase_id}, 내용 {content}")
+            candidates.extend((parts[0],) + tuple(row) for row in cursor.fetchall())
 
-        conn.commit()
-        conn.close()
+            for candidate in candidates:
+                if candidate not in seen and HISTORY_DATE_PATTERN.match(candidate[2]):
+                    seen.add(candidate)
+                    yield candidate
 
-        return phrase_id
+    def _recording_row_from_files(self, username, date, customer_id, customer_path, file, files):
+        """녹음 파일과 같은 시각의 멘트 정보/STT/번역 파일을 읽어 INDEX_RECORDING_SQL 파라미터 생성"""
+        time_str = file[len("recording_") : -len(".wav")]
 
-    def reinitialize_database_and_scan(self):
+        def read_text(name):
+            if name not in files:
+                return None
+            try:
+                with open(os.path.join(customer_path, name), "r", encoding="utf-8") as f:
+                    return f.read()
+            except OSError:
+                return None
+
+        phrase = {}
+        metadata_path = None
+        metadata_text = read_text(f"phrase_info_{time_str}.json")
+        if metadata_text is not None:
+            metadata_path = os.path.join(customer_path, f"phrase_info_{time_str}.json")
+            try:
+                phrase = json.loads(metadata_text)
+            except ValueError:
+                phrase = {}
+            if not isinstance(phrase, dict):
+                phrase = {}
+
+        translations = {}
+        for language in SUPPORTED_LANGUAGES:
+            translation = read_text(f"translated_{language}_{time_str}.txt")
+            if translation is not None:
+                translations[language] = translation
+
+        return (
+            username,
+            date,
+            customer_id,
+            time_str,
+            os.path.join(customer_path, file),
+            metadata_path,
+            phrase.get("phrase_id"),
+            phrase.get("group_id"),
+            phrase.get("group_name"),
+            phrase.get("language"),
+            phrase.get("content"),
+            read_text(f"stt_result_{time_str}.txt"),
+            json.dumps(translations, ensure_ascii=False) if translations else None,
+        )
+
+    @instrumented
+    def get_history_dates(self, username):
         """
-        데이터베이스를 초기화하고 오디오 파일을 다시 스캔하여 멘트를 재구성
+        녹음 또는 대화 기록이 있는 날짜 목록 (최신순)
 
-        이 함수는 데이터베이스와 파일 시스템 간 불일치가 심한 경우 사용합니다.
-        주의: 기존 멘트 내용은 삭제되고, 오디오 파일만 유지됩니다.
+        Args:
+            username (str): 사용자 이름
+
+        Returns:
+            list: 날짜 문자열 목록 (YYYY-MM-DD)
+        """
+        with self._connection() as conn:
+            rows = conn.execute(
+                """
+            SELECT date FROM recordings WHERE username = ?
+            UNION
+            SELECT date FROM conversations WHERE username = ?
+            ORDER BY date DESC
+            """,
+                (username, username),
+            ).fetchall()
+        return [row["date"] for row in rows]
+
+    @instrumented
+    def get_history_customers(self, username, date=None):
+        """
+        녹음 또는 대화 기록이 있는 고객 ID 목록 (정렬)
+
+        Args:
+            username (str): 사용자 이름
+            date (str, optional): 날짜 (없으면 전체 기간)
 
         Returns:
-            dict: 처리 결과 통계
+            list: 고객 ID 목록
         """
-        print("[INFO] 데이터베이스 초기화 및 재구성 시작...")
+        where = "username = ?" + (" AND date = ?" if date else "")
+        params = (username, date) if date else (username,)
+
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"""
+            SELECT customer_id FROM recordings WHERE {where}
+            UNION
+            SELECT customer_id FROM conversations WHERE {where}
+            ORDER BY customer_id
+            """,
+                params + params,
+            ).fetchall()
+        return [row["customer_id"] for row in rows]
 
-        # 데이터베이스 연결
-        conn = self._get_connection()
-        cursor = conn.cursor()
+    @instrumented
+    def get_history_counts(self, username, date):
+        """
+        특정 날짜의 고객별 녹음 수와 대화 수 (대화는 대화 파일이 있으면 1)
 
-        # 기존 테이블 내용 모두 삭제
-        print("[INFO] 기존 테이블 내용 삭제 중...")
-        cursor.execute("DELETE FROM phrases")
-        cursor.execute("DELETE FROM phrase_groups")
-        conn.commit()
+        Args:
+            username (str): 사용자 이름
+            date (str): 날짜 (YYYY-MM-DD)
 
-        # 필요한 디렉토리 생성
-        audio_dir = Path("audio_files")
-        audio_dir.mkdir(exist_ok=True)
+        Returns:
+            dict: 고객 ID별 {"recordings": 녹음 수, "conversations": 대화 수}
+        """
+        with self._connection() as conn:
+            rows = conn.execute(
+                """
+            SELECT customer_id, SUM(recordings) AS recordings, SUM(conversations) AS conversations
+            FROM (
+                SELECT customer_id, COUNT(*) AS recordings, 0 AS conversations
+                FROM recordings WHERE username = ? AND date = ?
+                GROUP BY customer_id
+                UNION ALL
+                SELECT customer_id, 0, 1
+                FROM conversations WHERE username = ? AND date = ?
+                GROUP BY customer_id
+            )
+            GROUP BY customer_id
+            """,
+                (username, date, username, date),
+            ).fetchall()
+        return {
+            row["customer_id"]: {"recordings": row["recordings"], "conversations": row["conversations"]}
+            for row in rows
+        }
 
-        # 폴더 구조 스캔하여 그룹 생성
-        print("[INFO] 폴더 구조 스캔 및 그룹 생성 중...")
-        created_groups = []
+    @instrumented
+    def get_history_entries(self, username, date=None, customer_filter=None):
+        """
+        녹음 기록과 고객별 대화 기록 (날짜/시각 내림차순)
 
-        for group_folder in audio_dir.iterdir():
-            if group_folder.is_dir() and group_folder.name.isdigit():
-                group_id = int(group_folder.name)
-                group_name = f"그룹-{group_id}"
-                description = f"폴더 {group_id}에서 자동 생성"
+        대화는 날짜-고객마다 하나 (conversation.json이 있으면 그 파일, 없으면 가장 최근 conversation_*.json)
 
-                # 그룹 추가
-                cursor.execute(
-                    "INSERT INTO phrase_groups (id, name, description) VALUES (?, ?, ?)",
-                    (group_id, group_name, description),
-                )
-                created_groups.append((group_id, group_name))
-                print(f"[INFO] 그룹 생성: ID {group_id}, 이름 {group_name}")
+        Args:
+            username (str): 사용자 이름
+            date (str, optional): 날짜 (없으면 전체 기간)
+            customer_filter (str, optional): 고객 ID 부분 문자열 (대소문자 무시)
+
+        Returns:
+            list: type이 "recording" 또는 "conversation"인 기록 dict 목록
+        """
+        where = "username = ?"
+        params = [username]
+        if date:
+            where += " AND date = ?"
+            params.append(date)
+        if customer_filter:
+            where += " AND instr(lower(customer_id), lower(?)) > 0"
+            params.append(customer_filter)
+
+        with self._connection() as conn:
+            recordings = conn.execute(f"SELECT * FROM recordings WHERE {where}", params).fetchall()
+            conversations = conn.execute(
+                f"""
+            SELECT * FROM conversations WHERE {where}
+            ORDER BY date, customer_id, file_name = 'conversation.json' DESC, file_name DESC
+            """,
+                params,
+            ).fetchall()
+
+            # 날짜-고객별 대표 대화 파일
+            selected = {}
+            for row in conversations:
+                selected.setdefault((row["date"], row["customer_id"]), row)
+
+            messages = {}
+            if selected:
+                rows = conn.execute(
+                    """
+                SELECT * FROM messages
+                WHERE conversation_id IN (SELECT value FROM json_each(?))
+                ORDER BY conversation_id, position
+                """,
+                    (json.dumps([row["id"] for row in selected.values()]),),
+                ).fetchall()
+                for row in rows:
+                    messages.setdefault(row["conversation_id"], []).append(
+                        {
+                            "speaker": row["speaker"],
+                            "timestamp": row["timestamp"],
+                            "text": row["text"],
+                            "audio_path": row["audio_path"],
+                            "translation": row["translation"],
+                        }
+                    )
+
+        entries = []
+        for row in recordings:
+            phrase_info = None
+            if row["group_id"] is not None or row["content"] is not None:
+                phrase_info = {
+                    "phrase_id": row["phrase_id"],
+                    "group_id": row["group_id"],
+                    "language": row["language"],
+                    "content": row["content"],
+                }
+                if row["group_name"] is not None:
+                    phrase_info["group_name"] = row["group_name"]
+
+            entries.append(
+                {
+                    "date": row["date"],
+                    "customer_id": row["customer_id"],
+                    "time_str": row["time_str"],
+                    "audio_path": row["audio_path"],
+                    "metadata_path": row["metadata_path"],
+                    "phrase_info": phrase_info,
+                    "stt_text": row["stt_text"],
+                    "translations": json.loads(row["translations"]) if row["translations"] else {},
+                    "type": "recording",
+                }
+            )
 
-        conn.commit()
+        for row in selected.values():
+            conversation_data = messages.get(row["id"], [])
+            entries.append(
+                {
+                    "date": row["date"],
+                    "customer_id": row["customer_id"],
+                    "time_str": row["time_str"],
+                    "conversation_path": row["file_path"],
+                    "conversation_data": conversation_data,
+                    "type": "conversation",
+                    "conversation_file": row["file_name"],
+                    "message_count": len(conversation_data),
+                }
+            )
 
-        # 각 그룹과 언어별로 기본 멘트 생성
-        print("[INFO] 기본 멘트 생성 중...")
-        supported_languages = ["ko", "en", "ja", "zh"]
+        entries.sort(key=lambda entry: (entry["date"], entry["time_str"]), reverse=True)
+        return entries
 
-        for group_id, group_name in created_groups:
-            group_dir = audio_dir / str(group_id)
+    @instrumented
+    def get_customer_recordings(self, username, customer_id):
+        """
+        특정 고객의 녹음 기록 (날짜/시각 내림차순)
 
-            # 실제 존재하는 언어 폴더만 처리
-            for lang_folder in group_dir.iterdir():
-                if lang_folder.is_dir() and lang_folder.name in supported_languages:
-                    language = lang_folder.name
+        Args:
+            username (str): 사용자 이름
+            customer_id (str): 고객 ID
 
-                    # 해당 언어의 기본 멘트 생성
-                    content = f"{group_name}의 {language} 멘트"
-                    phrase_id = self.add_phrase(group_id, language, content)
-                    print(f"[INFO] 멘트 생성: 그룹 {group_id}, 언어 {language}, ID {phrase_id}")
+        Returns:
+            list: date, time, audio_path, stt_text, translations(언어 코드별 번역) dict 목록
+        """
+        with self._connection() as conn:
+            rows = conn.execute(
+                """
+            SELECT date, time_str, audio_path, stt_text, translations FROM recordings
+            WHERE username = ? AND customer_id = ?
+            ORDER BY date DESC, time_str DESC
+            """,
+                (username, customer_id),
+            ).fetchall()
+        return [
+            {
+                "date": row["date"],
+                "time": row["time_str"],
+                "audio_path": row["audio_path"],
+                "stt_text": row["stt_text"] or "",
+                "translations": json.loads(row["translations"]) if row["translations"] else {},
+            }
+            for row in rows
+        ]
 
-        conn.commit()
-        conn.close()
+    @instrumented
+    def find_recording_customers(self, username, date=None, languages=None):
+        """
+        조건에 맞는 녹음 기록이 있는 고객 ID
 
-        # 오디오 파일 스캔 및 매핑
-        print("[INFO] 오디오 파일 스캔 및 매핑 중...")
-        result = self.scan_audio_files_and_update_db()
+        Args:
+            username (str): 사용자 이름
+            date (str, optional): 날짜
+            languages (list, optional): 언어 코드 목록 (ko는 STT 결과, 그 외는 해당 언어 번역이 있는 녹음)
 
-        # 최종 결과 확인
-        print(f"[INFO] 데이터베이스 초기화 및 재구성 완료!")
-        print(f"[INFO] - 생성된 그룹: {len(created_groups)}개")
-        print(f"[INFO] - 스캔된 오디오 파일: {result.get('scanned', 0)}개")
-        print(f"[INFO] - 추가된 멘트: {result.get('added', 0)}개")
-        print(f"[INFO] - 업데이트된 멘트: {result.get('updated', 0)}개")
+        Returns:
+            set: 고객 ID
+        """
+        query = "SELECT DISTINCT customer_id FROM recordings WHERE username = ?"
+        params = [username]
+        if date:
+            query += " AND date = ?"
+            params.append(date)
+        if languages:
+            conditions = []
+            for language in languages:
+                if language == "ko":
+                    conditions.append("stt_text IS NOT NULL")
+                else:
+                    conditions.append("json_extract(translations, ?) IS NOT NULL")
+                    params.append(f"$.{language}")
+            query += f" AND ({' OR '.join(conditions)})"
 
-        return {
-            "groups": len(created_groups),
-            "audio_files": result.get("scanned", 0),
-            "added_phrases": result.get("added", 0),
-            "updated_phrases": result.get("updated", 0),
-        }
+        with self._connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return {row["customer_id"] for row in rows}
 
+    @instrumented
     def get_group_name(self, group_id):
         """
         그룹 ID로 그룹 이름 가져오기
@@ -896,32 +3478,37 @@ class DatabaseManager:
         Returns:
             str: 그룹 이름 (그룹이 없는 경우 빈 문자열 반환)
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT name FROM phrase_groups WHERE id = ?", (group_id,))
-        result = cursor.fetchone()
-
-        conn.close()
-
-        if result:
-            return result["name"]
-        else:
-            return ""
+        for group in self.get_phrase_groups():
+            if group["id"] == group_id:
+                return group["name"]
+        return ""
 
 
 # 싱글톤 인스턴스 생성을 위한 전역 함수
 _db_instance = None
+_db_lock = threading.Lock()
 
 
 def get_db_manager():
     """
     데이터베이스 관리자의 싱글톤 인스턴스를 가져옴
 
+    DB_POOL_SIZE 환경 변수로 연결 풀 크기 지정 가능 (0이면 풀 사용 안 함)
+    DB_SLOW_QUERY_MS, DB_SLOW_QUERY_LOG로 느린 쿼리 기준 시간과 로그 파일, DB_LOG_LEVEL로 로그 레벨 지정 가능
+    AUDIO_GC_GRACE_SECONDS로 삭제된 오디오 파일을 실제로 지우기 전 유예 시간(초) 지정 가능
+
     Returns:
         DatabaseManager: 데이터베이스 관리자 인스턴스
     """
     global _db_instance
-    if _db_instance is None:
-        _db_instance = DatabaseManager()
+    with _db_lock:
+        if _db_instance is None:
+            if os.getenv("DB_LOG_LEVEL"):
+                logger.setLevel(os.getenv("DB_LOG_LEVEL").upper())
+            _db_instance = DatabaseManager(
+                pool_size=int(os.getenv("DB_POOL_SIZE", "4")),
+                slow_query_ms=float(os.getenv("DB_SLOW_QUERY_MS", "200")),
+                slow_query_log=os.getenv("DB_SLOW_QUERY_LOG", "logs/slow_queries.log"),
+                gc_grace_seconds=float(os.getenv("AUDIO_GC_GRACE_SECONDS", str(AUDIO_GC_GRACE_SECONDS))),
+            )
     return _db_instance
@@ -0,0 +1,345 @@
+import os
+import sys
+import time
+import struct
+import select
+import logging
+import threading
+import ctypes
+import ctypes.util
+from pathlib import Path
+
+from database import get_db_manager, HISTORY_ROOTS
+
+# 감시 대상 루트 디렉토리
+WATCHED_ROOTS = ["audio_files", "recordings", "conversations"]
+
+# inotify 상수 (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+
+# struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[]; }
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _InotifyBackend:
+    """Linux inotify 기반 변경 감지 (하위 디렉토리마다 watch 등록)"""
+
+    def __init__(self, roots):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc를 찾을 수 없습니다")
+
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+
+        self._roots = list(roots)
+        self._wd_to_path = {}
+        for root in self._roots:
+            self._add_tree(root)
+
+    def _add_watch(self, path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            logging.warning(f"inotify watch 등록 실패: {path} (errno {ctypes.get_errno()})")
+            return
+        self._wd_to_path[wd] = path
+
+    def _add_tree(self, path):
+        for dirpath, _, _ in os.walk(path):
+            self._add_watch(dirpath)
+
+    def poll(self, timeout):
+        """
+        변경된 디렉토리 목록 반환
+
+        Args:
+            timeout (float): 최대 대기 시간(초)
+
+        Returns:
+            set: 변경이 발생한 디렉토리 경로
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + _EVENT_HEADER.size : offset + _EVENT_HEADER.size + name_len].rstrip(b"\0")
+            offset += _EVENT_HEADER.size + name_len
+
+            if mask & IN_Q_OVERFLOW:
+                # 이벤트 유실: 모든 루트를 변경된 것으로 처리
+                changed.update(self._roots)
+                continue
+
+            dir_path = self._wd_to_path.get(wd)
+            if mask & IN_IGNORED:
+                self._wd_to_path.pop(wd, None)
+            if dir_path is None:
+                continue
+
+            changed.add(dir_path)
+
+            # 새 하위 디렉토리는 watch 추가 (inotify는 재귀 감시를 지원하지 않음)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                new_dir = os.path.join(dir_path, os.fsdecode(name))
+                self._add_tree(new_dir)
+                changed.add(new_dir)
+
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class _PollingBackend:
+    """디렉토리 스냅샷 비교 기반 변경 감지 (inotify를 사용할 수 없는 환경용)"""
+
+    def __init__(self, roots, interval):
+        self._roots = list(roots)
+        self._interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self):
+        """디렉토리별 (mtime, 파일 수, 파일 최신 mtime) 스냅샷"""
+        snapshot = {}
+        pending = [root for root in self._roots if os.path.isdir(root)]
+
+        while pending:
+            dir_path = pending.pop()
+            try:
+                file_count = 0
+                newest_file = 0
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        else:
+                            file_count += 1
+                            newest_file = max(newest_file, entry.stat().st_mtime_ns)
+                snapshot[dir_path] = (os.stat(dir_path).st_mtime_ns, file_count, newest_file)
+            except FileNotFoundError:
+                continue
+
+        return snapshot
+
+    def poll(self, timeout):
+        time.sleep(max(timeout, self._interval))
+
+        snapshot = self._take_snapshot()
+        changed = {path for path, stamp in snapshot.items() if self._snapshot.get(path) != stamp}
+        # 삭제된 디렉토리는 상위 디렉토리의 변경으로 처리
+        changed.update(os.path.dirname(path) for path in self._snapshot if path not in snapshot)
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+class FileSystemWatcher:
+    """
+    파일 시스템 감시 스레드
+    audio_files, recordings, conversations 폴더의 변경을 감지하여 디바운스 후
+    데이터베이스에 증분 반영하고, 루트별 세대 번호를 증가시켜 UI 캐시 무효화에 사용
+    """
+
+    def __init__(self, db_manager, roots=None, debounce=0.5, max_delay=5.0, poll_interval=2.0, use_inotify=True):
+        """
+        파일 시스템 감시자 초기화
+
+        Args:
+            db_manager (DatabaseManager): 데이터베이스 관리자
+            roots (list, optional): 감시할 루트 디렉토리 목록
+            debounce (float): 마지막 이벤트 이후 반영까지 대기 시간(초)
+            max_delay (float): 이벤트가 계속 들어올 때 최대 지연 시간(초)
+            poll_interval (float): 폴링 방식 사용 시 스냅샷 주기(초)
+            use_inotify (bool): Linux에서 inotify 사용 여부
+        """
+        self.db_manager = db_manager
+        self.roots = list(roots or WATCHED_ROOTS)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+
+        self.backend_name = None
+        self.last_flush = None
+
+        self._generations = {root: 0 for root in self.roots}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def generation(self):
+        """전체 세대 번호 (어느 루트든 변경이 반영될 때마다 증가)"""
+        with self._lock:
+            return sum(self._generations.values())
+
+    def root_generation(self, root):
+        """
+        특정 루트의 세대 번호
+
+        Args:
+            root (str): 루트 디렉토리 이름
+
+        Returns:
+            int: 세대 번호
+        """
+        with self._lock:
+            return self._generations.get(root, 0)
+
+    def add_listener(self, callback):
+        """
+        변경 반영 후 호출될 콜백 등록
+
+        Args:
+            callback (callable): callback(root, changed_dirs) 형태의 함수
+        """
+        self._listeners.append(callback)
+
+    def start(self):
+        """감시 스레드 시작"""
+        if self.is_running:
+            return
+
+        for root in self.roots:
+            Path(root).mkdir(exist_ok=True)
+
+        backend = self._create_backend()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(backend,), name="fs-watcher", daemon=True)
+        self._thread.start()
+        logging.info(f"파일 시스템 감시 시작 ({self.backend_name}): {', '.join(self.roots)}")
+
+    def stop(self, timeout=5.0):
+        """감시 스레드 종료"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _create_backend(self):
+        if self.use_inotify and sys.platform.startswith("linux"):
+            try:
+                backend = _InotifyBackend(self.roots)
+                self.backend_name = "inotify"
+                return backend
+            except (OSError, AttributeError) as e:
+                logging.warning(f"inotify를 사용할 수 없어 폴링 방식으로 전환합니다: {e}")
+
+        self.backend_name = "polling"
+        return _PollingBackend(self.roots, self.poll_interval)
+
+    def _run(self, backend):
+        pending = set()
+        first_event = None
+        last_event = None
+
+        # 기존 기록 폴더 색인이 남아 있으면 먼저 처리 (색인 중 바뀐 폴더는 backend가 모아 두었다가 이어서 반영)
+        try:
+            self.db_manager.backfill_history()
+        except Exception as e:
+            logging.error(f"기존 기록 폴더 색인 중 오류 발생: {e}")
+
+        try:
+            while not self._stop_event.is_set():
+                changed = backend.poll(self.debounce if pending else 1.0)
+                now = time.monotonic()
+
+                if changed:
+                    pending.update(changed)
+                    last_event = now
+                    first_event = first_event or now
+
+                if pending and (now - last_event >= self.debounce or now - first_event >= self.max_delay):
+                    self._flush(pending)
+                    pending = set()
+                    first_event = None
+        except Exception as e:
+            logging.error(f"파일 시스템 감시 중 오류 발생: {e}")
+        finally:
+            backend.close()
+
+    def _flush(self, changed_dirs):
+        """모아 둔 변경 사항을 루트별로 반영"""
+        by_root = {}
+        for dir_path in changed_dirs:
+            root = Path(dir_path).parts[0] if Path(dir_path).parts else dir_path
+            if root in self._generations:
+                by_root.setdefault(root, set()).add(dir_path)
+
+        for root, dirs in by_root.items():
+            try:
+                if root == "audio_files":
+                    # 매니페스트 기반 증분 스캔이므로 변경된 폴더만 실제로 읽음
+                    # (제자리 덮어쓰기는 폴더 mtime이 그대로이므로 감지한 폴더를 명시적으로 전달)
+                    self.db_manager.scan_audio_files_and_update_db(dirs=dirs)
+                elif root in HISTORY_ROOTS:
+                    # 앱 밖에서 추가/삭제된 녹음/대화 파일을 기록 테이블에 반영
+                    self.db_manager.index_history(dirs)
+
+                for callback in self._listeners:
+                    callback(root, dirs)
+            except Exception as e:
+                logging.error(f"파일 변경 반영 중 오류 발생 ({root}): {e}")
+
+            with self._lock:
+                self._generations[root] += 1
+
+        self.last_flush = time.time()
+
+
+# 싱글톤 인스턴스 생성을 위한 전역 함수
+_watcher_instance = None
+_watcher_lock = threading.Lock()
+
+
+def get_fs_watcher():
+    """
+    파일 시스템 감시자의 싱글톤 인스턴스를 가져옴 (최초 호출 시 감시 시작)
+
+    FS_WATCHER_ENABLED=0 환경 변수로 비활성화 가능
+
+    Returns:
+        FileSystemWatcher: 파일 시스템 감시자 인스턴스
+    """
+    global _watcher_instance
+    with _watcher_lock:
+        if _watcher_instance is None:
+            db_manager = get_db_manager()
+            _watcher_instance = FileSystemWatcher(db_manager)
+            if os.getenv("FS_WATCHER_ENABLED", "1") != "0":
+                _watcher_instance.start()
+            elif db_manager.history_backfill_pending:
+                # 감시 스레드가 없으면 기존 기록 폴더 색인만 별도 스레드에서 처리
+                threading.Thread(target=db_manager.backfill_history, name="history-backfill", daemon=True).start()
+    return _watcher_instance
@@ -0,0 +1,80 @@
+import sys
+import time
+import logging
+import importlib
+import threading
+import types
+
+# 모듈 이름별 실제 import 소요 시간(초)
+load_times = {}
+
+_import_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    """
+    처음 속성에 접근할 때 실제 모듈을 import하는 대리 모듈
+    STT/TTS/번역 등 특정 기능에서만 사용하는 무거운 의존성의 시작 시간 비용을 줄이기 위해 사용
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is not None:
+            return module
+
+        with _import_lock:
+            module = self.__dict__["_lazy_module"]
+            if module is None:
+                started = time.perf_counter()
+                module = importlib.import_module(self.__name__)
+                load_times[self.__name__] = time.perf_counter() - started
+                logging.info(f"지연 import 완료: {self.__name__} ({load_times[self.__name__] * 1000:.1f}ms)")
+                self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name):
+    """
+    모듈을 지연 import
+
+    이미 import된 모듈이면 그대로 반환하고, 아니면 첫 속성 접근 시 import하는 대리 모듈 반환
+
+    Args:
+        name (str): 모듈 이름 (예: "openai")
+
+    Returns:
+        module: 실제 모듈 또는 LazyModule
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_loaded(module):
+    """
+    지연 import 모듈이 실제로 로드되었는지 확인
+
+    Args:
+        module (module): lazy_import()가 반환한 모듈
+
+    Returns:
+        bool: 로드 여부
+    """
+    if isinstance(module, LazyModule):
+        return module.__dict__["_lazy_module"] is not None
+    return True
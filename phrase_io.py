@@ -0,0 +1,315 @@
+"""
+멘트 라이브러리 일괄 가져오기/내보내기 (CSV, JSONL)
+
+사용 예:
+    python phrase_io.py export phrases.csv
+    python phrase_io.py export - --format jsonl
+    python phrase_io.py import phrases.jsonl --dry-run
+    python phrase_io.py import phrases.csv
+"""
+
+import io
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+
+from database import get_db_manager, SUPPORTED_LANGUAGES
+
+# 가져오기/내보내기 컬럼 (group_id, group_description, audio_path는 선택)
+FIELDS = ["group_id", "group_name", "group_description", "language", "content", "audio_path"]
+
+SUPPORTED_FORMATS = ("csv", "jsonl")
+
+# 문자열이어야 하는 컬럼 (JSONL에서는 숫자/객체 등 다른 타입이 올 수 있음)
+TEXT_FIELDS = ["group_name", "group_description", "language", "content", "audio_path"]
+
+# 검증 오류 최대 보고 수
+MAX_REPORTED_ERRORS = 50
+
+
+class PhraseImportError(Exception):
+    """가져오기 파일 검증 실패 (errors에 (줄 번호, 메시지) 목록)"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(f"가져오기 파일 검증 실패: 오류 {len(errors)}건")
+
+
+def detect_format(filename, default="csv"):
+    """
+    파일 확장자로 형식 판단
+
+    Args:
+        filename (str): 파일 이름
+        default (str): 알 수 없는 확장자일 때 사용할 형식
+
+    Returns:
+        str: "csv" 또는 "jsonl"
+    """
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if extension == ".csv":
+        return "csv"
+    return default
+
+
+def read_records(fp, fmt):
+    """
+    CSV/JSONL 파일에서 (줄 번호, 레코드) 생성
+
+    Args:
+        fp (TextIO): 텍스트 파일 객체
+        fmt (str): "csv" 또는 "jsonl"
+
+    Yields:
+        tuple: (줄 번호, dict 또는 파싱 오류 메시지 str)
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(fp)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(fp, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, f"JSON 파싱 오류: {e.msg}"
+            continue
+        yield line_number, record if isinstance(record, dict) else "JSON 객체가 아닙니다"
+
+
+def parse_group_id(value):
+    """
+    group_id 값을 정수로 변환 (1.7처럼 정수가 아닌 값은 버리지 않고 오류로 처리)
+
+    Args:
+        value: CSV 문자열 또는 JSONL 값
+
+    Returns:
+        int: 그룹 ID (비어 있으면 None)
+
+    Raises:
+        ValueError: 정수가 아닌 값
+    """
+    if value in ("", None):
+        return None
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        return int(value)
+    raise ValueError(f"정수가 아닌 group_id: {value!r}")
+
+
+def validate_records(rows):
+    """
+    가져올 레코드를 검증하고 정규화
+
+    모든 레코드를 검증한 뒤 오류가 하나라도 있으면 PhraseImportError 발생 (데이터베이스에 쓰지 않음)
+
+    Args:
+        rows (iterable): read_records()가 생성한 (줄 번호, 레코드)
+
+    Returns:
+        list: DatabaseManager.import_phrases()에 전달할 dict 목록
+    """
+    records = []
+    errors = []
+    seen = {}
+
+    for line_number, record in rows:
+        if isinstance(record, str):
+            errors.append((line_number, record))
+            continue
+
+        values = {field: record.get(field) for field in FIELDS}
+        invalid_fields = [
+            field for field in TEXT_FIELDS if values[field] is not None and not isinstance(values[field], str)
+        ]
+        if invalid_fields:
+            errors.append(
+                (line_number, ", ".join(f"{field}가 문자열이 아닙니다: {values[field]!r}" for field in invalid_fields))
+            )
+            continue
+
+        for field, value in values.items():
+            if isinstance(value, str):
+                values[field] = value.strip()
+
+        try:
+            group_id = parse_group_id(values["group_id"])
+        except ValueError:
+            errors.append((line_number, f"group_id가 정수가 아닙니다: {values['group_id']!r}"))
+            continue
+
+        group_name = values["group_name"] or (f"그룹-{group_id}" if group_id is not None else "")
+        if not group_name:
+            errors.append((line_number, "group_id 또는 group_name이 필요합니다"))
+            continue
+
+        language = (values["language"] or "").lower()
+        if language not in SUPPORTED_LANGUAGES:
+            errors.append((line_number, f"지원하지 않는 언어: {values['language']!r}"))
+            continue
+
+        if not values["content"]:
+            errors.append((line_number, "content가 비어 있습니다"))
+            continue
+
+        # 같은 파일 안에서 그룹-언어 중복 금지 (그룹당 언어별 멘트는 하나)
+        key = (group_id, group_name if group_id is None else None, language)
+        if key in seen:
+            errors.append((line_number, f"{seen[key]}번째 줄과 같은 그룹-언어 멘트가 중복됩니다"))
+            continue
+        seen[key] = line_number
+
+        records.append(
+            {
+                "group_id": group_id,
+                "group_name": group_name,
+                "group_description": values["group_description"] or "",
+                "language": language,
+                "content": values["content"],
+                "audio_path": values["audio_path"] or None,
+            }
+        )
+
+    if errors:
+        raise PhraseImportError(errors)
+    return records
+
+
+def import_phrases(fp, fmt, db_manager=None, dry_run=False):
+    """
+    CSV/JSONL 멘트 라이브러리 가져오기 (검증 후 한 트랜잭션으로 저장)
+
+    Args:
+        fp (TextIO): 텍스트 파일 객체
+        fmt (str): "csv" 또는 "jsonl"
+        db_manager (DatabaseManager, optional): 데이터베이스 관리자 (없으면 싱글톤 사용)
+        dry_run (bool): True인 경우 검증만 하고 저장하지 않음
+
+    Returns:
+        dict: records(검증된 레코드 수), groups_created, phrases, missing_audio(파일이 없는 오디오 경로 수), elapsed
+    """
+    started = time.perf_counter()
+    records = validate_records(read_records(fp, fmt))
+    missing_audio = sum(1 for record in records if record["audio_path"] and not os.path.exists(record["audio_path"]))
+
+    result = {"records": len(records), "groups_created": 0, "phrases": 0, "missing_audio": missing_audio}
+    if not dry_run and records:
+        result.update((db_manager or get_db_manager()).import_phrases(records))
+
+    result["elapsed"] = time.perf_counter() - started
+    return result
+
+
+def export_phrases(fp, fmt, db_manager=None, audio_only=False):
+    """
+    멘트 라이브러리를 CSV/JSONL로 내보내기 (iter_phrases로 배치 단위 조회하며 한 줄씩 기록)
+
+    Args:
+        fp (TextIO): 텍스트 파일 객체
+        fmt (str): "csv" 또는 "jsonl"
+        db_manager (DatabaseManager, optional): 데이터베이스 관리자 (없으면 싱글톤 사용)
+        audio_only (bool): True인 경우 오디오 파일이 있는 멘트만 내보냄
+
+    Returns:
+        int: 내보낸 멘트 수
+    """
+    db_manager = db_manager or get_db_manager()
+
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(fp, fieldnames=FIELDS, extrasaction="ignore")
+        writer.writeheader()
+
+    count = 0
+    for phrase in db_manager.iter_phrases(audio_only=audio_only):
+        row = {
+            "group_id": phrase["group_id"],
+            "group_name": phrase["group_name"] or "",
+            "group_description": phrase["group_description"] or "",
+            "language": phrase["language"],
+            "content": phrase["content"],
+            "audio_path": phrase["audio_path"] or "",
+        }
+        if writer is not None:
+            writer.writerow(row)
+        else:
+            fp.write(json.dumps(row, ensure_ascii=False) + "\n")
+        count += 1
+
+    return count
+
+
+def export_to_string(fmt, db_manager=None, audio_only=False):
+    """
+    내보내기 결과를 문자열로 반환 (Streamlit 다운로드 버튼용)
+
+    Returns:
+        tuple: (내용 문자열, 내보낸 멘트 수)
+    """
+    buffer = io.StringIO()
+    count = export_phrases(buffer, fmt, db_manager=db_manager, audio_only=audio_only)
+    return buffer.getvalue(), count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="멘트 라이브러리 가져오기/내보내기 (CSV, JSONL)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="멘트 라이브러리 내보내기")
+    export_parser.add_argument("path", help="저장할 파일 경로 (- 이면 표준 출력)")
+    export_parser.add_argument("--format", choices=SUPPORTED_FORMATS, help="파일 형식 (기본: 확장자로 판단)")
+    export_parser.add_argument("--audio-only", action="store_true", help="오디오 파일이 있는 멘트만 내보내기")
+
+    import_parser = subparsers.add_parser("import", help="멘트 라이브러리 가져오기")
+    import_parser.add_argument("path", help="가져올 파일 경로 (- 이면 표준 입력)")
+    import_parser.add_argument("--format", choices=SUPPORTED_FORMATS, help="파일 형식 (기본: 확장자로 판단)")
+    import_parser.add_argument("--dry-run", action="store_true", help="검증만 하고 저장하지 않음")
+
+    args = parser.parse_args()
+    fmt = args.format or detect_format(args.path)
+
+    if args.command == "export":
+        if args.path == "-":
+            count = export_phrases(sys.stdout, fmt, audio_only=args.audio_only)
+        else:
+            with open(args.path, "w", encoding="utf-8", newline="") as fp:
+                count = export_phrases(fp, fmt, audio_only=args.audio_only)
+        print(f"멘트 {count}개 내보내기 완료", file=sys.stderr)
+        return
+
+    try:
+        if args.path == "-":
+            result = import_phrases(sys.stdin, fmt, dry_run=args.dry_run)
+        else:
+            with open(args.path, encoding="utf-8-sig", newline="") as fp:
+                result = import_phrases(fp, fmt, dry_run=args.dry_run)
+    except UnicodeDecodeError as e:
+        print(f"UTF-8 파일이 아닙니다: {e}", file=sys.stderr)
+        sys.exit(1)
+    except PhraseImportError as e:
+        print(str(e), file=sys.stderr)
+        for line_number, message in e.errors[:MAX_REPORTED_ERRORS]:
+            print(f"  {line_number}번째 줄: {message}", file=sys.stderr)
+        sys.exit(1)
+
+    mode = "검증" if args.dry_run else "가져오기"
+    print(
+        f"{mode} 완료: 레코드 {result['records']}개, 새 그룹 {result['groups_created']}개, "
+        f"멘트 {result['phrases']}개, 오디오 파일 없음 {result['missing_audio']}개 ({result['elapsed']:.2f}초)"
+    )
+
+
+if __name__ == "__main__":
+    main()
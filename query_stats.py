@@ -0,0 +1,199 @@
+import time
+import logging
+import functools
+import threading
+from collections import deque
+from pathlib import Path
+
+# 지연 시간 히스토그램 구간 상한(ms), 마지막 구간은 그 이상 전체
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000, float("inf"))
+
+# 느린 쿼리 전용 로거 (파일 핸들러는 QueryStats 생성 시 연결)
+slow_query_logger = logging.getLogger("database.slow_query")
+
+
+def _count_rows(result):
+    """메서드 반환값에서 반환 행 수 추정 (목록/페이지 결과가 아니면 None)"""
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        for key in ("items", "groups"):
+            if isinstance(result.get(key), list):
+                return len(result[key])
+    return None
+
+
+def instrumented(method):
+    """
+    DatabaseManager 메서드의 호출 시간과 반환 행 수를 instrumentation 훅으로 전달하는 데코레이터
+
+    self._record_query(메서드 이름, 소요 시간(초), 반환 행 수, 예외 repr, 인자)를 호출함
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+        except Exception as e:
+            # 예외 객체를 보관하면 트레이스백이 실패한 메서드의 지역 변수(풀 연결 등)를 붙잡으므로 repr만 전달
+            self._record_query(method.__name__, time.perf_counter() - started, None, repr(e), args)
+            raise
+        self._record_query(method.__name__, time.perf_counter() - started, _count_rows(result), None, args)
+        return result
+
+    return wrapper
+
+
+class _MethodStats:
+    """메서드별 누적 통계"""
+
+    __slots__ = ("calls", "errors", "total", "max", "rows", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.buckets = [0] * len(LATENCY_BUCKETS_MS)
+
+    def percentile_ms(self, percent):
+        """히스토그램 기반 백분위수 추정 (해당 구간의 상한 반환)"""
+        target = self.calls * percent / 100
+        seen = 0
+        for upper, count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += count
+            if count and seen >= target:
+                return min(upper, self.max * 1000)
+        return self.max * 1000
+
+
+class QueryStats:
+    """
+    DatabaseManager instrumentation 훅의 기본 구현
+    메서드별 호출 수, 지연 시간 히스토그램, 반환 행 수를 집계하고 임계값을 넘은 호출은 느린 쿼리 로그에 기록
+    """
+
+    def __init__(self, slow_threshold_ms=200, slow_log_size=200, slow_log_path=None):
+        """
+        쿼리 통계 초기화
+
+        Args:
+            slow_threshold_ms (float): 느린 쿼리로 기록할 기준 시간(ms)
+            slow_log_size (int): 메모리에 보관할 최근 느린 쿼리 수
+            slow_log_path (str, optional): 느린 쿼리를 기록할 로그 파일 경로
+        """
+        self.slow_threshold_ms = slow_threshold_ms
+        self._methods = {}
+        self._slow_queries = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+        if slow_log_path:
+            self._attach_log_file(slow_log_path)
+
+    def _attach_log_file(self, path):
+        """느린 쿼리 로거에 파일 핸들러 연결 (같은 파일은 한 번만)"""
+        path = Path(path).resolve()
+        for handler in slow_query_logger.handlers:
+            if isinstance(handler, logging.FileHandler) and Path(handler.baseFilename) == path:
+                return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handler = logging.FileHandler(path, encoding="utf-8")
+        except OSError as e:
+            logging.warning(f"느린 쿼리 로그 파일을 열 수 없습니다: {e}")
+            return
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        slow_query_logger.addHandler(handler)
+        if slow_query_logger.level == logging.NOTSET:
+            slow_query_logger.setLevel(logging.WARNING)
+
+    def __call__(self, method, elapsed, rows, error, args):
+        """
+        호출 한 건 기록 (DatabaseManager.add_query_listener()에 등록되는 훅)
+
+        Args:
+            method (str): 메서드 이름
+            elapsed (float): 소요 시간(초)
+            rows (int | None): 반환 행 수
+            error (str | None): 발생한 예외의 repr
+            args (tuple): 호출 인자 (느린 쿼리 로그용)
+        """
+        elapsed_ms = elapsed * 1000
+        bucket = next(i for i, upper in enumerate(LATENCY_BUCKETS_MS) if elapsed_ms <= upper)
+
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = _MethodStats()
+            stats.calls += 1
+            stats.total += elapsed
+            stats.max = max(stats.max, elapsed)
+            stats.buckets[bucket] += 1
+            if rows:
+                stats.rows += rows
+            if error is not None:
+                stats.errors += 1
+
+            is_slow = elapsed_ms >= self.slow_threshold_ms
+            if is_slow:
+                entry = {
+                    "time": time.time(),
+                    "method": method,
+                    "elapsed_ms": elapsed_ms,
+                    "rows": rows,
+                    "args": repr(args)[:200],
+                    "error": error,
+                }
+                self._slow_queries.append(entry)
+
+        if is_slow:
+            slow_query_logger.warning(
+                "slow_query method=%s elapsed_ms=%.1f rows=%s args=%s", method, elapsed_ms, rows, entry["args"]
+            )
+
+    def snapshot(self):
+        """
+        메서드별 통계 (총 소요 시간 내림차순)
+
+        Returns:
+            list: 메서드별 calls, errors, total_ms, mean_ms, p50_ms, p95_ms, max_ms, rows, histogram
+        """
+        with self._lock:
+            rows = []
+            for method, stats in self._methods.items():
+                rows.append(
+                    {
+                        "method": method,
+                        "calls": stats.calls,
+                        "errors": stats.errors,
+                        "total_ms": stats.total * 1000,
+                        "mean_ms": stats.total * 1000 / stats.calls,
+                        "p50_ms": stats.percentile_ms(50),
+                        "p95_ms": stats.percentile_ms(95),
+                        "max_ms": stats.max * 1000,
+                        "rows": stats.rows,
+                        "histogram": dict(zip(LATENCY_BUCKETS_MS, stats.buckets)),
+                    }
+                )
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def slow_queries(self):
+        """
+        최근 느린 쿼리 목록 (최신순)
+
+        Returns:
+            list: time, method, elapsed_ms, rows, args, error
+        """
+        with self._lock:
+            return list(reversed(self._slow_queries))
+
+    def reset(self):
+        """통계 및 느린 쿼리 기록 초기화"""
+        with self._lock:
+            self._methods = {}
+            self._slow_queries.clear()
+            self.started_at = time.time()
@@ -0,0 +1,180 @@
+import os
+import time
+import logging
+import threading
+from pathlib import Path
+
+from database import get_db_manager
+
+# 지원하는 언어 코드
+SUPPORTED_LANGUAGES = ["ko", "en", "ja", "zh"]
+
+# 프로그램 실행에 필요한 기본 디렉토리
+BASE_DIRECTORIES = [
+    "audio_files",  # 오디오 파일 저장 디렉토리
+    "recordings",  # 녹음 파일 저장 디렉토리
+    "conversations",  # 대화 기록 저장 디렉토리
+    "logs",  # 로그 파일 저장 디렉토리
+    "data",  # 데이터 파일 저장 디렉토리
+    "tmp",  # 임시 파일 저장 디렉토리
+]
+
+
+class ReconciliationService:
+    """
+    파일 시스템과 데이터베이스 동기화 서비스
+    디렉토리 생성, 그룹-폴더 동기화, 오디오 스캔, 기본 멘트 생성을 프로세스 단위로 수행하고
+    변경 스탬프가 바뀌지 않았으면 전체 작업을 건너뜀
+    """
+
+    def __init__(self, db_manager, audio_dir="audio_files"):
+        """
+        동기화 서비스 초기화
+
+        Args:
+            db_manager (DatabaseManager): 데이터베이스 관리자
+            audio_dir (str): 오디오 파일 루트 디렉토리
+        """
+        self.db_manager = db_manager
+        self.audio_dir = Path(audio_dir)
+        self.watcher = None
+
+        self._lock = threading.Lock()
+        self._stamp = None
+
+        # 마지막 실행 정보
+        self.run_count = 0
+        self.last_run_at = None
+        self.last_result = None
+
+    def attach_watcher(self, watcher):
+        """
+        파일 시스템 감시자 연결
+
+        감시자가 동작 중이면 폴더 mtime 대신 감시자의 세대 번호로 변경을 감지
+
+        Args:
+            watcher (FileSystemWatcher): 파일 시스템 감시자
+        """
+        self.watcher = watcher
+
+    def compute_stamp(self):
+        """
+        변경 감지용 스탬프 계산
+
+        audio_files 및 그룹/언어 폴더의 mtime(디렉토리 항목 추가/삭제 시 변경)과
+        데이터베이스 세대 번호를 조합. 파일 내용을 읽거나 glob 하지 않으므로 매 rerun 마다 호출 가능
+        감시자가 연결되어 동작 중이면 폴더 조회 없이 세대 번호만 비교
+
+        Returns:
+            tuple: 스탬프 (audio_files 폴더가 없으면 None)
+        """
+        if self.watcher is not None and self.watcher.is_running:
+            return (self.db_manager.generation, self.watcher.root_generation(self.audio_dir.name))
+
+        try:
+            entries = [self.audio_dir.stat().st_mtime_ns]
+            with os.scandir(self.audio_dir) as group_entries:
+                for group_entry in group_entries:
+                    if not (group_entry.is_dir() and group_entry.name.isdigit()):
+                        continue
+                    entries.append((group_entry.name, group_entry.stat().st_mtime_ns))
+
+                    with os.scandir(group_entry.path) as lang_entries:
+                        for lang_entry in lang_entries:
+                            if lang_entry.is_dir() and lang_entry.name in SUPPORTED_LANGUAGES:
+                                entries.append((group_entry.name, lang_entry.name, lang_entry.stat().st_mtime_ns))
+        except FileNotFoundError:
+            return None
+
+        return (self.db_manager.generation, tuple(sorted(entries, key=str)))
+
+    def invalidate(self):
+        """다음 호출 시 동기화가 반드시 실행되도록 스탬프 초기화"""
+        with self._lock:
+            self._stamp = None
+
+    def ensure_synced(self, force=False):
+        """
+        변경이 감지된 경우에만 동기화 실행
+
+        Args:
+            force (bool): True인 경우 스탬프와 무관하게 실행
+
+        Returns:
+            dict: 동기화 결과 (변경이 없어 건너뛴 경우 None)
+        """
+        with self._lock:
+            # 동기화 전에 스탬프를 계산해야 스캔 도중 생긴 변경을 다음 호출에서 놓치지 않음
+            # (동기화가 만든 폴더/멘트 때문에 다음 호출에서 한 번 더 동기화될 수 있음)
+            stamp = self.compute_stamp()
+            if not force and stamp is not None and stamp == self._stamp:
+                return None
+
+            result = self._run()
+            self._stamp = stamp
+            return result
+
+    def provision_directories(self):
+        """기본 디렉토리 및 그룹/언어별 오디오 폴더 생성"""
+        for dir_name in BASE_DIRECTORIES:
+            Path(dir_name).mkdir(exist_ok=True)
+
+        try:
+            groups = self.db_manager.get_phrase_groups()
+
+            # 그룹별, 언어별 폴더 생성
+            for group in groups:
+                group_dir = self.audio_dir / str(group["id"])
+                for lang in SUPPORTED_LANGUAGES:
+                    (group_dir / lang).mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            logging.error(f"그룹 폴더 생성 중 오류 발생: {e}")
+            # 데이터베이스가 아직 없는 경우를 대비해 기본 그룹 구조 생성
+            default_group_dir = self.audio_dir / "1"
+            for lang in SUPPORTED_LANGUAGES:
+                (default_group_dir / lang).mkdir(parents=True, exist_ok=True)
+
+    def _run(self):
+        """동기화 작업 전체 실행"""
+        started = time.perf_counter()
+
+        # 필요한 디렉토리 생성
+        self.provision_directories()
+
+        # 오디오 폴더와 데이터베이스 동기화
+        self.db_manager.sync_groups_with_folders()
+
+        # 오디오 파일 스캔 및 데이터베이스 업데이트
+        scan_result = self.db_manager.scan_audio_files_and_update_db()
+
+        # 모든 그룹에 대해 누락된 언어별 기본 멘트 일괄 생성
+        coverage = self.db_manager.ensure_language_coverage()
+        default_phrases = coverage["groups"]
+
+        elapsed = time.perf_counter() - started
+        self.run_count += 1
+        self.last_run_at = time.time()
+        self.last_result = {"scan": scan_result or {}, "default_phrases": default_phrases, "elapsed": elapsed}
+
+        logging.info(f"파일 시스템/데이터베이스 동기화 완료 ({elapsed * 1000:.1f}ms, {self.run_count}회차)")
+        return self.last_result
+
+
+# 싱글톤 인스턴스 생성을 위한 전역 함수
+_service_instance = None
+_service_lock = threading.Lock()
+
+
+def get_reconciliation_service():
+    """
+    동기화 서비스의 싱글톤 인스턴스를 가져옴
+
+    Returns:
+        ReconciliationService: 동기화 서비스 인스턴스
+    """
+    global _service_instance
+    with _service_lock:
+        if _service_instance is None:
+            _service_instance = ReconciliationService(get_db_manager())
+    return _service_instance
@@ -5,11 +5,10 @@ import logging
 st.set_page_config(page_title="보이스 프로그램", page_icon="🎙️", layout="wide")
 
 import os
-from dotenv import load_dotenv
-import numpy as np
-from pydub import AudioSegment
-import openai
+import io
+from dotenv import dotenv_values
 import json
+import copy
 from datetime import datetime
 import streamlit_authenticator as stauth
 import yaml
@@ -17,38 +16,212 @@ from yaml.loader import SafeLoader
 import glob
 from pathlib import Path
 import base64
-import re
-import pyaudio
-import wave
-from firebase_admin import credentials, initialize_app, auth
-from database import get_db_manager
+import time
+from database import get_db_manager, PAGE_SIZE
+from reconciliation import get_reconciliation_service
+from fs_watcher import get_fs_watcher
+from audio_gc import get_audio_gc
+from audio_store import get_audio_store
+import phrase_io
+import translator
+from streamlit.errors import StreamlitAPIException
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from lazy_import import lazy_import
+
+# STT/번역/TTS 경로에서만 사용하는 무거운 의존성은 최초 사용 시 로드
+openai = lazy_import("openai")
+
+# 설정 파일 경로
+current_dir = Path(__file__).parent
+CONFIG_PATH = current_dir / "config.yaml"
+ENV_PATH = current_dir / ".env"
+
+def _file_stamp(path):
+    """
+    파일 변경 감지용 스탬프
+
+    Args:
+        path (Path): 파일 경로
+
+    Returns:
+        tuple: (mtime_ns, 크기) (파일이 없으면 None)
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@st.cache_resource(show_spinner=False)
+def get_dotenv_keys():
+    """
+    .env에서 읽어 os.environ에 반영한 키 (실제 환경 변수는 덮어쓰지 않음)
+
+    Streamlit은 rerun마다 스크립트를 새 모듈로 실행하므로 모듈 전역 변수 대신 프로세스 전역 캐시에 보관
+
+    Returns:
+        set: 키 집합 (load_environment에서만 수정)
+    """
+    return set()
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_environment(env_stamp):
+    """
+    .env 파일을 환경 변수에 반영 (프로세스 전역 캐시, .env가 바뀐 경우에만 다시 읽음)
+
+    load_dotenv()와 같이 프로세스에 이미 설정된 실제 환경 변수는 덮어쓰지 않지만,
+    이전에 .env에서 읽은 값은 새 값으로 갱신
 
-# 환경 변수 로드
-load_dotenv()
+    Args:
+        env_stamp (tuple): .env 파일 스탬프 (캐시 키)
+
+    Returns:
+        dict: .env 파일의 값
+    """
+    dotenv_keys = get_dotenv_keys()
+    values = dotenv_values(ENV_PATH) if env_stamp else {}
+    for key, value in values.items():
+        if value is None or (key in os.environ and key not in dotenv_keys):
+            continue
+        os.environ[key] = value
+        dotenv_keys.add(key)
+
+    # .env에서 삭제된 키 제거
+    for key in dotenv_keys - set(values):
+        os.environ.pop(key, None)
+        dotenv_keys.discard(key)
+
+    logging.info(f".env 로드: {len(values)}개 항목")
+    return values
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_config(config_stamp):
+    """
+    config.yaml 로드 (프로세스 전역 캐시, 파일이 바뀐 경우에만 다시 파싱)
+
+    Args:
+        config_stamp (tuple): config.yaml 파일 스탬프 (캐시 키)
+
+    Returns:
+        dict: 설정 (모든 세션이 공유하므로 수정하지 말 것)
+    """
+    with open(CONFIG_PATH, "r", encoding="utf-8") as file:
+        return yaml.load(file, Loader=SafeLoader)
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_hashed_credentials(config_stamp):
+    """
+    config.yaml 자격 증명의 평문 비밀번호를 bcrypt 해시로 변환 (config.yaml이 바뀐 경우에만 다시 계산)
+
+    Args:
+        config_stamp (tuple): config.yaml 파일 스탬프 (캐시 키)
+
+    Returns:
+        dict: 비밀번호가 해시된 자격 증명
+    """
+    import bcrypt
+
+    credentials = copy.deepcopy(load_config(config_stamp)["credentials"])
+    for user_data in credentials["usernames"].values():
+        password = str(user_data["password"])
+        if not password.startswith(("$2a$", "$2b$", "$2y$")):
+            user_data["password"] = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    return credentials
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def create_openai_client(api_key):
+    """
+    OpenAI 클라이언트 생성 (프로세스 전역 캐시)
+
+    API 키별로 하나의 클라이언트를 모든 세션과 rerun에서 공유하여 HTTP keep-alive 연결을 재사용
+
+    Args:
+        api_key (str): OpenAI API 키
+
+    Returns:
+        openai.OpenAI: OpenAI 클라이언트
+    """
+    logging.info("OpenAI 클라이언트 생성")
+    return openai.OpenAI(api_key=api_key)
+
+
+def get_config():
+    """
+    현재 config.yaml 설정을 가져옴
+
+    Returns:
+        dict: 설정
+    """
+    return load_config(_file_stamp(CONFIG_PATH))
+
+
+def get_openai_client():
+    """
+    OpenAI 클라이언트를 가져옴 (최초 호출 시 openai 모듈 로드 및 클라이언트 생성)
+
+    Returns:
+        openai.OpenAI: OpenAI 클라이언트 (API 키가 없으면 None)
+    """
+    load_environment(_file_stamp(ENV_PATH))
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    return create_openai_client(api_key)
+
+
+def get_authenticator():
+    """
+    세션별 인증 객체를 가져옴
+
+    stauth.Authenticate는 세션 상태와 쿠키 컴포넌트를 사용하므로 세션마다 한 번 생성하고,
+    비용이 큰 비밀번호 해시는 프로세스 전역 캐시를 사용
+
+    Returns:
+        stauth.Authenticate: 인증 객체
+    """
+    config_stamp = _file_stamp(CONFIG_PATH)
+    cached = st.session_state.get("authenticator")
+    if cached is None or cached[0] != config_stamp:
+        config = load_config(config_stamp)
+        authenticator = stauth.Authenticate(
+            copy.deepcopy(load_hashed_credentials(config_stamp)),
+            config["cookie"]["name"],
+            config["cookie"]["key"],
+            config["cookie"]["expiry_days"],
+        )
+        st.session_state.authenticator = (config_stamp, authenticator)
+    return st.session_state.authenticator[1]
+
+
+# 환경 변수 로드 (.env가 바뀐 경우에만 다시 읽음)
+load_environment(_file_stamp(ENV_PATH))
 
 # 데이터베이스 매니저 초기화
 db_manager = get_db_manager()
 
-# OpenAI API 설정 (최신 API 방식으로 변경)
-api_key = os.getenv("OPENAI_API_KEY")
-client = None
-if api_key:
-    client = openai.OpenAI(api_key=api_key)
+# 파일 시스템/데이터베이스 동기화 서비스 (프로세스 단위)
+reconciliation_service = get_reconciliation_service()
 
-# config 파일 로드
-import os
+# 파일 시스템 감시자 (audio_files/recordings/conversations 변경을 백그라운드에서 반영)
+fs_watcher = get_fs_watcher()
+reconciliation_service.attach_watcher(fs_watcher)
 
-logging.info(os.getcwd())
-logging.info(os.listdir(os.getcwd()))
-current_dir = Path(__file__).parent
-logging.info(current_dir)
-with open(current_dir / "config.yaml", "r", encoding="utf-8") as file:
-    config = yaml.load(file, Loader=SafeLoader)
+# 오디오 파일 삭제 작업자 (삭제된 멘트/그룹의 오디오 파일을 유예 시간 후 백그라운드에서 삭제)
+audio_gc = get_audio_gc()
+
+# 내용 주소 오디오 저장소 (AUDIO_STORE_ENABLED=1이면 멘트 오디오를 SHA-256 기준으로 중복 없이 저장)
+audio_store = get_audio_store()
+
+# config 파일 로드
+config = get_config()
 
 # 인증 설정
-authenticator = stauth.Authenticate(
-    config["credentials"], config["cookie"]["name"], config["cookie"]["key"], config["cookie"]["expiry_days"]
-)
+authenticator = get_authenticator()
 
 # 언어별 국기 아이콘
 LANGUAGE_ICONS = {"ja": "🇯🇵", "zh": "🇨🇳", "en": "🇺🇸", "ko": "🇰🇷"}
@@ -56,28 +229,25 @@ LANGUAGE_ICONS = {"ja": "🇯🇵", "zh": "🇨🇳", "en": "🇺🇸", "ko": "
 # 언어 레이블
 LANGUAGE_LABELS = {"ko": "한국어", "en": "영어", "ja": "일본어", "zh": "중국어"}
 
+# 녹음 STT 결과를 번역할 언어
+RECORDING_TRANSLATION_LANGUAGES = ["ja", "zh", "en"]
 
-def main():
-    # 필요한 디렉토리 생성
-    create_required_directories()
+# 삭제 후 되돌리기 안내
+UNDO_DELETION_HINT = (
+    f"{db_manager.gc_grace_seconds / 60:.0f}분 안에는 설정 탭의 '삭제 대기 중인 항목'에서 되돌릴 수 있습니다."
+)
 
-    # 오디오 폴더와 데이터베이스 동기화
-    db_manager.sync_groups_with_folders()
 
-    # 오디오 파일 스캔 및 데이터베이스 업데이트
-    scan_result = db_manager.scan_audio_files_and_update_db()
-    if scan_result and (scan_result.get("added", 0) > 0 or scan_result.get("updated", 0) > 0):
-        st.toast(
-            f"오디오 파일 스캔 완료: {scan_result.get('added', 0)}개 추가, {scan_result.get('updated', 0)}개 업데이트"
-        )
+def main():
+    # 파일 시스템/데이터베이스 동기화 (변경이 감지된 경우에만 실행)
+    try:
+        sync_result = reconciliation_service.ensure_synced()
+    except Exception as e:
+        st.error(f"파일 시스템 동기화 중 오류가 발생했습니다: {e}")
+        sync_result = None
 
-    # 모든 그룹에 대해 기본 멘트 생성 확인
-    groups = db_manager.get_phrase_groups()
-    for group in groups:
-        # 각 그룹에 대해 언어별 기본 멘트 생성
-        result = db_manager.create_default_phrases_for_group(group["id"], group["name"])
-        if result and result.get("created", 0) > 0:
-            st.toast(f"{group['name']} 그룹에 {result.get('created')}개 기본 멘트 생성 완료")
+    if sync_result:
+        show_sync_result_toasts(sync_result)
 
     # 세션 상태 초기화
     if "recording" not in st.session_state:
@@ -93,6 +263,9 @@ def main():
     if "active_tab" not in st.session_state:
         st.session_state.active_tab = 0
 
+    # 사용자 디렉토리 생성
+    create_required_directories()
+
     # 로그인 상태 확인
     if not st.session_state.authenticated or not st.session_state.username:
         show_login()
@@ -100,6 +273,41 @@ def main():
         show_main_app()
 
 
+def rerun_fragment():
+    """
+    현재 fragment만 다시 실행
+
+    fragment 재실행이 아닌 전체 실행 중(최초 렌더링 등)에 호출되면 앱 전체를 다시 실행
+    """
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+
+def is_fragment_rerun():
+    """
+    현재 실행이 fragment만 다시 실행하는 중인지 확인
+
+    Returns:
+        bool: fragment 단독 재실행이면 True, 앱 전체 실행이면 False
+    """
+    ctx = get_script_run_ctx()
+    return bool(ctx and ctx.fragment_ids_this_run)
+
+
+def show_sync_result_toasts(sync_result):
+    """동기화 결과를 토스트 메시지로 표시"""
+    scan_result = sync_result.get("scan", {})
+    if scan_result.get("added", 0) > 0 or scan_result.get("updated", 0) > 0:
+        st.toast(
+            f"오디오 파일 스캔 완료: {scan_result.get('added', 0)}개 추가, {scan_result.get('updated', 0)}개 업데이트"
+        )
+
+    for group_name, created in sync_result.get("default_phrases", {}).items():
+        st.toast(f"{group_name} 그룹에 {created}개 기본 멘트 생성 완료")
+
+
 def show_login():
     st.title("보이스 프로그램 로그인")
 
@@ -178,35 +386,71 @@ def show_main_app():
         st.success("로그아웃되었습니다!")
         st.rerun()
 
-    # 탭 설정 - 간단한 탭 구현으로 복원
-    tab_names = ["녹음", "멘트 관리", "녹음 기록", "대화", "설정"]
-    tabs = st.tabs(tab_names)
+    # 화면 목록 (st.session_state.active_tab 인덱스 순서)
+    views = [
+        ("녹음", show_recording_tab),
+        ("멘트 관리", show_phrase_management_tab),
+        ("녹음 기록", show_recording_history_tab),
+        ("대화", show_conversation_tab),
+        ("설정", show_settings_tab),
+    ]
+    view_names = [name for name, _ in views]
+
+    # 다른 화면에서 active_tab을 변경한 경우 내비게이션 위젯 값 동기화 (위젯 생성 전에만 변경 가능)
+    if st.session_state.get("main_nav") != view_names[st.session_state.active_tab]:
+        st.session_state.main_nav = view_names[st.session_state.active_tab]
+
+    # 탭 대신 선택된 화면만 실행하는 내비게이션 (st.tabs는 모든 탭을 매번 실행함)
+    st.radio(
+        "화면 선택",
+        view_names,
+        key="main_nav",
+        horizontal=True,
+        label_visibility="collapsed",
+        on_change=lambda: st.session_state.update(active_tab=view_names.index(st.session_state.main_nav)),
+    )
+    st.markdown("---")
+
+    view_name, view_func = views[st.session_state.active_tab]
+    started = time.perf_counter()
+    try:
+        view_func()
+    finally:
+        record_view_timing(view_name, time.perf_counter() - started)
+
+    timing = st.session_state.view_timings[view_name]
+    st.caption(
+        f"⏱️ {view_name} 화면 렌더링 {timing['last_ms']:.1f}ms "
+        f"(평균 {timing['total_ms'] / timing['count']:.1f}ms, {timing['count']}회)"
+    )
 
-    # 탭 내용 표시 - 조건 검사 없이 각 탭에 내용 직접 표시
-    # 녹음 탭
-    with tabs[0]:
-        show_recording_tab()
 
-    # 멘트 관리 탭
-    with tabs[1]:
-        show_phrase_management_tab()
+def record_view_timing(view_name, elapsed):
+    """
+    화면별 렌더링 시간 기록
 
-    # 녹음 기록 탭
-    with tabs[2]:
-        show_recording_history_tab()
+    Args:
+        view_name (str): 화면 이름
+        elapsed (float): 렌더링 소요 시간(초)
+    """
+    if "view_timings" not in st.session_state:
+        st.session_state.view_timings = {}
 
-    # 대화 탭
-    with tabs[3]:
-        show_conversation_tab()
+    elapsed_ms = elapsed * 1000
+    timing = st.session_state.view_timings.setdefault(view_name, {"count": 0, "total_ms": 0.0, "last_ms": 0.0})
+    timing["count"] += 1
+    timing["total_ms"] += elapsed_ms
+    timing["last_ms"] = elapsed_ms
 
-    # 설정 탭
-    with tabs[4]:
-        show_settings_tab()
+    logging.info(f"화면 렌더링: {view_name} {elapsed_ms:.1f}ms")
 
 
 def show_recording_tab():
     st.header("음성 녹음")
 
+    # 다른 탭에서 멘트를 선택하고 이동한 경우 안내 메시지
+    show_flash_message("recording_flash")
+
     # 멘트 선택 섹션 (폼 바깥에서 선택)
     st.subheader("멘트 선택")
 
@@ -242,28 +486,23 @@ def show_recording_tab():
                                 "language": result["language"],
                                 "content": result["content"],
                                 "audio_path": result["audio_path"] if "audio_path" in result else None,
+                                "audio_exists": bool(result["audio_exists"]),
                             }
                             break
             else:
                 st.info("검색 결과가 없습니다.")
     else:  # 그룹에서 선택하기
-        # 그룹 선택
-        groups = db_manager.get_phrase_groups()
+        # 그룹 선택 (그룹/언어별 멘트를 한 번에 조회한 카탈로그 사용)
+        catalog = db_manager.get_catalog_snapshot()
+        groups = catalog["groups"]
         if groups:
             group_options = [(group["id"], group["name"]) for group in groups]
             selected_group_id = st.selectbox("그룹 선택", options=group_options, format_func=lambda x: x[1])
 
             if selected_group_id:
-                # 선택된 그룹의 멘트 가져오기
-                phrases = db_manager.get_phrases_by_group(selected_group_id[0])
-
-                # 언어별로 정리
-                languages = {}
-                for phrase in phrases:
-                    lang = phrase["language"]
-                    if lang not in languages:
-                        languages[lang] = []
-                    languages[lang].append(phrase)
+                # 선택된 그룹의 언어별 멘트
+                selected_group = catalog["by_id"].get(selected_group_id[0])
+                languages = selected_group["languages"] if selected_group else {}
 
                 # 언어 선택
                 if languages:
@@ -283,6 +522,7 @@ def show_recording_tab():
                             "language": phrase["language"],
                             "content": phrase["content"],
                             "audio_path": phrase["audio_path"],
+                            "audio_exists": phrase["audio_exists"],
                         }
         else:
             st.info("등록된 그룹이 없습니다.")
@@ -306,7 +546,7 @@ def show_recording_tab():
         st.session_state.selected_phrase = selected_phrase
 
         # 기존 녹음본 재생 (있는 경우)
-        if selected_phrase.get("audio_path") and os.path.exists(selected_phrase["audio_path"]):
+        if selected_phrase.get("audio_path") and selected_phrase.get("audio_exists"):
             st.write("기존 녹음본:")
             st.audio(selected_phrase["audio_path"])
 
@@ -353,36 +593,43 @@ def show_recording_tab():
                     # UploadedFile 객체인 경우 getbuffer() 사용
                     f.write(audio_bytes.getbuffer())
 
+            # 선택된 멘트가 있는 경우 멘트 정보 저장
+            phrase_info = None
+            phrase_info_path = None
+            if phrase_to_use:
+                phrase_info = {
+                    "phrase_id": phrase_to_use["id"],
+                    "group_id": phrase_to_use["group_id"],
+                    "group_name": db_manager.get_group_name(phrase_to_use["group_id"]),
+                    "language": phrase_to_use["language"],
+                    "content": phrase_to_use["content"],
+                }
+                phrase_info_path = os.path.join(save_path, f"phrase_info_{time_str}.json")
+                with open(phrase_info_path, "w", encoding="utf-8") as f:
+                    json.dump(phrase_info, f, ensure_ascii=False, indent=2)
+
+            # 녹음 기록 테이블에 저장 (기록 탭은 폴더 대신 이 테이블을 조회)
+            recording_id = db_manager.add_recording(
+                st.session_state.username,
+                date_str,
+                customer_id,
+                time_str,
+                filepath,
+                phrase=phrase_info,
+                metadata_path=phrase_info_path,
+            )
+
             st.success(f"녹음이 완료되었습니다: {filepath}")
 
             # 오디오 재생 (폼 외부에서)
             st.audio(audio_bytes)
 
-            # 선택된 멘트가 있는 경우 멘트 정보 저장
             if phrase_to_use:
-                # 그룹 이름 가져오기
-                group_name = db_manager.get_group_name(phrase_to_use["group_id"])
-
-                # 멘트 정보 저장
-                phrase_info_path = os.path.join(save_path, f"phrase_info_{time_str}.json")
-                with open(phrase_info_path, "w", encoding="utf-8") as f:
-                    json.dump(
-                        {
-                            "phrase_id": phrase_to_use["id"],
-                            "group_id": phrase_to_use["group_id"],
-                            "group_name": group_name,
-                            "language": phrase_to_use["language"],
-                            "content": phrase_to_use["content"],
-                        },
-                        f,
-                        ensure_ascii=False,
-                        indent=2,
-                    )
-
                 st.info("멘트 정보가 녹음과 함께 저장되었습니다.")
 
                 # OpenAI API를 사용한 STT 및 번역 처리
-                if api_key and client:
+                client = get_openai_client()
+                if client:
                     with st.spinner("음성을 텍스트로 변환 중..."):
                         try:
                             # OpenAI API를 사용한 STT
@@ -405,19 +652,21 @@ def show_recording_tab():
                                     with open(stt_path, "w", encoding="utf-8") as f:
                                         f.write(transcription)
 
-                                    # 번역 처리 (기본 언어가 한국어이므로 일본어, 중국어, 영어로 번역)
-                                    for lang in ["ja", "zh", "en"]:
-                                        try:
-                                            translation = translate_text(
-                                                transcription, lang, save_path, "recording", time_str
-                                            )
+                                    # 번역 처리 (기본 언어가 한국어이므로 일본어, 중국어, 영어로 한 번에 번역)
+                                    with st.spinner("일본어, 중국어, 영어로 번역 중..."):
+                                        translations, errors = translator.translate_multi(
+                                            client, transcription, RECORDING_TRANSLATION_LANGUAGES
+                                        )
 
-                                            # 번역 결과 파일명: translated_ja_time.txt, translated_zh_time.txt 등
-                                            trans_path = os.path.join(save_path, f"translated_{lang}_{time_str}.txt")
-                                            with open(trans_path, "w", encoding="utf-8") as f:
-                                                f.write(translation)
-                                        except Exception as e:
-                                            st.error(f"{lang} 번역 중 오류 발생: {str(e)}")
+                                    # 번역 결과 파일명: translated_ja_time.txt, translated_zh_time.txt 등
+                                    for lang, translated in translations.items():
+                                        trans_path = os.path.join(save_path, f"translated_{lang}_{time_str}.txt")
+                                        with open(trans_path, "w", encoding="utf-8") as f:
+                                            f.write(translated)
+                                    for lang, error in errors.items():
+                                        st.error(f"{LANGUAGE_LABELS.get(lang, lang)} 번역 중 오류 발생: {error}")
+
+                                    db_manager.update_recording_transcript(recording_id, transcription, translations)
 
                                     st.success(f"STT 및 번역 처리가 완료되었습니다.")
                         except Exception as e:
@@ -447,7 +696,11 @@ def show_phrase_management_tab():
         # 검색 결과 표시
         if search_query:
             search_type = search_type_map.get(search_option, "all")
-            search_results = db_manager.search_phrases(search_query, search_type)
+
+            # 검색 결과는 한 페이지씩 조회 (검색어/범위가 바뀌면 첫 페이지부터)
+            page_cursor = get_page_cursor("search_page", (search_query, search_type))
+            search_page = db_manager.search_phrases_page(search_query, search_type, after=page_cursor, limit=PAGE_SIZE)
+            search_results = search_page["items"]
 
             if search_results:
                 # 그룹별로 결과 정리
@@ -462,7 +715,7 @@ def show_phrase_management_tab():
                     group_results[group_id]["phrases"].append(result)
 
                 # 그룹별로 결과 표시
-                st.subheader(f"검색 결과: {len(search_results)}개 멘트 발견")
+                st.subheader(f"검색 결과: {len(search_results)}개 멘트 ({get_page_number('search_page')} 페이지)")
 
                 for group_id, group_data in group_results.items():
                     with st.expander(f"📁 그룹: {group_data['name']} ({len(group_data['phrases'])}개)", expanded=True):
@@ -498,9 +751,9 @@ def show_phrase_management_tab():
 
                                             with cols[1]:
                                                 # 오디오 재생 (있는 경우)
-                                                if phrase["audio_path"] and os.path.exists(phrase["audio_path"]):
+                                                if phrase["audio_path"] and phrase["audio_exists"]:
                                                     st.audio(phrase["audio_path"])
-                                                    st.caption(f"파일명: {os.path.basename(phrase['audio_path'])}")
+                                                    st.caption(format_audio_caption(phrase))
                                                 else:
                                                     st.warning("녹음 없음")
 
@@ -515,9 +768,12 @@ def show_phrase_management_tab():
                                                     }
                                                     # 활성 탭을 녹음 탭(0)으로 변경
                                                     st.session_state.active_tab = 0
-                                                    st.success("멘트가 선택되었습니다. 녹음 탭으로 이동합니다.")
+                                                    st.session_state.recording_flash = "멘트가 선택되었습니다."
+                                                    st.rerun()
 
                         st.markdown("---")
+
+                show_page_controls("search_page", search_page["next_cursor"])
             else:
                 st.info("검색 결과가 없습니다.")
 
@@ -528,8 +784,9 @@ def show_phrase_management_tab():
         # 음성이 있는 멘트만 표시할지 여부
         show_audio_only = st.checkbox("음성 데이터가 있는 멘트만 표시", value=True)
 
-        # 그룹 목록 가져오기 (phrase_groups 테이블만 사용)
-        groups = db_manager.get_phrase_groups()
+        # 그룹/멘트 목록 가져오기 (한 번의 JOIN 쿼리로 조회한 카탈로그)
+        catalog = db_manager.get_catalog_snapshot()
+        groups = catalog["groups"]
 
         if groups:
             # 그룹 선택 드롭다운
@@ -544,26 +801,18 @@ def show_phrase_management_tab():
 
             if selected_group_option:
                 selected_group_id = selected_group_option[0]
-                selected_group_name = next(g["name"] for g in groups if g["id"] == selected_group_id)
+                selected_group = catalog["by_id"][selected_group_id]
+                selected_group_name = selected_group["name"]
 
-                # 선택한 그룹의 멘트 가져오기
-                group_phrases = db_manager.get_phrases_by_group(selected_group_id)
+                # 선택한 그룹의 멘트
+                group_phrases = selected_group["phrases"]
 
-                print(f"[DEBUG] 그룹 {selected_group_id}({selected_group_name})의 멘트: {len(group_phrases)}개")
+                logging.debug(f"그룹 {selected_group_id}({selected_group_name})의 멘트: {len(group_phrases)}개")
 
-                # 음성 데이터 필터링 (클라이언트 측에서)
+                # 음성 데이터 필터링 (스캔 시 저장된 audio_exists 컬럼 기준, 파일 확인 없음)
                 if show_audio_only:
-                    filtered_by_audio = []
-                    for p in group_phrases:
-                        has_audio = p.get("audio_path") and os.path.exists(p.get("audio_path"))
-                        print(
-                            f"[DEBUG] 멘트 ID {p.get('id')}: 오디오 경로 {p.get('audio_path')}, 파일 존재: {has_audio}"
-                        )
-                        if has_audio:
-                            filtered_by_audio.append(p)
-
-                    group_phrases = filtered_by_audio
-                    print(f"[DEBUG] 오디오 필터링 후: {len(group_phrases)}개 멘트 남음")
+                    group_phrases = [p for p in group_phrases if p["audio_exists"]]
+                    logging.debug(f"오디오 필터링 후: {len(group_phrases)}개 멘트 남음")
 
                 if not group_phrases:
                     if show_audio_only:
@@ -613,102 +862,31 @@ def show_phrase_management_tab():
                                                 key=f"list_phrase_{phrase['id']}",
                                             )
 
-                                        with col2:
-                                            # 오디오 영역
-                                            if phrase["audio_path"] and os.path.exists(phrase["audio_path"]):
-                                                st.audio(phrase["audio_path"])
-                                                st.caption(f"파일명: {os.path.basename(phrase['audio_path'])}")
-                                            else:
-                                                st.warning("녹음된 오디오가 없습니다")
+                                            # 액션 버튼
+                                            action_col1, action_col2 = st.columns(2)
 
-                                        # 액션 버튼
-                                        col1, col2, col3, col4 = st.columns(4)
+                                            with action_col1:
+                                                if st.button(f"녹음에 사용", key=f"list_use_{phrase['id']}"):
+                                                    # 선택한 멘트 정보 저장
+                                                    st.session_state.selected_phrase = {
+                                                        "id": phrase["id"],
+                                                        "group_id": phrase["group_id"],
+                                                        "language": phrase["language"],
+                                                        "content": phrase["content"],
+                                                    }
+                                                    # 활성 탭을 녹음 탭(0)으로 변경
+                                                    st.session_state.active_tab = 0
+                                                    st.session_state.recording_flash = "멘트가 선택되었습니다."
+                                                    st.rerun()
 
-                                        with col1:
-                                            if st.button(f"녹음에 사용", key=f"list_use_{phrase['id']}"):
-                                                # 선택한 멘트 정보 저장
-                                                st.session_state.selected_phrase = {
-                                                    "id": phrase["id"],
-                                                    "group_id": phrase["group_id"],
-                                                    "language": phrase["language"],
-                                                    "content": phrase["content"],
-                                                }
-                                                # 활성 탭을 녹음 탭(0)으로 변경
-                                                st.session_state.active_tab = 0
-                                                st.success("멘트가 선택되었습니다. 녹음 탭으로 이동합니다.")
+                                            with action_col2:
+                                                if st.button(f"멘트 삭제", key=f"list_delete_{phrase['id']}"):
+                                                    db_manager.delete_phrase(phrase["id"])
+                                                    st.success(f"멘트가 삭제되었습니다. {UNDO_DELETION_HINT}")
 
                                         with col2:
-                                            if st.button(f"멘트 삭제", key=f"list_delete_{phrase['id']}"):
-                                                db_manager.delete_phrase(phrase["id"])
-                                                st.success("멘트가 삭제되었습니다.")
-
-                                        with col3:
-                                            if phrase["audio_path"] and os.path.exists(phrase["audio_path"]):
-                                                if st.button(f"오디오 삭제", key=f"list_delete_audio_{phrase['id']}"):
-                                                    db_manager.update_phrase_audio(phrase["id"], None)
-                                                    st.success("오디오가 삭제되었습니다.")
-
-                                        with col4:
-                                            # 녹음 버튼
-                                            if st.button(f"녹음하기", key=f"list_record_btn_{phrase['id']}"):
-                                                st.session_state[f"show_record_{phrase['id']}"] = True
-
-                                        # 녹음 영역 (버튼 클릭 시 표시)
-                                        if st.session_state.get(f"show_record_{phrase['id']}", False):
-                                            with st.form(key=f"list_record_form_{phrase['id']}"):
-                                                st.subheader("직접 녹음하기")
-
-                                                # 녹음 위젯
-                                                st.markdown("#### 💬 마이크 아이콘을 클릭하여 녹음하세요")
-                                                audio_bytes = st.audio_input(
-                                                    "마이크로 녹음", key=f"list_audio_recorder_{phrase['id']}"
-                                                )
-
-                                                col1, col2 = st.columns(2)
-                                                with col1:
-                                                    submit_record = st.form_submit_button(
-                                                        "저장", use_container_width=True
-                                                    )
-                                                with col2:
-                                                    cancel_record = st.form_submit_button(
-                                                        "취소", use_container_width=True
-                                                    )
-
-                                            if cancel_record:
-                                                st.session_state[f"show_record_{phrase['id']}"] = False
-                                                st.rerun()
-
-                                            if submit_record and audio_bytes is not None:
-                                                # 파일 저장 경로 생성
-                                                audio_dir = Path("audio_files")
-                                                audio_dir.mkdir(exist_ok=True)
-
-                                                # 그룹 폴더 생성
-                                                group_dir = audio_dir / str(phrase["group_id"])
-                                                group_dir.mkdir(exist_ok=True)
-
-                                                # 언어 폴더 생성
-                                                language_dir = group_dir / phrase["language"]
-                                                language_dir.mkdir(exist_ok=True)
-
-                                                # 파일명 생성
-                                                save_name = f"phrase_{phrase['id']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.wav"
-                                                filepath = os.path.join(language_dir, save_name)
-
-                                                # 녹음된 오디오 바이트를 파일로 저장
-                                                with open(filepath, "wb") as f:
-                                                    if isinstance(audio_bytes, bytes):
-                                                        f.write(audio_bytes)
-                                                    else:
-                                                        # UploadedFile 객체인 경우 getbuffer() 사용
-                                                        f.write(audio_bytes.getbuffer())
-
-                                                # 데이터베이스 업데이트
-                                                db_manager.update_phrase_audio(phrase["id"], filepath)
-
-                                                st.success(f"녹음이 저장되었습니다!")
-                                                st.session_state[f"show_record_{phrase['id']}"] = False
-                                                st.rerun()
+                                            # 오디오 영역 (재생/삭제/녹음은 fragment 단위로 부분 재실행)
+                                            show_list_phrase_audio(phrase["id"], phrase)
 
                                     # 구분선
                                     st.markdown("---")
@@ -731,8 +909,12 @@ def show_phrase_management_tab():
                 db_manager.add_phrase_group(group_name, group_desc)
                 st.success(f"멘트 그룹 '{group_name}'이(가) 추가되었습니다.")
 
-        # 기존 멘트 그룹 목록
-        groups = db_manager.get_phrase_groups()
+        # 기존 멘트 그룹 목록 (한 페이지씩 조회)
+        groups_page = db_manager.get_phrase_groups_page(get_page_cursor("group_page"), limit=PAGE_SIZE)
+        groups = groups_page["items"]
+
+        # 그룹별 멘트는 카탈로그에서 가져옴 (그룹마다 쿼리하지 않음)
+        catalog = db_manager.get_catalog_snapshot()
 
         if groups:
             for group in groups:
@@ -740,7 +922,8 @@ def show_phrase_management_tab():
                     st.write(f"설명: {group['description'] or '없음'}")
 
                     # 해당 그룹의 멘트 표시
-                    phrases = db_manager.get_phrases_by_group(group["id"])
+                    group_catalog = catalog["by_id"].get(group["id"])
+                    phrases = group_catalog["phrases"] if group_catalog else []
 
                     # 지원하는 언어 목록
                     supported_languages = ["ko", "en", "ja", "zh"]
@@ -764,7 +947,7 @@ def show_phrase_management_tab():
 
                     # 언어별 탭 생성
                     if phrases:
-                        languages = set(phrase["language"] for phrase in phrases)
+                        languages = list(group_catalog["languages"])
                         lang_tabs = st.tabs(
                             [f"{LANGUAGE_ICONS.get(lang, '')} {language_labels.get(lang, lang)}" for lang in languages]
                         )
@@ -783,24 +966,8 @@ def show_phrase_management_tab():
                                         disabled=True,
                                     )
 
-                                    # 기존 녹음 파일이 있으면 표시
-                                    if (
-                                        "audio_path" in phrase
-                                        and phrase["audio_path"]
-                                        and os.path.exists(phrase["audio_path"])
-                                    ):
-                                        st.markdown("##### 💿 녹음된 오디오 재생")
-                                        st.audio(phrase["audio_path"])
-                                        file_info = os.path.basename(phrase["audio_path"])
-                                        st.caption(f"파일명: {file_info}")
-                                        st.text(f"경로: {phrase['audio_path']}")
-                                    else:
-                                        st.warning(
-                                            "녹음된 오디오가 없습니다. 아래에서 녹음하거나 파일을 업로드하세요."
-                                        )
-
                                     # 오디오 관리 열
-                                    col1, col2, col3 = st.columns(3)
+                                    col1, col2 = st.columns(2)
 
                                     # 녹음 탭으로 이동
                                     with col1:
@@ -814,115 +981,17 @@ def show_phrase_management_tab():
                                             }
                                             # 활성 탭을 녹음 탭(0)으로 변경
                                             st.session_state.active_tab = 0
-                                            st.success("멘트가 선택되었습니다. 녹음 탭으로 이동합니다.")
+                                            st.session_state.recording_flash = "멘트가 선택되었습니다."
+                                            st.rerun()
 
                                     # 멘트 삭제 기능
                                     with col2:
                                         if st.button(f"멘트 삭제", key=f"delete_{phrase['id']}"):
                                             db_manager.delete_phrase(phrase["id"])
-                                            st.success("멘트가 삭제되었습니다.")
-
-                                    # 오디오 삭제 버튼
-                                    with col3:
-                                        if (
-                                            "audio_path" in phrase
-                                            and phrase["audio_path"]
-                                            and os.path.exists(phrase["audio_path"])
-                                        ):
-                                            if st.button(f"오디오 삭제", key=f"delete_audio_{phrase['id']}"):
-                                                db_manager.update_phrase_audio(phrase["id"], None)
-                                                st.success("오디오가 삭제되었습니다.")
-
-                                    # 오디오 파일 업로드
-                                    with st.form(key=f"upload_form_{phrase['id']}"):
-                                        st.subheader("오디오 파일 업로드")
-
-                                        uploaded_file = st.file_uploader(
-                                            "MP3 또는 WAV 파일 선택", type=["mp3", "wav"], key=f"upload_{phrase['id']}"
-                                        )
-
-                                        col1, col2 = st.columns(2)
-                                        with col1:
-                                            submit_upload = st.form_submit_button("업로드", use_container_width=True)
-                                        with col2:
-                                            cancel_upload = st.form_submit_button("취소", use_container_width=True)
-
-                                    if submit_upload and uploaded_file is not None:
-                                        # 파일 저장 경로 생성
-                                        audio_dir = Path("audio_files")
-                                        audio_dir.mkdir(exist_ok=True)
-
-                                        # 그룹 폴더 생성
-                                        group_dir = audio_dir / str(phrase["group_id"])
-                                        group_dir.mkdir(exist_ok=True)
-
-                                        # 언어 폴더 생성
-                                        language_dir = group_dir / phrase["language"]
-                                        language_dir.mkdir(exist_ok=True)
-
-                                        # 파일명 생성 (파일 확장자 유지)
-                                        file_ext = uploaded_file.name.split(".")[-1]
-                                        save_name = f"phrase_{phrase['id']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_ext}"
-                                        filepath = os.path.join(language_dir, save_name)
-
-                                        # 파일 저장
-                                        with open(filepath, "wb") as f:
-                                            if isinstance(uploaded_file, bytes):
-                                                f.write(uploaded_file)
-                                            else:
-                                                # UploadedFile 객체인 경우 getbuffer() 사용
-                                                f.write(uploaded_file.getbuffer())
-
-                                        # 데이터베이스 업데이트
-                                        db_manager.update_phrase_audio(phrase["id"], filepath)
-
-                                        st.success(f"오디오 파일이 업로드되었습니다!")
-
-                                    # 직접 녹음
-                                    with st.form(key=f"record_form_{phrase['id']}"):
-                                        st.subheader("직접 녹음하기")
-
-                                        # 녹음 위젯 (강조)
-                                        st.markdown("#### 💬 마이크 아이콘을 클릭하여 녹음하세요")
-                                        audio_bytes = st.audio_input(
-                                            "마이크로 녹음하기", key=f"audio_recorder_{phrase['id']}"
-                                        )
-
-                                        st.info("녹음 후 아래 버튼을 클릭하여 저장하세요.")
-                                        # 폼 제출 버튼
-                                        submit_record = st.form_submit_button("녹음 저장", use_container_width=True)
-
-                                    if submit_record and audio_bytes is not None:
-                                        # 파일 저장 경로 생성
-                                        audio_dir = Path("audio_files")
-                                        audio_dir.mkdir(exist_ok=True)
+                                            st.success(f"멘트가 삭제되었습니다. {UNDO_DELETION_HINT}")
 
-                                        # 그룹 폴더 생성
-                                        group_dir = audio_dir / str(phrase["group_id"])
-                                        group_dir.mkdir(exist_ok=True)
-
-                                        # 언어 폴더 생성
-                                        language_dir = group_dir / phrase["language"]
-                                        language_dir.mkdir(exist_ok=True)
-
-                                        # 파일명 생성
-                                        save_name = (
-                                            f"phrase_{phrase['id']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.wav"
-                                        )
-                                        filepath = os.path.join(language_dir, save_name)
-
-                                        # 녹음된 오디오 바이트를 파일로 저장
-                                        with open(filepath, "wb") as f:
-                                            if isinstance(audio_bytes, bytes):
-                                                f.write(audio_bytes)
-                                            else:
-                                                # UploadedFile 객체인 경우 getbuffer() 사용
-                                                f.write(audio_bytes.getbuffer())
-
-                                        # 데이터베이스 업데이트
-                                        db_manager.update_phrase_audio(phrase["id"], filepath)
-
-                                        st.success(f"녹음이 저장되었습니다!")
+                                    # 오디오 재생/삭제/업로드/녹음 (fragment 단위로 부분 재실행)
+                                    show_phrase_audio_editor(phrase["id"], phrase)
 
                                     # 구분선
                                     st.markdown("---")
@@ -1031,7 +1100,270 @@ def show_phrase_management_tab():
                     # 그룹 삭제
                     if st.button("그룹 삭제", key=f"delete_group_{group['id']}"):
                         db_manager.delete_phrase_group(group["id"])
-                        st.success(f"멘트 그룹 '{group['name']}'이(가) 삭제되었습니다.")
+                        st.success(f"멘트 그룹 '{group['name']}'이(가) 삭제되었습니다. {UNDO_DELETION_HINT}")
+
+            show_page_controls("group_page", groups_page["next_cursor"])
+
+
+def get_page_cursor(key, reset_token=None):
+    """
+    세션에 저장된 페이지 커서 스택에서 현재 페이지의 커서를 가져옴
+
+    Args:
+        key (str): 페이지 상태 세션 키
+        reset_token (hashable, optional): 값이 바뀌면 첫 페이지로 초기화 (예: 검색어)
+
+    Returns:
+        현재 페이지 커서 (첫 페이지는 None)
+    """
+    state = st.session_state.get(key)
+    if state is None or state["token"] != reset_token:
+        state = {"token": reset_token, "cursors": [None]}
+        st.session_state[key] = state
+    return state["cursors"][-1]
+
+
+def get_page_number(key):
+    """현재 페이지 번호 (1부터 시작)"""
+    return len(st.session_state[key]["cursors"])
+
+
+def show_page_controls(key, next_cursor):
+    """
+    이전/다음 페이지 버튼 표시
+
+    Args:
+        key (str): 페이지 상태 세션 키 (get_page_cursor와 동일)
+        next_cursor: 다음 페이지 커서 (마지막 페이지면 None)
+    """
+    cursors = st.session_state[key]["cursors"]
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.button("◀ 이전", key=f"{key}_prev", disabled=len(cursors) == 1, on_click=cursors.pop)
+    with col2:
+        st.caption(f"{len(cursors)} 페이지")
+    with col3:
+        st.button(
+            "다음 ▶", key=f"{key}_next", disabled=next_cursor is None, on_click=cursors.append, args=(next_cursor,)
+        )
+
+
+def save_phrase_audio(phrase, audio_file, file_ext="wav"):
+    """
+    멘트 오디오 파일을 audio_files/{group_id}/{language}/ 폴더에 저장하고 데이터베이스 경로 갱신
+    (오디오 저장소를 사용하면 내용 해시 기준으로 저장하여 같은 내용은 한 번만 저장)
+
+    Args:
+        phrase (dict): 멘트 정보
+        audio_file (UploadedFile | bytes): 저장할 오디오 데이터
+        file_ext (str): 파일 확장자
+
+    Returns:
+        str: 저장된 파일 경로
+    """
+    if audio_store.enabled:
+        filepath = audio_store.put(audio_file, file_ext)
+        db_manager.update_phrase_audio(phrase["id"], filepath)
+        return filepath
+
+    # 그룹/언어 폴더 생성
+    language_dir = Path("audio_files") / str(phrase["group_id"]) / phrase["language"]
+    language_dir.mkdir(parents=True, exist_ok=True)
+
+    # 파일명 생성
+    save_name = f"phrase_{phrase['id']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_ext}"
+    filepath = os.path.join(language_dir, save_name)
+
+    # 오디오 바이트를 파일로 저장
+    with open(filepath, "wb") as f:
+        if isinstance(audio_file, bytes):
+            f.write(audio_file)
+        else:
+            # UploadedFile 객체인 경우 getbuffer() 사용
+            f.write(audio_file.getbuffer())
+
+    # 데이터베이스 업데이트
+    db_manager.update_phrase_audio(phrase["id"], filepath)
+    return filepath
+
+
+def format_audio_caption(phrase):
+    """
+    멘트 오디오 파일 정보 캡션 (파일명, 크기, 재생 시간)
+
+    Args:
+        phrase (dict): 멘트 정보 (audio_size, audio_duration 컬럼 포함)
+
+    Returns:
+        str: 캡션 문자열
+    """
+    details = []
+    if phrase.get("audio_size"):
+        details.append(f"{phrase['audio_size'] / 1024:.1f}KB")
+    if phrase.get("audio_duration"):
+        details.append(f"{phrase['audio_duration']:.1f}초")
+
+    caption = f"파일명: {os.path.basename(phrase['audio_path'])}"
+    if details:
+        caption += f" ({', '.join(details)})"
+    return caption
+
+
+def show_flash_message(key):
+    """
+    st.rerun() 전에 세션 상태에 저장해 둔 처리 결과 메시지를 다시 실행된 화면에서 한 번 표시
+
+    Args:
+        key (str): 메시지를 저장한 세션 상태 키
+    """
+    message = st.session_state.pop(key, None)
+    if message:
+        st.success(message)
+
+
+def show_audio_flash_message(phrase_id):
+    """fragment 재실행 전에 저장해 둔 오디오 처리 결과 메시지 표시"""
+    show_flash_message(f"audio_flash_{phrase_id}")
+
+
+@st.fragment
+def show_list_phrase_audio(phrase_id, phrase=None):
+    """
+    전체 리스트 탭의 멘트 오디오 영역 (재생, 오디오 삭제, 직접 녹음)
+
+    st.fragment로 분리되어 녹음 저장/삭제 시 이 영역만 다시 실행됨
+
+    Args:
+        phrase_id (int): 멘트 ID
+        phrase (dict): 전체 실행 시 카탈로그에서 가져온 멘트 행 (fragment 재실행 시에는 다시 조회)
+    """
+    # fragment 재실행 시에는 전체 실행 때 넘겨받은 행이 오래되었으므로 다시 조회
+    if phrase is None or is_fragment_rerun():
+        phrase = db_manager.get_phrase(phrase_id)
+    if not phrase:
+        return
+    phrase = dict(phrase)
+
+    show_audio_flash_message(phrase_id)
+
+    # 오디오 존재 여부는 스캔/저장 시점에 기록된 상태 사용 (렌더링마다 파일 확인하지 않음)
+    has_audio = phrase["audio_path"] and phrase["audio_exists"]
+    if has_audio:
+        st.audio(phrase["audio_path"])
+        st.caption(format_audio_caption(phrase))
+    else:
+        st.warning("녹음된 오디오가 없습니다")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if has_audio:
+            if st.button(f"오디오 삭제", key=f"list_delete_audio_{phrase_id}"):
+                db_manager.update_phrase_audio(phrase_id, None)
+                st.session_state[f"audio_flash_{phrase_id}"] = "오디오가 삭제되었습니다."
+                rerun_fragment()
+
+    with col2:
+        # 녹음 버튼
+        if st.button(f"녹음하기", key=f"list_record_btn_{phrase_id}"):
+            st.session_state[f"show_record_{phrase_id}"] = True
+
+    # 녹음 영역 (버튼 클릭 시 표시)
+    if st.session_state.get(f"show_record_{phrase_id}", False):
+        with st.form(key=f"list_record_form_{phrase_id}"):
+            st.subheader("직접 녹음하기")
+
+            # 녹음 위젯
+            st.markdown("#### 💬 마이크 아이콘을 클릭하여 녹음하세요")
+            audio_bytes = st.audio_input("마이크로 녹음", key=f"list_audio_recorder_{phrase_id}")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                submit_record = st.form_submit_button("저장", use_container_width=True)
+            with col2:
+                cancel_record = st.form_submit_button("취소", use_container_width=True)
+
+        if cancel_record:
+            st.session_state[f"show_record_{phrase_id}"] = False
+            rerun_fragment()
+
+        if submit_record and audio_bytes is not None:
+            save_phrase_audio(phrase, audio_bytes)
+            st.session_state[f"audio_flash_{phrase_id}"] = "녹음이 저장되었습니다!"
+            st.session_state[f"show_record_{phrase_id}"] = False
+            rerun_fragment()
+
+
+@st.fragment
+def show_phrase_audio_editor(phrase_id, phrase=None):
+    """
+    그룹 관리 탭의 멘트 오디오 영역 (재생, 오디오 삭제, 파일 업로드, 직접 녹음)
+
+    st.fragment로 분리되어 업로드/녹음 저장/삭제 시 이 영역만 다시 실행됨
+
+    Args:
+        phrase_id (int): 멘트 ID
+        phrase (dict): 전체 실행 시 카탈로그에서 가져온 멘트 행 (fragment 재실행 시에는 다시 조회)
+    """
+    # fragment 재실행 시에는 전체 실행 때 넘겨받은 행이 오래되었으므로 다시 조회
+    if phrase is None or is_fragment_rerun():
+        phrase = db_manager.get_phrase(phrase_id)
+    if not phrase:
+        return
+    phrase = dict(phrase)
+
+    show_audio_flash_message(phrase_id)
+
+    # 기존 녹음 파일이 있으면 표시
+    if phrase["audio_path"] and phrase["audio_exists"]:
+        st.markdown("##### 💿 녹음된 오디오 재생")
+        st.audio(phrase["audio_path"])
+        st.caption(format_audio_caption(phrase))
+        st.text(f"경로: {phrase['audio_path']}")
+
+        # 오디오 삭제 버튼
+        if st.button(f"오디오 삭제", key=f"delete_audio_{phrase_id}"):
+            db_manager.update_phrase_audio(phrase_id, None)
+            st.session_state[f"audio_flash_{phrase_id}"] = "오디오가 삭제되었습니다."
+            rerun_fragment()
+    else:
+        st.warning("녹음된 오디오가 없습니다. 아래에서 녹음하거나 파일을 업로드하세요.")
+
+    # 오디오 파일 업로드
+    with st.form(key=f"upload_form_{phrase_id}"):
+        st.subheader("오디오 파일 업로드")
+
+        uploaded_file = st.file_uploader("MP3 또는 WAV 파일 선택", type=["mp3", "wav"], key=f"upload_{phrase_id}")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            submit_upload = st.form_submit_button("업로드", use_container_width=True)
+        with col2:
+            cancel_upload = st.form_submit_button("취소", use_container_width=True)
+
+    if submit_upload and uploaded_file is not None:
+        # 파일 확장자 유지
+        save_phrase_audio(phrase, uploaded_file, uploaded_file.name.split(".")[-1])
+        st.session_state[f"audio_flash_{phrase_id}"] = "오디오 파일이 업로드되었습니다!"
+        rerun_fragment()
+
+    # 직접 녹음
+    with st.form(key=f"record_form_{phrase_id}"):
+        st.subheader("직접 녹음하기")
+
+        # 녹음 위젯 (강조)
+        st.markdown("#### 💬 마이크 아이콘을 클릭하여 녹음하세요")
+        audio_bytes = st.audio_input("마이크로 녹음하기", key=f"audio_recorder_{phrase_id}")
+
+        st.info("녹음 후 아래 버튼을 클릭하여 저장하세요.")
+        # 폼 제출 버튼
+        submit_record = st.form_submit_button("녹음 저장", use_container_width=True)
+
+    if submit_record and audio_bytes is not None:
+        save_phrase_audio(phrase, audio_bytes)
+        st.session_state[f"audio_flash_{phrase_id}"] = "녹음이 저장되었습니다!"
+        rerun_fragment()
 
 
 def show_conversation_tab():
@@ -1112,6 +1444,63 @@ def show_conversation_tab():
         )
         st.session_state.customer_translation_language = customer_translation
 
+    # 대화 영역 및 메시지 입력 (fragment 단위로 부분 재실행)
+    show_conversation_chat(customer_id)
+
+    # 대화 관리 버튼들
+    st.markdown("---")
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        if st.button("대화 초기화"):
+            st.session_state.conversation = []
+            st.success("대화 기록이 초기화되었습니다.")
+            st.rerun()
+
+    with col2:
+        if st.button("대화 내용 저장"):
+            if not customer_id:
+                st.error("고객 ID를 입력해주세요.")
+            else:
+                # 저장 경로 생성
+                date_str = datetime.now().strftime("%Y-%m-%d")
+                conversation_dir = os.path.join("conversations", st.session_state.username, date_str, customer_id)
+                os.makedirs(conversation_dir, exist_ok=True)
+
+                # 파일명 생성
+                time_str = datetime.now().strftime("%H%M%S")
+                conversation_json = os.path.join(conversation_dir, f"conversation_{time_str}.json")
+
+                # 대화 내용 저장
+                with open(conversation_json, "w", encoding="utf-8") as f:
+                    json.dump(st.session_state.conversation, f, ensure_ascii=False, indent=2)
+                db_manager.save_conversation(
+                    st.session_state.username,
+                    date_str,
+                    customer_id,
+                    conversation_json,
+                    st.session_state.conversation,
+                    time_str=time_str,
+                )
+
+                st.success(f"대화 내용이 저장되었습니다: {conversation_json}")
+
+    with col3:
+        if st.button("대화 기록 조회"):
+            st.session_state.active_tab = 2  # 녹음 기록 탭으로 이동
+            st.rerun()
+
+
+@st.fragment
+def show_conversation_chat(customer_id):
+    """
+    대화 내용 표시 및 메시지 입력 영역
+
+    st.fragment로 분리되어 메시지 전송 시 전체 스크립트가 아닌 이 영역만 다시 실행됨
+
+    Args:
+        customer_id (str): 고객 ID
+    """
     # 대화 영역 (채팅 인터페이스)
     st.markdown("---")
     st.subheader("대화 내용")
@@ -1172,8 +1561,8 @@ def show_conversation_tab():
         st.info("마이크 아이콘을 클릭하여 녹음을 시작하세요.")
         audio_bytes = st.audio_input(f"{speaker} 음성 녹음", key="conversation_recorder")
 
-        # 녹음 처리
-        if audio_bytes is not None:
+        # 녹음 처리 (같은 녹음을 fragment 재실행 시 다시 처리하지 않도록 file_id 확인)
+        if audio_bytes is not None and audio_bytes.file_id != st.session_state.get("last_conversation_audio_id"):
             if not customer_id:
                 st.error("고객 ID를 입력해주세요.")
             else:
@@ -1197,6 +1586,7 @@ def show_conversation_tab():
 
                 with st.spinner("음성을 텍스트로 변환 중..."):
                     # OpenAI API 확인
+                    client = get_openai_client()
                     if not client:
                         st.error("OpenAI API 키가 설정되어 있지 않습니다. 설정 탭에서 API 키를 설정해주세요.")
                         transcription = "STT API가 설정되지 않았습니다."
@@ -1250,17 +1640,21 @@ def show_conversation_tab():
                 }
 
                 st.session_state.conversation.append(message)
+                st.session_state.last_conversation_audio_id = audio_bytes.file_id
 
                 # 대화 내용을 JSON으로 저장
                 conversation_json = os.path.join(conversation_dir, "conversation.json")
                 with open(conversation_json, "w", encoding="utf-8") as f:
                     json.dump(st.session_state.conversation, f, ensure_ascii=False, indent=2)
+                db_manager.save_conversation(
+                    st.session_state.username, date_str, customer_id, conversation_json, st.session_state.conversation
+                )
 
                 # 화자 자동 전환
                 st.session_state.current_speaker = "고객" if speaker == "나" else "나"
 
                 # 페이지 리로드 (대화 표시 업데이트)
-                st.rerun()
+                rerun_fragment()
     else:
         # 텍스트 직접 입력 섹션
         st.subheader("메시지 입력")
@@ -1326,42 +1720,7 @@ def show_conversation_tab():
                         voice_option=voice_option,
                         instructions=instructions,
                     )
-                    st.rerun()
-
-    # 대화 관리 버튼들
-    st.markdown("---")
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        if st.button("대화 초기화"):
-            st.session_state.conversation = []
-            st.success("대화 기록이 초기화되었습니다.")
-            st.rerun()
-
-    with col2:
-        if st.button("대화 내용 저장"):
-            if not customer_id:
-                st.error("고객 ID를 입력해주세요.")
-            else:
-                # 저장 경로 생성
-                date_str = datetime.now().strftime("%Y-%m-%d")
-                conversation_dir = os.path.join("conversations", st.session_state.username, date_str, customer_id)
-                os.makedirs(conversation_dir, exist_ok=True)
-
-                # 파일명 생성
-                time_str = datetime.now().strftime("%H%M%S")
-                conversation_json = os.path.join(conversation_dir, f"conversation_{time_str}.json")
-
-                # 대화 내용 저장
-                with open(conversation_json, "w", encoding="utf-8") as f:
-                    json.dump(st.session_state.conversation, f, ensure_ascii=False, indent=2)
-
-                st.success(f"대화 내용이 저장되었습니다: {conversation_json}")
-
-    with col3:
-        if st.button("대화 기록 조회"):
-            st.session_state.active_tab = 2  # 녹음 기록 탭으로 이동
-            st.rerun()
+                    rerun_fragment()
 
 
 def process_text_message(
@@ -1405,7 +1764,8 @@ def process_text_message(
                 tts_text = translation if translation else text_input
 
                 # TTS 엔진 선택에 따라 다른 처리
-                if tts_engine == "openai" and client:
+                client = get_openai_client() if tts_engine == "openai" else None
+                if client:
                     # OpenAI TTS API 사용
                     try:
                         # 음성 선택 (사용자가 선택한 옵션 사용)
@@ -1458,6 +1818,9 @@ def process_text_message(
     conversation_json = os.path.join(conversation_dir, "conversation.json")
     with open(conversation_json, "w", encoding="utf-8") as f:
         json.dump(st.session_state.conversation, f, ensure_ascii=False, indent=2)
+    db_manager.save_conversation(
+        st.session_state.username, date_str, customer_id, conversation_json, st.session_state.conversation
+    )
 
     # 화자 자동 전환
     st.session_state.current_speaker = "고객" if speaker == "나" else "나"
@@ -1467,32 +1830,20 @@ def translate_text(text, target_lang_code, conversation_dir, speaker, time_str):
     """텍스트를 지정된 언어로 번역하는 함수"""
     with st.spinner(f"{LANGUAGE_LABELS.get(target_lang_code, target_lang_code)}로 번역 중..."):
         # OpenAI API가 설정되지 않은 경우
+        client = get_openai_client()
         if not client:
             st.warning("번역을 위한 OpenAI API 키가 설정되어 있지 않습니다.")
             return "번역 API 설정 필요"
 
         try:
-            # 새 OpenAI API 버전 사용 (ChatCompletion 대신 chat.completions 사용)
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"당신은 번역가입니다. 다음 텍스트를 {target_lang_code}로 번역하세요.",
-                    },
-                    {"role": "user", "content": text},
-                ],
-            )
-
-            # 응답 처리 방식 변경
-            translation = response.choices[0].message.content
+            translated = translator.translate(client, text, target_lang_code)
 
             # 번역 결과 저장
             translation_filepath = os.path.join(conversation_dir, f"{speaker}_{time_str}_trans_{target_lang_code}.txt")
             with open(translation_filepath, "w", encoding="utf-8") as f:
-                f.write(translation)
+                f.write(translated)
 
-            return translation
+            return translated
 
         except Exception as e:
             st.error(f"번역 중 오류가 발생했습니다: {e}")
@@ -1538,85 +1889,247 @@ def show_settings_tab():
                 st.success(
                     f"데이터베이스 초기화 완료! 그룹 {result['groups']}개, 오디오 파일 {result['audio_files']}개 스캔"
                 )
+                st.caption(f"재구성 {result['build_ms']:.1f}ms, 교체 {result['swap_ms']:.1f}ms")
                 st.toast(f"데이터베이스 초기화 완료")
 
     with st.expander("🔄 음성 파일 스캔", expanded=False):
         st.info("음성 파일만 다시 스캔하여 데이터베이스에 추가/업데이트합니다. 기존 데이터는 유지됩니다.")
+        full_scan = st.checkbox("변경되지 않은 폴더도 모두 다시 스캔", value=False, key="full_scan")
 
         if st.button("음성 파일 스캔", key="scan_audio"):
             with st.spinner("음성 파일 스캔 중..."):
-                result = db_manager.scan_audio_files_and_update_db()
+                result = db_manager.scan_audio_files_and_update_db(full=full_scan)
                 st.success(
                     f"스캔 완료! {result['scanned']}개 파일 스캔, {result['added']}개 추가, {result['updated']}개 업데이트"
                 )
+                st.caption(
+                    f"새 파일 {result['new_files']}개, 변경 {result['changed_files']}개, 삭제 {result['removed_files']}개 | "
+                    f"폴더 {result['dirs_scanned']}개 조회, {result['dirs_skipped']}개 건너뜀 | "
+                    f"탐색 {result['timings']['walk_ms']:.1f}ms, 비교 {result['timings']['diff_ms']:.1f}ms, "
+                    f"반영 {result['timings']['apply_ms']:.1f}ms"
+                )
                 st.toast(f"음성 파일 스캔 완료")
 
-    # 기본 언어 설정
-    default_lang = st.selectbox("기본 언어", ["ko", "ja", "zh", "en"])
-    if st.button("기본 언어 저장"):
-        save_default_language(default_lang)
-        st.success("기본 언어가 저장되었습니다.")
+    with st.expander("📦 멘트 가져오기/내보내기", expanded=False):
+        st.info(
+            "CSV 또는 JSONL 파일로 그룹과 멘트를 한 번에 가져오거나 내보냅니다. "
+            f"컬럼: {', '.join(phrase_io.FIELDS)} (group_id, group_description, audio_path는 선택)"
+        )
 
+        import_file = st.file_uploader("가져올 파일", type=["csv", "jsonl"], key="phrase_import_file")
+        dry_run = st.checkbox("검증만 하기 (저장하지 않음)", key="phrase_import_dry_run")
+        if st.button("가져오기", key="phrase_import") and import_file is not None:
+            fmt = phrase_io.detect_format(import_file.name)
+            try:
+                with st.spinner("멘트 가져오는 중..."):
+                    result = phrase_io.import_phrases(
+                        io.StringIO(import_file.getvalue().decode("utf-8-sig"), newline=""), fmt, db_manager, dry_run
+                    )
+            except UnicodeDecodeError:
+                st.error("UTF-8 인코딩의 CSV/JSONL 파일만 가져올 수 있습니다.")
+            except phrase_io.PhraseImportError as e:
+                st.error(str(e))
+                st.table(
+                    [
+                        {"줄": line_number, "오류": message}
+                        for line_number, message in e.errors[: phrase_io.MAX_REPORTED_ERRORS]
+                    ]
+                )
+            else:
+                st.success(
+                    f"{'검증' if dry_run else '가져오기'} 완료: 레코드 {result['records']}개, "
+                    f"새 그룹 {result['groups_created']}개, 멘트 {result['phrases']}개 ({result['elapsed']:.2f}초)"
+                )
+                if result["missing_audio"]:
+                    st.warning(f"오디오 파일이 없는 경로 {result['missing_audio']}개")
 
-def get_customers():
-    base_path = os.path.join("recordings", st.session_state.username)
-    if not os.path.exists(base_path):
-        return []
+        st.markdown("---")
+        export_format = st.radio(
+            "내보내기 형식", phrase_io.SUPPORTED_FORMATS, horizontal=True, key="phrase_export_format"
+        )
+        if st.button("내보내기 파일 만들기", key="phrase_export"):
+            content, count = phrase_io.export_to_string(export_format, db_manager)
+            st.session_state.phrase_export_result = (export_format, content, count)
+
+        if st.session_state.get("phrase_export_result"):
+            export_format, content, count = st.session_state.phrase_export_result
+            st.download_button(
+                f"멘트 {count}개 다운로드 ({export_format})",
+                data=content.encode("utf-8"),
+                file_name=f"phrases_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}",
+                mime="text/csv" if export_format == "csv" else "application/x-ndjson",
+                key="phrase_export_download",
+            )
 
-    customers = []
-    for date_dir in os.listdir(base_path):
-        date_path = os.path.join(base_path, date_dir)
-        if os.path.isdir(date_path):
-            for customer_dir in os.listdir(date_path):
-                if os.path.isdir(os.path.join(date_path, customer_dir)):
-                    customers.append(customer_dir)
-    return list(set(customers))
+    with st.expander("🔁 파일 시스템 동기화", expanded=False):
+        st.info("폴더 생성, 그룹 동기화, 음성 파일 스캔, 기본 멘트 생성을 즉시 다시 실행합니다.")
 
+        last_result = reconciliation_service.last_result
+        if last_result:
+            st.caption(
+                f"마지막 동기화: {datetime.fromtimestamp(reconciliation_service.last_run_at).strftime('%Y-%m-%d %H:%M:%S')}"
+                f" ({last_result['elapsed'] * 1000:.1f}ms, 총 {reconciliation_service.run_count}회 실행)"
+            )
 
-def get_customer_recordings(customer_id):
-    base_path = os.path.join("recordings", st.session_state.username)
-    recordings = []
+        if fs_watcher.is_running:
+            st.caption(f"파일 감시: {fs_watcher.backend_name} 방식 동작 중 (세대 {fs_watcher.generation})")
+        else:
+            st.caption("파일 감시: 비활성화됨 (변경 감지를 위해 폴더를 직접 확인합니다)")
+
+        cache_stats = db_manager.cache_stats()
+        if cache_stats:
+            st.caption(
+                f"멘트 목록 캐시: 적중 {cache_stats['hits']}회, 미스 {cache_stats['misses']}회 "
+                f"(적중률 {cache_stats['hit_rate'] * 100:.0f}%, 무효화 {cache_stats['invalidations']}회, "
+                f"항목 {cache_stats['entries']}개)"
+            )
 
-    for date_dir in os.listdir(base_path):
-        date_path = os.path.join(base_path, date_dir)
-        if not os.path.isdir(date_path):
-            continue
+        if st.button("지금 동기화", key="force_sync"):
+            with st.spinner("파일 시스템 동기화 중..."):
+                sync_result = reconciliation_service.ensure_synced(force=True)
+                show_sync_result_toasts(sync_result)
+                st.success(f"동기화 완료! ({sync_result['elapsed'] * 1000:.1f}ms)")
 
-        customer_path = os.path.join(date_path, customer_id)
-        if not os.path.exists(customer_path):
-            continue
+        # 녹음 기록 탭은 기록 테이블을 조회하므로, 감시자 없이 폴더를 직접 바꾼 경우 다시 색인
+        if st.button("녹음/대화 기록 다시 색인", key="reindex_history"):
+            with st.spinner("녹음/대화 기록 폴더를 읽는 중..."):
+                counts = db_manager.index_history()
+                st.success(
+                    f"기록 색인 완료! (녹음 {counts['recordings']}개, 대화 {counts['conversations']}개, "
+                    f"정리 {counts['removed']}개)"
+                )
 
-        for file in os.listdir(customer_path):
-            if file.endswith(".wav"):
-                recording_path = os.path.join(customer_path, file)
-                time = file.split("_")[1].split(".")[0]
-
-                # STT 결과 가져오기
-                stt_path = os.path.join(customer_path, "stt_result.txt")
-                stt_text = ""
-                if os.path.exists(stt_path):
-                    with open(stt_path, "r", encoding="utf-8") as f:
-                        stt_text = f.read()
-
-                # 번역 결과 가져오기
-                translations = {}
-                for lang in ["ja", "zh", "en"]:
-                    trans_path = os.path.join(customer_path, f"translated_{lang}.txt")
-                    if os.path.exists(trans_path):
-                        with open(trans_path, "r", encoding="utf-8") as f:
-                            translations[lang] = f.read()
-
-                recordings.append(
+    with st.expander("🗑️ 삭제 대기 중인 항목", expanded=False):
+        st.info(
+            f"삭제한 멘트/그룹/오디오 파일은 {db_manager.gc_grace_seconds:.0f}초 후 백그라운드에서 지워집니다. "
+            "그 전에는 되돌릴 수 있습니다."
+        )
+        if audio_gc.is_running:
+            st.caption(
+                f"삭제 작업자: {audio_gc.interval:.0f}초 주기로 동작 중 "
+                f"(누적 삭제 {audio_gc.removed_count}개, 회수 {audio_gc.reclaimed_count}개, "
+                f"실패 {audio_gc.failed_count}개)"
+            )
+        else:
+            st.caption("삭제 작업자: 비활성화됨")
+
+        if audio_store.enabled:
+            store_stats = audio_store.stats()
+            st.caption(
+                f"오디오 저장소: 파일 {store_stats['blobs']}개 ({store_stats['bytes'] / 1024 / 1024:.1f}MB), "
+                f"멘트 참조 {store_stats['references']}개, 회수 대기 {store_stats['unreferenced']}개 "
+                f"(중복 재사용 {store_stats['deduplicated']}회)"
+            )
+
+        show_flash_message("deletion_flash")
+
+        pending_deletions = db_manager.get_pending_deletions()
+        if not pending_deletions:
+            st.info("삭제 대기 중인 항목이 없습니다.")
+        for deletion in pending_deletions:
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                st.write(
+                    f"{deletion['label']} · 파일 {deletion['files']}개 · "
+                    f"{datetime.fromtimestamp(deletion['deleted_at']).strftime('%H:%M:%S')} 삭제"
+                )
+            with col2:
+                if deletion["undoable"] and st.button("되돌리기", key=f"undo_deletion_{deletion['id']}"):
+                    if db_manager.undo_deletion(deletion["id"]):
+                        st.session_state.deletion_flash = f"{deletion['label']} 삭제를 되돌렸습니다."
+                        st.rerun()
+                    st.error("유예 시간이 지나 되돌릴 수 없습니다.")
+
+    with st.expander("⏱️ 화면 렌더링 시간", expanded=False):
+        view_timings = st.session_state.get("view_timings", {})
+        if view_timings:
+            st.table(
+                [
                     {
-                        "date": date_dir,
-                        "time": time,
-                        "audio_path": recording_path,
-                        "stt_text": stt_text,
-                        "translations": translations,
+                        "화면": view_name,
+                        "실행 횟수": timing["count"],
+                        "마지막(ms)": round(timing["last_ms"], 1),
+                        "평균(ms)": round(timing["total_ms"] / timing["count"], 1),
                     }
-                )
+                    for view_name, timing in view_timings.items()
+                ]
+            )
+        else:
+            st.info("아직 기록된 렌더링 시간이 없습니다.")
 
-    return sorted(recordings, key=lambda x: (x["date"], x["time"]), reverse=True)
+    with st.expander("🗄️ 데이터베이스 쿼리 통계", expanded=False):
+        query_stats = db_manager.query_stats
+        st.caption(
+            f"집계 시작: {datetime.fromtimestamp(query_stats.started_at).strftime('%Y-%m-%d %H:%M:%S')} | "
+            f"느린 쿼리 기준: {query_stats.slow_threshold_ms:.0f}ms"
+        )
+
+        method_stats = query_stats.snapshot()
+        if method_stats:
+            st.dataframe(
+                [
+                    {
+                        "메서드": row["method"],
+                        "호출 수": row["calls"],
+                        "오류": row["errors"],
+                        "총(ms)": round(row["total_ms"], 1),
+                        "평균(ms)": round(row["mean_ms"], 2),
+                        "p50(ms)": round(row["p50_ms"], 2),
+                        "p95(ms)": round(row["p95_ms"], 2),
+                        "최대(ms)": round(row["max_ms"], 1),
+                        "반환 행": row["rows"],
+                    }
+                    for row in method_stats
+                ],
+                use_container_width=True,
+                hide_index=True,
+            )
+        else:
+            st.info("아직 기록된 쿼리가 없습니다.")
+
+        slow_queries = query_stats.slow_queries()
+        st.markdown(f"**느린 쿼리 ({len(slow_queries)}건)**")
+        if slow_queries:
+            st.dataframe(
+                [
+                    {
+                        "시간": datetime.fromtimestamp(entry["time"]).strftime("%H:%M:%S"),
+                        "메서드": entry["method"],
+                        "소요(ms)": round(entry["elapsed_ms"], 1),
+                        "반환 행": entry["rows"],
+                        "인자": entry["args"],
+                    }
+                    for entry in slow_queries
+                ],
+                use_container_width=True,
+                hide_index=True,
+            )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            threshold = st.number_input(
+                "느린 쿼리 기준(ms)", min_value=1.0, value=float(query_stats.slow_threshold_ms), step=10.0
+            )
+            if threshold != query_stats.slow_threshold_ms:
+                query_stats.slow_threshold_ms = threshold
+        with col2:
+            if st.button("통계 초기화", key="reset_query_stats"):
+                query_stats.reset()
+                st.rerun()
+
+    # 기본 언어 설정
+    default_lang = st.selectbox("기본 언어", ["ko", "ja", "zh", "en"])
+    if st.button("기본 언어 저장"):
+        save_default_language(default_lang)
+        st.success("기본 언어가 저장되었습니다.")
+
+
+def get_customers():
+    return db_manager.get_history_customers(st.session_state.username)
+
+
+def get_customer_recordings(customer_id):
+    return db_manager.get_customer_recordings(st.session_state.username, customer_id)
 
 
 def save_memo(customer_id, memo):
@@ -1678,47 +2191,23 @@ def save_storage_path(path):
 
 
 def filter_customers(customers, customer_search, date_search, language_filter):
-    filtered_customers = []
+    # 날짜/언어 조건은 녹음 기록 테이블에서 한 번에 조회
+    matched = None
+    if date_search or language_filter:
+        date_str = date_search.strftime("%Y-%m-%d") if date_search else None
+        if language_filter:
+            matched = db_manager.find_recording_customers(st.session_state.username, date_str, language_filter)
+        else:
+            matched = set(db_manager.get_history_customers(st.session_state.username, date_str))
 
+    filtered_customers = []
     for customer in customers:
         # 고객명 검색
         if customer_search and customer_search.lower() not in customer.lower():
             continue
 
-        # 날짜 검색
-        if date_search:
-            date_str = date_search.strftime("%Y-%m-%d")
-            customer_path = os.path.join("recordings", st.session_state.username, date_str, customer)
-            if not os.path.exists(customer_path):
-                continue
-
-        # 언어 필터
-        if language_filter:
-            has_language = False
-            for date_dir in os.listdir(os.path.join("recordings", st.session_state.username)):
-                date_path = os.path.join("recordings", st.session_state.username, date_dir)
-                if not os.path.isdir(date_path):
-                    continue
-
-                customer_path = os.path.join(date_path, customer)
-                if not os.path.exists(customer_path):
-                    continue
-
-                for lang in language_filter:
-                    if lang == "ko":
-                        if os.path.exists(os.path.join(customer_path, "stt_result.txt")):
-                            has_language = True
-                            break
-                    else:
-                        if os.path.exists(os.path.join(customer_path, f"translated_{lang}.txt")):
-                            has_language = True
-                            break
-
-                if has_language:
-                    break
-
-            if not has_language:
-                continue
+        if matched is not None and customer not in matched:
+            continue
 
         filtered_customers.append(customer)
 
@@ -1726,57 +2215,28 @@ def filter_customers(customers, customer_search, date_search, language_filter):
 
 
 def create_required_directories():
-    """필요한 디렉토리 구조 생성"""
-    try:
-        # 기본 디렉토리들 생성
-        base_directories = [
-            "audio_files",  # 오디오 파일 저장 디렉토리
-            "recordings",  # 녹음 파일 저장 디렉토리
-            "conversations",  # 대화 기록 저장 디렉토리
-            "logs",  # 로그 파일 저장 디렉토리
-            "data",  # 데이터 파일 저장 디렉토리
-            "tmp",  # 임시 파일 저장 디렉토리
-        ]
-
-        for dir_name in base_directories:
-            dir_path = Path(dir_name)
-            dir_path.mkdir(exist_ok=True)
-            print(f"디렉토리 생성/확인: {dir_path}")
-
-        # 오디오 파일 디렉토리 구조 생성
-        audio_dir = Path("audio_files")
-
-        # 그룹 정보 가져오기
-        try:
-            groups = db_manager.get_phrase_groups()
-
-            # 그룹별 폴더 생성
-            for group in groups:
-                group_dir = audio_dir / str(group["id"])
-                group_dir.mkdir(exist_ok=True)
+    """
+    사용자 디렉토리 구조 생성
 
-                # 언어별 폴더 생성
-                for lang in ["ko", "en", "ja", "zh"]:
-                    lang_dir = group_dir / lang
-                    lang_dir.mkdir(exist_ok=True)
-        except Exception as e:
-            print(f"그룹 폴더 생성 중 오류 발생: {e}")
-            # 데이터베이스가 아직 없는 경우를 대비해 기본 그룹 구조 생성
-            default_group_id = "1"
-            default_group_dir = audio_dir / default_group_id
-            default_group_dir.mkdir(exist_ok=True)
+    기본 디렉토리 및 그룹별 오디오 폴더는 동기화 서비스가 담당하므로
+    여기서는 세션별 사용자 디렉토리만 날짜가 바뀌었을 때 한 번 생성
+    """
+    today = datetime.now().strftime("%Y-%m-%d")
+    username = st.session_state.get("username")
+    dirs_key = (username, today)
 
-            for lang in ["ko", "en", "ja", "zh"]:
-                lang_dir = default_group_dir / lang
-                lang_dir.mkdir(exist_ok=True)
+    if st.session_state.get("user_directories_ready") == dirs_key:
+        return
 
+    try:
         # 현재 로그인한 사용자의 디렉토리 생성
-        if "username" in st.session_state and st.session_state.username:
-            create_user_directories(st.session_state.username)
+        if username:
+            create_user_directories(username)
 
         # 개발 모드를 위한 기본 사용자 디렉토리 생성
         create_user_directories("admin")
 
+        st.session_state.user_directories_ready = dirs_key
     except Exception as e:
         st.error(f"디렉토리 생성 중 오류가 발생했습니다: {e}")
         print(f"디렉토리 생성 오류: {e}")
@@ -1807,6 +2267,18 @@ def create_user_directories(username):
 def show_recording_history_tab():
     st.header("녹음 및 대화 기록")
 
+    # 필터 변경 시 기록 영역만 다시 실행
+    show_recording_history_results()
+
+
+@st.fragment
+def show_recording_history_results():
+    """
+    녹음 기록 탭의 검색 필터와 결과 영역
+
+    st.fragment로 분리되어 날짜/고객/유형 필터 변경 시 이 영역만 다시 실행됨
+    ("대화 계속하기"는 화면 전환이 필요하므로 앱 전체를 다시 실행)
+    """
     # 검색 필터 UI
     st.subheader("검색 필터")
 
@@ -1843,13 +2315,12 @@ def show_recording_history_tab():
     if available_customers:
         # 고객별 요약 정보 표시
         customer_summary = []
+        # 각 고객의 녹음 및 대화 개수를 한 번에 계산
+        customer_counts = db_manager.get_history_counts(st.session_state.username, selected_date)
         for customer in available_customers:
-            # 각 고객의 녹음 및 대화 개수 계산
-            recordings_count = count_recordings_by_customer(selected_date, customer, "recording")
-            conversations_count = count_recordings_by_customer(selected_date, customer, "conversation")
-
+            counts = customer_counts.get(customer, {"recordings": 0, "conversations": 0})
             customer_summary.append(
-                {"customer_id": customer, "recordings": recordings_count, "conversations": conversations_count}
+                {"customer_id": customer, "recordings": counts["recordings"], "conversations": counts["conversations"]}
             )
 
         # 고객 요약 정보를 테이블로 표시
@@ -1940,14 +2411,9 @@ def show_recording_history_tab():
                                 st.warning("녹음 파일을 찾을 수 없습니다.")
 
                             # STT 결과 확인 버튼
-                            stt_path = os.path.join(
-                                os.path.dirname(recording["audio_path"]), f"stt_result_{recording['time_str']}.txt"
-                            )
-                            if os.path.exists(stt_path):
+                            if recording.get("stt_text") is not None:
                                 if st.button("STT 결과 보기", key=f"stt_{customer}_{idx}"):
-                                    with open(stt_path, "r", encoding="utf-8") as f:
-                                        stt_text = f.read()
-                                    st.text_area("STT 결과", stt_text, height=80, disabled=True)
+                                    st.text_area("STT 결과", recording["stt_text"], height=80, disabled=True)
 
                     else:  # 대화인 경우
                         conversation_file = recording.get("conversation_file", "conversation.json")
@@ -2006,231 +2472,31 @@ def show_recording_history_tab():
 
 
 def get_available_dates():
-    """사용 가능한 날짜 목록 반환 (녹음과 대화 폴더 모두 확인)"""
-    dates = set()
-
-    # 녹음 폴더 확인
-    recordings_path = os.path.join("recordings", st.session_state.username)
-    if os.path.exists(recordings_path):
-        for date_dir in os.listdir(recordings_path):
-            date_path = os.path.join(recordings_path, date_dir)
-            if os.path.isdir(date_path) and re.match(r"\d{4}-\d{2}-\d{2}", date_dir):
-                dates.add(date_dir)
-
-    # 대화 폴더 확인
-    conversations_path = os.path.join("conversations", st.session_state.username)
-    if os.path.exists(conversations_path):
-        for date_dir in os.listdir(conversations_path):
-            date_path = os.path.join(conversations_path, date_dir)
-            if os.path.isdir(date_path) and re.match(r"\d{4}-\d{2}-\d{2}", date_dir):
-                dates.add(date_dir)
-
-    # 날짜 내림차순 정렬
-    return sorted(list(dates), reverse=True)
+    """사용 가능한 날짜 목록 반환 (녹음과 대화 기록 모두 확인)"""
+    return db_manager.get_history_dates(st.session_state.username)
 
 
 def get_customers_by_date(date):
-    """특정 날짜의 고객 목록 반환 (녹음과 대화 폴더 모두 확인)"""
-    customers = set()
-
-    # 녹음 폴더 확인
-    recordings_date_path = os.path.join("recordings", st.session_state.username, date)
-    if os.path.exists(recordings_date_path):
-        for customer_dir in os.listdir(recordings_date_path):
-            customer_path = os.path.join(recordings_date_path, customer_dir)
-            if os.path.isdir(customer_path):
-                customers.add(customer_dir)
-
-    # 대화 폴더 확인
-    conversations_date_path = os.path.join("conversations", st.session_state.username, date)
-    if os.path.exists(conversations_date_path):
-        for customer_dir in os.listdir(conversations_date_path):
-            customer_path = os.path.join(conversations_date_path, customer_dir)
-            if os.path.isdir(customer_path):
-                customers.add(customer_dir)
-
-    # 고객 ID 정렬
-    return sorted(list(customers))
+    """특정 날짜의 고객 목록 반환 (녹음과 대화 기록 모두 확인)"""
+    return db_manager.get_history_customers(st.session_state.username, date)
 
 
 def count_recordings_by_customer(date, customer, record_type=None):
     """특정 날짜, 특정 고객의 녹음 또는 대화 개수 반환"""
-    count = 0
-
-    if record_type == "recording" or record_type is None:
-        # 녹음 파일 확인
-        recordings_customer_path = os.path.join("recordings", st.session_state.username, date, customer)
-        if os.path.exists(recordings_customer_path):
-            for file in os.listdir(recordings_customer_path):
-                if file.startswith("recording_") and file.endswith(".wav"):
-                    count += 1
-
-    if record_type == "conversation" or record_type is None:
-        # 대화 파일 확인
-        conversations_customer_path = os.path.join("conversations", st.session_state.username, date, customer)
-        if os.path.exists(conversations_customer_path):
-            conversation_count = 0
-            for file in os.listdir(conversations_customer_path):
-                if file == "conversation.json" or (file.startswith("conversation_") and file.endswith(".json")):
-                    conversation_count += 1
-            # 대화 파일은 최소 1개로 카운트
-            if conversation_count > 0:
-                count += 1
-
-    return count
+    counts = db_manager.get_history_counts(st.session_state.username, date).get(customer)
+    if not counts:
+        return 0
+
+    if record_type == "recording":
+        return counts["recordings"]
+    if record_type == "conversation":
+        return counts["conversations"]
+    return counts["recordings"] + counts["conversations"]
 
 
 def get_all_recordings(date_filter=None, customer_filter=None):
     """날짜와 고객 ID로 필터링된 모든 녹음 기록을 가져옵니다."""
-    base_path = os.path.join("recordings", st.session_state.username)
-    if not os.path.exists(base_path):
-        return []
-
-    recordings = []
-
-    # 날짜 디렉토리 순회
-    for date_dir in os.listdir(base_path):
-        date_path = os.path.join(base_path, date_dir)
-
-        # 디렉토리가 아니거나 날짜 형식이 아닌 경우 스킵
-        if not os.path.isdir(date_path) or not re.match(r"\d{4}-\d{2}-\d{2}", date_dir):
-            continue
-
-        # 날짜 필터 적용 (date_filter가 문자열임을 가정)
-        if date_filter and date_filter != date_dir:
-            continue
-
-        # 고객 디렉토리 순회
-        for customer_dir in os.listdir(date_path):
-            customer_path = os.path.join(date_path, customer_dir)
-
-            # 디렉토리가 아닌 경우 스킵
-            if not os.path.isdir(customer_path):
-                continue
-
-            # 고객 ID 필터 적용
-            if customer_filter and customer_filter.lower() not in customer_dir.lower():
-                continue
-
-            # 음성 파일 및 관련 메타데이터 찾기
-            for file in os.listdir(customer_path):
-                if file.startswith("recording_") and file.endswith(".wav"):
-                    recording_path = os.path.join(customer_path, file)
-                    time_str = file.replace("recording_", "").replace(".wav", "")
-
-                    # 메타데이터 파일 찾기
-                    phrase_info = None
-                    phrase_info_path = None
-                    for meta_file in os.listdir(customer_path):
-                        if meta_file.startswith("phrase_info_") and meta_file.endswith(".json"):
-                            if meta_file.replace("phrase_info_", "").replace(".json", "") == time_str:
-                                phrase_info_path = os.path.join(customer_path, meta_file)
-                                try:
-                                    with open(phrase_info_path, "r", encoding="utf-8") as f:
-                                        phrase_info = json.load(f)
-                                except:
-                                    pass
-                                break
-
-                    # 녹음 정보 추가
-                    recording_info = {
-                        "date": date_dir,
-                        "customer_id": customer_dir,
-                        "time_str": time_str,
-                        "audio_path": recording_path,
-                        "metadata_path": phrase_info_path,
-                        "phrase_info": phrase_info,
-                        "type": "recording",
-                    }
-
-                    recordings.append(recording_info)
-
-    # 대화 기록도 함께 가져오기
-    conversations_path = os.path.join("conversations", st.session_state.username)
-    if os.path.exists(conversations_path):
-        # 날짜 디렉토리 순회
-        for date_dir in os.listdir(conversations_path):
-            date_path = os.path.join(conversations_path, date_dir)
-
-            # 디렉토리가 아니거나 날짜 형식이 아닌 경우 스킵
-            if not os.path.isdir(date_path) or not re.match(r"\d{4}-\d{2}-\d{2}", date_dir):
-                continue
-
-            # 날짜 필터 적용 (date_filter가 문자열임을 가정)
-            if date_filter and date_filter != date_dir:
-                continue
-
-            # 고객 디렉토리 순회
-            for customer_dir in os.listdir(date_path):
-                customer_path = os.path.join(date_path, customer_dir)
-
-                # 디렉토리가 아닌 경우 스킵
-                if not os.path.isdir(customer_path):
-                    continue
-
-                # 고객 ID 필터 적용
-                if customer_filter and customer_filter.lower() not in customer_dir.lower():
-                    continue
-
-                # 대화 JSON 파일 찾기
-                conversation_files = []
-                for file in os.listdir(customer_path):
-                    if file == "conversation.json" or file.startswith("conversation_") and file.endswith(".json"):
-                        conversation_files.append(file)
-
-                # 가장 최신 대화 파일 사용 (없으면 conversation.json)
-                conversation_file = "conversation.json"
-                if conversation_files:
-                    if "conversation.json" in conversation_files:
-                        conversation_file = "conversation.json"
-                    else:
-                        # 파일명 기준 정렬해서 가장 최신 파일 선택
-                        conversation_files.sort(reverse=True)
-                        conversation_file = conversation_files[0]
-
-                conversation_path = os.path.join(customer_path, conversation_file)
-                if os.path.exists(conversation_path):
-                    try:
-                        with open(conversation_path, "r", encoding="utf-8") as f:
-                            conversation_data = json.load(f)
-
-                            # 시간 문자열 추출 시도 (파일명 또는 파일 수정 시간 기반)
-                            try:
-                                if conversation_file.startswith("conversation_") and conversation_file.endswith(
-                                    ".json"
-                                ):
-                                    # 파일명에서 시간 추출
-                                    time_str = conversation_file.replace("conversation_", "").replace(".json", "")
-                                else:
-                                    # 파일 수정 시간으로 대체
-                                    file_mtime = os.path.getmtime(conversation_path)
-                                    time_str = datetime.fromtimestamp(file_mtime).strftime("%H%M%S")
-                            except:
-                                # 예외 발생 시 파일별 구분을 위해 현재 시간 사용하되 마이크로초 포함
-                                time_str = datetime.now().strftime("%H%M%S%f")[:8]
-
-                            # 대화 정보 추가
-                            recording_info = {
-                                "date": date_dir,
-                                "customer_id": customer_dir,
-                                "time_str": time_str,
-                                "conversation_path": conversation_path,
-                                "conversation_data": conversation_data,
-                                "type": "conversation",
-                                "conversation_file": conversation_file,  # 파일명 추가
-                                "message_count": len(conversation_data),  # 메시지 수 추가
-                            }
-
-                            recordings.append(recording_info)
-                    except Exception as e:
-                        # 오류 로깅만 하고 애플리케이션 계속 실행
-                        logging.warning(f"대화 파일 읽기 오류: {conversation_path} - {str(e)}")
-                        pass
-
-    # 날짜 및 시간 기준 내림차순 정렬
-    recordings.sort(key=lambda x: (x["date"], x["time_str"]), reverse=True)
-
-    return recordings
+    return db_manager.get_history_entries(st.session_state.username, date_filter, customer_filter)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,126 @@
+"""
+OpenAI 번역 요청 (Streamlit 호출 없이 작업자 스레드에서도 사용할 수 있는 함수)
+"""
+
+import time
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+# 번역에 사용하는 모델
+TRANSLATION_MODEL = "gpt-3.5-turbo"
+
+# 여러 언어 동시 번역 시 최대 동시 요청 수
+TRANSLATION_MAX_WORKERS = 4
+
+
+def translate(client, text, target_lang_code):
+    """
+    텍스트를 지정된 언어로 번역
+
+    Args:
+        client (OpenAI): OpenAI 클라이언트
+        text (str): 번역할 텍스트
+        target_lang_code (str): 대상 언어 코드
+
+    Returns:
+        str: 번역 결과 (요청 실패 시 예외 발생)
+    """
+    response = client.chat.completions.create(
+        model=TRANSLATION_MODEL,
+        messages=[
+            {
+                "role": "system",
+                "content": f"당신은 번역가입니다. 다음 텍스트를 {target_lang_code}로 번역하세요.",
+            },
+            {"role": "user", "content": text},
+        ],
+    )
+    return response.choices[0].message.content
+
+
+def translate_concurrently(client, text, languages, max_workers=TRANSLATION_MAX_WORKERS):
+    """
+    여러 언어로 동시에 번역 (언어별 요청을 스레드 풀에서 실행, 전체 지연 시간은 가장 느린 요청 수준)
+
+    Args:
+        client (OpenAI): OpenAI 클라이언트 (스레드 간 공유 가능)
+        text (str): 번역할 텍스트
+        languages (list): 대상 언어 코드 목록
+        max_workers (int): 최대 동시 요청 수
+
+    Returns:
+        tuple: (언어 코드별 번역 결과 dict, 언어 코드별 오류 메시지 dict)
+    """
+    translations = {}
+    errors = {}
+    if not languages:
+        return translations, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(languages)), thread_name_prefix="translate") as executor:
+        futures = {language: executor.submit(translate, client, text, language) for language in languages}
+        for language, future in futures.items():
+            try:
+                translations[language] = future.result()
+            except Exception as e:
+                errors[language] = str(e)
+
+    logging.debug(
+        f"동시 번역 완료: {len(translations)}/{len(languages)}개 언어 ({(time.perf_counter() - started) * 1000:.0f}ms)"
+    )
+    return translations, errors
+
+
+def translate_multi(client, text, languages):
+    """
+    한 번의 요청으로 여러 언어로 번역 (언어 코드를 키로 하는 JSON 응답)
+
+    응답을 JSON으로 읽을 수 없으면 모든 언어를, 일부 언어가 빠지거나 비어 있으면 해당 언어만
+    언어별 요청(translate_concurrently)으로 다시 번역
+
+    Args:
+        client (OpenAI): OpenAI 클라이언트
+        text (str): 번역할 텍스트
+        languages (list): 대상 언어 코드 목록
+
+    Returns:
+        tuple: (언어 코드별 번역 결과 dict, 언어 코드별 오류 메시지 dict)
+    """
+    if len(languages) < 2:
+        return translate_concurrently(client, text, languages)
+
+    translations = {}
+    try:
+        response = client.chat.completions.create(
+            model=TRANSLATION_MODEL,
+            response_format={"type": "json_object"},
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        f"당신은 번역가입니다. 다음 텍스트를 {', '.join(languages)}로 각각 번역하세요. "
+                        f"언어 코드({', '.join(languages)})를 키로, 번역문을 값으로 하는 JSON 객체만 출력하세요."
+                    ),
+                },
+                {"role": "user", "content": text},
+            ],
+        )
+        parsed = json.loads(response.choices[0].message.content)
+        if not isinstance(parsed, dict):
+            raise ValueError("JSON 객체가 아닌 응답")
+
+        for language in languages:
+            value = parsed.get(language)
+            if isinstance(value, str) and value.strip():
+                translations[language] = value
+    except Exception as e:
+        logging.warning(f"다국어 번역 응답 처리 실패, 언어별 번역으로 대체: {e}")
+
+    # 응답에 없거나 비어 있는 언어만 언어별 요청으로 다시 번역
+    missing = [language for language in languages if language not in translations]
+    errors = {}
+    if missing:
+        fallback, errors = translate_concurrently(client, text, missing)
+        translations.update(fallback)
+    return translations, errors